@@ -0,0 +1,205 @@
+"""add denormalized counters
+
+Revision ID: 209fb41447be
+Revises: a335ad738d6f
+Create Date: 2023-03-10 11:42:16.207381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "209fb41447be"
+down_revision = "a335ad738d6f"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the trigger functions, triggers and backfill of app.db.counters
+# at this revision: later changes of the module must not change this migration.
+COUNTERS_SQL = [
+    # post.comment_count: triggers on comment, then backfill existing rows
+    """
+CREATE OR REPLACE FUNCTION comment_post_comment_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE post SET comment_count = post.comment_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT post_id AS id, 1 AS delta FROM new_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE post.id = changes.id;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        UPDATE post SET comment_count = post.comment_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT post_id AS id, -1 AS delta FROM old_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE post.id = changes.id;
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        UPDATE post SET comment_count = post.comment_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT post_id AS id, 1 AS delta FROM new_rows UNION ALL SELECT post_id, -1 FROM old_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE post.id = changes.id;
+    END IF;
+    RETURN NULL;
+END;
+$$
+""",
+    "CREATE TRIGGER comment_post_comment_count_insert AFTER INSERT ON comment REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION comment_post_comment_count()",
+    "CREATE TRIGGER comment_post_comment_count_delete AFTER DELETE ON comment REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION comment_post_comment_count()",
+    "CREATE TRIGGER comment_post_comment_count_update AFTER UPDATE ON comment REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION comment_post_comment_count()",
+    """
+UPDATE post SET comment_count = actual.count
+FROM (
+    SELECT target.id, count(source.post_id) AS count
+    FROM post AS target
+    LEFT JOIN comment AS source ON source.post_id = target.id
+    GROUP BY target.id
+) AS actual
+WHERE post.id = actual.id
+AND post.comment_count IS DISTINCT FROM actual.count
+""",
+    # post.tag_count: triggers on posttag, then backfill existing rows
+    """
+CREATE OR REPLACE FUNCTION posttag_post_tag_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE post SET tag_count = post.tag_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT post_id AS id, 1 AS delta FROM new_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE post.id = changes.id;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        UPDATE post SET tag_count = post.tag_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT post_id AS id, -1 AS delta FROM old_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE post.id = changes.id;
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        UPDATE post SET tag_count = post.tag_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT post_id AS id, 1 AS delta FROM new_rows UNION ALL SELECT post_id, -1 FROM old_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE post.id = changes.id;
+    END IF;
+    RETURN NULL;
+END;
+$$
+""",
+    "CREATE TRIGGER posttag_post_tag_count_insert AFTER INSERT ON posttag REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION posttag_post_tag_count()",
+    "CREATE TRIGGER posttag_post_tag_count_delete AFTER DELETE ON posttag REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION posttag_post_tag_count()",
+    "CREATE TRIGGER posttag_post_tag_count_update AFTER UPDATE ON posttag REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION posttag_post_tag_count()",
+    """
+UPDATE post SET tag_count = actual.count
+FROM (
+    SELECT target.id, count(source.post_id) AS count
+    FROM post AS target
+    LEFT JOIN posttag AS source ON source.post_id = target.id
+    GROUP BY target.id
+) AS actual
+WHERE post.id = actual.id
+AND post.tag_count IS DISTINCT FROM actual.count
+""",
+    # tag.post_count: triggers on posttag, then backfill existing rows
+    """
+CREATE OR REPLACE FUNCTION posttag_tag_post_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE tag SET post_count = tag.post_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT tag_id AS id, 1 AS delta FROM new_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE tag.id = changes.id;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        UPDATE tag SET post_count = tag.post_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT tag_id AS id, -1 AS delta FROM old_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE tag.id = changes.id;
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        UPDATE tag SET post_count = tag.post_count + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM (SELECT tag_id AS id, 1 AS delta FROM new_rows UNION ALL SELECT tag_id, -1 FROM old_rows) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE tag.id = changes.id;
+    END IF;
+    RETURN NULL;
+END;
+$$
+""",
+    "CREATE TRIGGER posttag_tag_post_count_insert AFTER INSERT ON posttag REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION posttag_tag_post_count()",
+    "CREATE TRIGGER posttag_tag_post_count_delete AFTER DELETE ON posttag REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION posttag_tag_post_count()",
+    "CREATE TRIGGER posttag_tag_post_count_update AFTER UPDATE ON posttag REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION posttag_tag_post_count()",
+    """
+UPDATE tag SET post_count = actual.count
+FROM (
+    SELECT target.id, count(source.tag_id) AS count
+    FROM tag AS target
+    LEFT JOIN posttag AS source ON source.tag_id = target.id
+    GROUP BY target.id
+) AS actual
+WHERE tag.id = actual.id
+AND tag.post_count IS DISTINCT FROM actual.count
+""",
+]
+DROP_COUNTERS_SQL = [
+    "DROP TRIGGER IF EXISTS comment_post_comment_count_insert ON comment",
+    "DROP TRIGGER IF EXISTS comment_post_comment_count_delete ON comment",
+    "DROP TRIGGER IF EXISTS comment_post_comment_count_update ON comment",
+    "DROP FUNCTION IF EXISTS comment_post_comment_count()",
+    "DROP TRIGGER IF EXISTS posttag_post_tag_count_insert ON posttag",
+    "DROP TRIGGER IF EXISTS posttag_post_tag_count_delete ON posttag",
+    "DROP TRIGGER IF EXISTS posttag_post_tag_count_update ON posttag",
+    "DROP FUNCTION IF EXISTS posttag_post_tag_count()",
+    "DROP TRIGGER IF EXISTS posttag_tag_post_count_insert ON posttag",
+    "DROP TRIGGER IF EXISTS posttag_tag_post_count_delete ON posttag",
+    "DROP TRIGGER IF EXISTS posttag_tag_post_count_update ON posttag",
+    "DROP FUNCTION IF EXISTS posttag_tag_post_count()",
+]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "post",
+        sa.Column("comment_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "post", sa.Column("tag_count", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.add_column(
+        "tag", sa.Column("post_count", sa.Integer(), server_default="0", nullable=False)
+    )
+    for statement in COUNTERS_SQL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in DROP_COUNTERS_SQL:
+        op.execute(statement)
+    op.drop_column("tag", "post_count")
+    op.drop_column("post", "tag_count")
+    op.drop_column("post", "comment_count")
@@ -0,0 +1,47 @@
+"""add posttag and listing indexes
+
+Revision ID: 5b2f0c8d9e14
+Revises: 0e16af2ec7d1
+Create Date: 2023-03-08 09:26:03.584117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5b2f0c8d9e14"
+down_revision = "0e16af2ec7d1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Drop duplicated (post_id, tag_id) links before adding the unique constraint.
+    op.execute(
+        sa.text(
+            "DELETE FROM posttag duplicate USING posttag original "
+            "WHERE duplicate.post_id = original.post_id "
+            "AND duplicate.tag_id = original.tag_id "
+            "AND duplicate.id > original.id"
+        )
+    )
+    op.create_unique_constraint(
+        "uq_posttag_post_id_tag_id", "posttag", ["post_id", "tag_id"]
+    )
+    op.create_index(
+        "ix_posttag_tag_id_post_id", "posttag", ["tag_id", "post_id"], unique=False
+    )
+    op.create_index(
+        "ix_post_category_id_id", "post", ["category_id", "id"], unique=False
+    )
+    op.create_index("ix_post_author_id_id", "post", ["author_id", "id"], unique=False)
+    op.create_index(op.f("ix_comment_post_id"), "comment", ["post_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_comment_post_id"), table_name="comment")
+    op.drop_index("ix_post_author_id_id", table_name="post")
+    op.drop_index("ix_post_category_id_id", table_name="post")
+    op.drop_index("ix_posttag_tag_id_post_id", table_name="posttag")
+    op.drop_constraint("uq_posttag_post_id_tag_id", "posttag", type_="unique")
@@ -0,0 +1,76 @@
+"""add rollups
+
+Revision ID: c81d3e5a92f0
+Revises: f474e0621b37
+Create Date: 2023-03-15 10:21:07.418532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c81d3e5a92f0"
+down_revision = "f474e0621b37"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the materialized views and indexes of app.db.rollups at this
+# revision: later changes of the module must not change this migration.
+ROLLUPS_SQL = [
+    """
+CREATE MATERIALIZED VIEW rollup_popular_post AS
+SELECT post.id AS post_id, post.title, post.author_id, post.category_id,
+    post.comment_count, coalesce(vote.count, 0) AS vote_count, post.created_at
+FROM post
+LEFT JOIN vote ON vote.post_id = post.id
+WHERE post.comment_count > 0
+ORDER BY post.comment_count DESC, post.id DESC LIMIT 100
+""",
+    "CREATE UNIQUE INDEX uq_rollup_popular_post ON rollup_popular_post (post_id)",
+    "CREATE INDEX ix_rollup_popular_post_order ON rollup_popular_post (comment_count DESC, post_id DESC)",
+    """
+CREATE MATERIALIZED VIEW rollup_tag AS
+SELECT tag.id AS tag_id, tag.name, count(post.id) AS post_count,
+    max(post.created_at) AS last_post_at
+FROM tag
+LEFT JOIN posttag ON posttag.tag_id = tag.id
+LEFT JOIN post ON post.id = posttag.post_id
+GROUP BY tag.id
+""",
+    "CREATE UNIQUE INDEX uq_rollup_tag ON rollup_tag (tag_id)",
+    "CREATE INDEX ix_rollup_tag_order ON rollup_tag (post_count DESC, tag_id)",
+    """
+CREATE MATERIALIZED VIEW rollup_category AS
+SELECT category.id AS category_id, category.name, count(post.id) AS post_count,
+    max(post.created_at) AS last_post_at
+FROM category
+LEFT JOIN post ON post.category_id = category.id
+GROUP BY category.id
+""",
+    "CREATE UNIQUE INDEX uq_rollup_category ON rollup_category (category_id)",
+    "CREATE INDEX ix_rollup_category_order ON rollup_category (post_count DESC, category_id)",
+]
+DROP_ROLLUPS_SQL = [
+    "DROP MATERIALIZED VIEW IF EXISTS rollup_category",
+    "DROP MATERIALIZED VIEW IF EXISTS rollup_tag",
+    "DROP MATERIALIZED VIEW IF EXISTS rollup_popular_post",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rolluprefresh",
+        sa.Column("name", sa.String(length=63), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    # Views are populated from existing rows
+    for statement in ROLLUPS_SQL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in DROP_ROLLUPS_SQL:
+        op.execute(statement)
+    op.drop_table("rolluprefresh")
@@ -0,0 +1,39 @@
+"""add timestamps
+
+Revision ID: f474e0621b37
+Revises: 209fb41447be
+Create Date: 2023-03-13 08:55:41.730962
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f474e0621b37"
+down_revision = "209fb41447be"
+branch_labels = None
+depends_on = None
+
+TABLES = ("category", "comment", "post", "tag")
+
+
+def upgrade() -> None:
+    # Existing rows get the migration time (now() is evaluated once per transaction)
+    for table in TABLES:
+        for column in ("created_at", "updated_at"):
+            op.add_column(
+                table,
+                sa.Column(
+                    column,
+                    sa.DateTime(timezone=True),
+                    server_default=sa.text("now()"),
+                    nullable=False,
+                ),
+            )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, "updated_at")
+        op.drop_column(table, "created_at")
@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import ping
+from app.api.api_v1.endpoints import export, ping, post, stats
 
 api_router = APIRouter()
 api_router.include_router(ping.router, prefix="/ping", tags=["ping"])
+api_router.include_router(post.router, prefix="/posts", tags=["posts"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
@@ -0,0 +1,80 @@
+from enum import Enum
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import schemas, services
+from app.core import depends
+from app.services.base import BaseService
+from app.services.export import iter_csv, iter_ndjson
+
+router = APIRouter()
+
+
+class ExportResource(str, Enum):
+    """
+    Exportable tables.
+    """
+
+    posts = "posts"
+    comments = "comments"
+    users = "users"
+
+
+class ExportFormat(str, Enum):
+    """
+    Export file formats.
+    """
+
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+# Exported service and columns of each resource. "user.hashed_password" is never exported.
+EXPORT_RESOURCES: dict[ExportResource, tuple[BaseService, list[str]]] = {
+    ExportResource.posts: (
+        services.post_service,
+        ["id", "title", "short_description", "content", "author_id", "category_id"],
+    ),
+    ExportResource.comments: (
+        services.comment_service,
+        ["id", "comment", "author_id", "post_id"],
+    ),
+    ExportResource.users: (
+        services.user_service,
+        ["id", "name", "email", "is_active", "is_superuser"],
+    ),
+}
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+@router.get("/{resource}", response_class=StreamingResponse)
+def export_resource(
+    resource: ExportResource,
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    session: Session = Depends(depends.get_read_session),
+    user: schemas.InDBUserSchema = Depends(depends.get_current_super_user),
+):
+    """
+    Export the whole table of resource (superuser only).
+    Rows are streamed from a server-side cursor and encoded incrementally:
+    memory is constant and the client receives bytes immediately.
+    """
+    service, columns = EXPORT_RESOURCES[resource]
+    rows = service.iter_all(session, columns=columns)
+    if export_format == ExportFormat.csv:
+        content = iter_csv(rows, columns)
+    else:
+        content = iter_ndjson(rows)
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{resource.value}.{export_format.value}"'
+        },
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 
-from app import models, schemas
+from app import schemas
 from app.core import depends
 
 router = APIRouter()
@@ -15,7 +15,7 @@ def ping_public():
 
 
 @router.get("/private", response_model=schemas.PingSchema)
-def ping_private(user: models.User = Depends(depends.get_current_user)):
+def ping_private(user: schemas.InDBUserSchema = Depends(depends.get_current_user)):
     """
     Private API. Allow login users can call this API.
     """
@@ -0,0 +1,106 @@
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app import schemas, services
+from app.core import depends
+from app.core.conditional import is_not_modified, not_modified_response
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=list[schemas.SearchPostSchema])
+def search_posts(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(depends.get_read_session),
+):
+    """
+    Public API. Full-text search posts, most relevant first, with highlighted snippet.
+    """
+    return services.post_service.search(session, query=q, limit=limit, offset=offset)
+
+
+@router.get("", response_model=schemas.CursorPageSchema[schemas.ListPostSchema])
+def list_posts(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    category_id: Optional[int] = None,
+    tag_id: Optional[int] = None,
+    session: Session = Depends(depends.get_read_session),
+):
+    """
+    Public API. List newest posts with author, category and tags, optionally
+    filtered by category or tag. Pass "next_cursor" as "cursor" to get the next page.
+    Support conditional requests (ETag): 304 if page did not change.
+    """
+    page_params: dict[str, Any] = {
+        "limit": limit,
+        "cursor": cursor,
+        "category_id": category_id,
+        "tag_id": tag_id,
+    }
+    try:
+        validators = services.post_service.list_validators(session, **page_params)
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        page = services.post_service.list_posts(session, **page_params)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    response.headers.update(validators.headers)
+    return page
+
+
+@router.get("/{post_id}", response_model=schemas.DetailPostSchema)
+def retrieve_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    session: Session = Depends(depends.get_read_session),
+):
+    """
+    Public API. Retrieve post with author, category, tags and comments.
+    Support conditional requests (ETag): 304 if post did not change.
+    """
+    validators = services.post_service.detail_validators(session, post_id)
+    if validators is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Post not found."
+        )
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    post = services.post_service.get_with_profile(session, post_id, profile="detail")
+    response.headers.update(validators.headers)
+    return post
+
+
+@router.post(
+    "/{post_id}/votes",
+    response_model=schemas.CastVoteSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def vote_post(post_id: int, request: Request):
+    """
+    Public API. Vote for post, once per client (IP address). The vote is buffered
+    and written to database asynchronously, without any query: votes of unknown
+    posts are accepted, then dropped by the flush.
+    """
+    client_id = request.client.host if request.client else None
+    return {"accepted": services.vote_buffer.add(post_id, client_id=client_id)}
+
+
+@router.get("/{post_id}/votes", response_model=schemas.RetrieveVoteSchema)
+def retrieve_post_votes(
+    post_id: int, session: Session = Depends(depends.get_read_session)
+):
+    """
+    Public API. Retrieve vote count of post, include votes not flushed yet.
+    A read racing a flush may miss the votes being committed, never counts them
+    twice (see VoteBuffer.pending).
+    """
+    count = services.vote_service.get_count(session, post_id)
+    return {"post_id": post_id, "count": count + services.vote_buffer.pending(post_id)}
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import schemas, services
+from app.core import depends
+
+router = APIRouter()
+
+
+@router.get(
+    "/popular-posts",
+    response_model=schemas.RollupSchema[schemas.PopularPostSchema],
+)
+def popular_posts(
+    limit: int = Query(10, ge=1, le=100),
+    session: Session = Depends(depends.get_read_session),
+):
+    """
+    Public API. Most commented posts, as of the last refresh of the rollup.
+    """
+    return services.rollup_service.popular_posts(session, limit=limit)
+
+
+@router.get("/tags", response_model=schemas.RollupSchema[schemas.TagRollupSchema])
+def top_tags(
+    limit: int = Query(10, ge=1, le=100),
+    session: Session = Depends(depends.get_read_session),
+):
+    """
+    Public API. Tags with most posts, as of the last refresh of the rollup.
+    """
+    return services.rollup_service.top_tags(session, limit=limit)
+
+
+@router.get(
+    "/categories",
+    response_model=schemas.RollupSchema[schemas.CategoryRollupSchema],
+)
+def categories(
+    limit: int = Query(100, ge=1, le=100),
+    session: Session = Depends(depends.get_read_session),
+):
+    """
+    Public API. Categories with their number of posts, most posts first, as of
+    the last refresh of the rollup.
+    """
+    return services.rollup_service.categories(session, limit=limit)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import CONTENT_TYPE, metrics_registry
+
+router = APIRouter()
+
+
+@router.get("", include_in_schema=False, response_class=PlainTextResponse)
+def metrics():
+    """
+    Request metrics of all workers in Prometheus text format.
+    """
+    return PlainTextResponse(metrics_registry.render_latest(), media_type=CONTENT_TYPE)
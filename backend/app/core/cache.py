@@ -0,0 +1,179 @@
+"""
+Pluggable key-value cache backends (in-process LRU, Redis protocol).
+Values are bytes: callers serialize their own snapshots.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """
+    Interface of cache backends.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get value of key. Return None if key does not exist or expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        """
+        Set value of key, expire after "ttl" seconds (None: backend default).
+        """
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        """
+        Delete keys. Missing keys are ignored.
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process bounded LRU cache with TTL. Thread safe.
+    Every worker process has its own copy: invalidation is local.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: int = 300):
+        """
+        Args:
+            max_size: int. Maximum number of keys, least recently used are evicted.
+            ttl: int. Default lifetime (seconds) of keys.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get value of key. Return None if key does not exist or expired.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        """
+        Set value of key, expire after "ttl" seconds (None: backend default).
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        """
+        Delete keys. Missing keys are ignored.
+        """
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        """
+        Number of keys (include expired keys not yet evicted).
+        """
+        return len(self._data)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache backend speaking Redis protocol (Redis, KeyDB, Dragonfly..).
+    Shared by all worker processes, invalidation is global.
+    """
+
+    def __init__(self, client: Any, ttl: int = 300, prefix: str = "cache:"):
+        """
+        Args:
+            client: Any. "redis.Redis" compatible client.
+            ttl: int. Default lifetime (seconds) of keys.
+            prefix: str. Prefix of all keys, namespace in a shared server.
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisCacheBackend":
+        """
+        Create backend connected to "url", e.g. "redis://localhost:6379/0".
+        """
+        import redis  # imported lazily: only required by this backend
+
+        return cls(client=redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get value of key. Return None if key does not exist or expired.
+        """
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        """
+        Set value of key, expire after "ttl" seconds (None: backend default).
+        """
+        self.client.set(self.prefix + key, value, ex=self.ttl if ttl is None else ttl)
+
+    def delete(self, *keys: str) -> None:
+        """
+        Delete keys. Missing keys are ignored.
+        """
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+def create_cache_backend(
+    backend: Optional[str],
+    *,
+    ttl: int,
+    max_size: int,
+    redis_url: Optional[str] = None,
+) -> Optional[CacheBackend]:
+    """
+    Create cache backend by name.
+
+    Args:
+        backend: Optional[str]. "memory", "redis" or None (cache disabled).
+        ttl: int. Default lifetime (seconds) of keys.
+        max_size: int. Maximum number of keys ("memory" backend).
+        redis_url: Optional[str]. Url of server ("redis" backend).
+
+    Returns:
+        cache: Optional[CacheBackend]
+
+    Raises:
+        ValueError: unknown backend.
+    """
+    if not backend:
+        return None
+    if backend == "memory":
+        return MemoryCacheBackend(max_size=max_size, ttl=ttl)
+    if backend == "redis":
+        return RedisCacheBackend.from_url(redis_url, ttl=ttl)
+    raise ValueError(f"Unknown cache backend: {backend!r}")
+
+
+# Read-through cache of BaseService.get, None when disabled.
+object_cache = create_cache_backend(
+    settings.OBJECT_CACHE_BACKEND,
+    ttl=settings.OBJECT_CACHE_TTL_SECONDS,
+    max_size=settings.OBJECT_CACHE_MAX_SIZE,
+    redis_url=settings.OBJECT_CACHE_REDIS_URL,
+)
@@ -0,0 +1,85 @@
+"""
+Conditional GET (RFC 7232): ETag validators and 304 responses.
+
+Validators are computed from a few cheap "version" values of the resource
+(updated_at, counters, ids) selected by services, not from the rendered body:
+a 304 costs one small query and no serialization.
+No Last-Modified / If-Modified-Since: deletes and counter triggers do not move
+any "updated_at" forward, a modification time would answer stale 304s.
+"""
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+@dataclass(frozen=True)
+class Validators:
+    """
+    Validators of a representation. "etag" is weak: equal validators mean
+    semantically equal JSON, not byte-identical bodies.
+    """
+
+    etag: str
+
+    @classmethod
+    def build(cls, parts: Iterable[Any]) -> "Validators":
+        """
+        Build validators from version values of resource.
+
+        Args:
+            parts: Iterable[Any]. Values changing whenever representation changes
+                (query parameters, updated_at, counters..).
+
+        Returns:
+            validators: Validators
+        """
+        digest = hashlib.sha1(repr(tuple(parts)).encode()).hexdigest()
+        return cls(etag=f'W/"{digest}"')
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """
+        Response headers of validators.
+        """
+        # "no-cache": clients may store the response but must revalidate it
+        return {"ETag": self.etag, "Cache-Control": "no-cache"}
+
+
+def _strip_weak(etag: str) -> str:
+    """
+    Opaque tag of entity tag, for weak comparison.
+    """
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """
+    Evaluate "If-None-Match" of GET request ("If-Modified-Since" is ignored).
+
+    Args:
+        request: Request
+        validators: Validators. Current validators of resource.
+
+    Returns:
+        not_modified: bool. True: client copy is fresh, answer 304.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _strip_weak(validators.etag)
+    return any(_strip_weak(tag) == current for tag in if_none_match.split(","))
+
+
+def not_modified_response(validators: Validators) -> Response:
+    """
+    Empty 304 response, with validators.
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers
+    )
@@ -1,7 +1,31 @@
+import functools
 import secrets
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
-from pydantic import AnyHttpUrl, BaseSettings, PostgresDsn, validator
+from pydantic import (
+    AnyHttpUrl,
+    BaseModel,
+    BaseSettings,
+    PostgresDsn,
+    RedisDsn,
+    validator,
+)
+
+
+class RateLimitRule(BaseModel):
+    """
+    Token bucket limit of requests matching "method" and "path".
+    """
+
+    # HTTP method, "*": any method
+    method: str = "*"
+    # Path template, "{param}" matches one path segment, e.g. "/api/v1/posts/{post_id}"
+    path: str
+    # Refill rate (requests per second) and bucket capacity (allowed burst)
+    rate: float
+    burst: int
+    # Bucket per client IP, per user (bearer token, IP for anonymous) or one for the route
+    key: Literal["ip", "user", "route"] = "ip"
 
 
 class Settings(BaseSettings):
@@ -13,6 +37,18 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "My Blog"
     API_V1_STR: str = "/api/v1"
 
+    # Production server (app.server)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # Worker processes. None: number of CPU cores usable by the process.
+    SERVER_WORKERS: Optional[int] = None
+    # Recycle a worker after this many requests plus a random jitter, 0: never
+    SERVER_MAX_REQUESTS: int = 10_000
+    SERVER_MAX_REQUESTS_JITTER: int = 1_000
+    # Seconds given to a stopping worker to finish in-flight requests
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_ACCESS_LOG: bool = False
+
     # Security
     # CORS config
     BACKEND_CORS_ORIGINS: list[AnyHttpUrl] = []
@@ -22,6 +58,89 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Cache of verified access tokens and user snapshot, see app.core.token_cache
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    # Upper bound of staleness of cached user snapshot (entries also expire at "exp")
+    TOKEN_CACHE_TTL_SECONDS: int = 60
+    # Revoked tokens and evicted users store: "memory" (per worker process) or
+    # "redis" (shared), required with several workers
+    TOKEN_REVOCATION_BACKEND: Literal["memory", "redis"] = "memory"
+    TOKEN_REVOCATION_REDIS_URL: Optional[RedisDsn] = None
+    TOKEN_REVOCATION_MAX_SIZE: int = 100_000
+    # Password hashing: "bcrypt" (default cost), or "fast" (bcrypt at its minimum
+    # cost, about 1 ms) for test suites only, never in production.
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "fast"] = "bcrypt"
+    # Password hashing process pool. None: number of CPU cores, 0: hash inline.
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    # Maximum number of queued + running hash jobs before rejecting with 503.
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Rate limit (app.core.rate_limit). Rules are read from a JSON list in environment.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_RULES: list[RateLimitRule] = [
+        RateLimitRule(
+            method="POST", path="/api/v1/posts/{post_id}/votes", rate=1, burst=10
+        ),
+        RateLimitRule(method="GET", path="/api/v1/posts/search", rate=5, burst=20),
+    ]
+    # Number of independently locked bucket maps
+    RATE_LIMIT_SHARDS: int = 16
+    # Seconds between two sweeps of idle (full) buckets
+    RATE_LIMIT_SWEEP_INTERVAL_SECONDS: int = 60
+
+    # Metrics (app.core.metrics), served in Prometheus text format
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "/metrics"
+    # Shared directory of worker snapshots, required with several workers.
+    # Must be emptied before starting the server.
+    METRICS_MULTIPROCESS_DIR: Optional[str] = None
+    # Seconds between two snapshots of a worker in METRICS_MULTIPROCESS_DIR
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 5.0
+    # Upper bounds of request latency histogram buckets (seconds)
+    METRICS_LATENCY_BUCKETS: list[float] = [
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+    ]  # fmt: skip
+
+    # SQL instrumentation (app.db.instrumentation)
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    # Add query count and DB time headers to responses (exposes timings to clients)
+    SQL_STATS_HEADERS: bool = False
+    # Statements slower than this are logged with parameters. None: disabled.
+    SQL_SLOW_QUERY_MS: Optional[int] = 200
+    # Log the plan (EXPLAIN, not executed again) of slow statements
+    SQL_SLOW_QUERY_EXPLAIN: bool = True
+    # Warn when one request runs the same statement this many times (N+1 pattern)
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Cache
+    # Read-through object cache of BaseService.get: "memory", "redis" or None (disabled)
+    OBJECT_CACHE_BACKEND: Optional[Literal["memory", "redis"]] = None
+    OBJECT_CACHE_REDIS_URL: Optional[RedisDsn] = None
+    OBJECT_CACHE_TTL_SECONDS: int = 300
+    OBJECT_CACHE_MAX_SIZE: int = 10_000
+
+    # Votes
+    # Buffered vote increments are flushed every interval or after max events.
+    VOTE_FLUSH_INTERVAL_MS: int = 500
+    VOTE_FLUSH_MAX_EVENTS: int = 1000
+    # A client votes once per post within the window (in-process, per worker).
+    VOTE_DEDUP_TTL_SECONDS: int = 60 * 60 * 24
+    VOTE_DEDUP_MAX_SIZE: int = 100_000
+
+    # Rollups of home page widgets (app.db.rollups), materialized views.
+    # Every worker runs a refresher, only one refreshes a rollup per interval.
+    ROLLUP_REFRESH_ENABLED: bool = True
+    # Maximum staleness of rollups: seconds between two refreshes
+    ROLLUP_REFRESH_INTERVAL_SECONDS: float = 60.0
+
+    # Background jobs (app.core.jobs), in-process and in-memory
+    # Maximum number of queued + running jobs of a worker process
+    JOB_QUEUE_MAX_PENDING: int = 10_000
+    # Seconds sync code waits for free space before failing with 503
+    JOB_QUEUE_PUT_TIMEOUT_SECONDS: float = 1.0
+    # Seconds the shutdown waits for pending jobs (below SERVER_GRACEFUL_TIMEOUT)
+    JOB_QUEUE_DRAIN_TIMEOUT_SECONDS: float = 10.0
 
     # Database Config
     POSTGRES_SERVER: str
@@ -49,5 +168,72 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[PostgresDsn] = None
+
+    @validator("SQLALCHEMY_ASYNC_DATABASE_URI", pre=True)
+    def assemble_async_db_connection(
+        cls, v: Optional[str], values: dict[str, Any]  # noqa
+    ) -> Any:
+        """
+        Generate SQLALCHEMY_ASYNC_DATABASE_URI (asyncpg driver) from values.
+        """
+        if isinstance(v, str):
+            return v
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            user=values.get("POSTGRES_USER"),
+            password=values.get("POSTGRES_PASSWORD"),
+            host=values.get("POSTGRES_SERVER"),
+            port=values.get("POSTGRES_PORT"),
+            path=f"/{values.get('POSTGRES_DB') or ''}",
+        )
+
+    # Connection pool (app.db.pool), per engine and per worker process.
+    # "null": no pooling, connections are opened per checkout (external pooler
+    # such as PgBouncer in front of the database).
+    DB_POOL_MODE: Literal["queue", "null"] = "queue"
+    DB_POOL_SIZE: int = 5
+    # Connections opened beyond DB_POOL_SIZE under load, closed on checkin
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds waiting for a connection before raising TimeoutError
+    DB_POOL_TIMEOUT: float = 30
+    # Seconds after which a connection is replaced, -1: never
+    DB_POOL_RECYCLE: int = 1800
+    # Liveness check on checkout: "always" (one round trip per checkout), "idle"
+    # (only connections unused for DB_POOL_PING_INTERVAL_SECONDS) or "never"
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_POOL_PING_INTERVAL_SECONDS: float = 30
+
+    # Read replicas (app.db.replicas), JSON list. Empty: reads go to the primary.
+    SQLALCHEMY_REPLICA_URIS: list[PostgresDsn] = []
+    # Seconds a failing replica is skipped before being tried again
+    REPLICA_EJECT_SECONDS: int = 30
+    # Seconds a client reads from the primary after a write (read-your-writes),
+    # must be above the replication lag
+    REPLICA_READ_YOUR_WRITES_SECONDS: int = 5
+    # Recent writers store: "memory" (per worker process) or "redis" (shared)
+    REPLICA_STICKY_BACKEND: Literal["memory", "redis"] = "memory"
+    REPLICA_STICKY_REDIS_URL: Optional[RedisDsn] = None
+    REPLICA_STICKY_MAX_SIZE: int = 100_000
 
-settings = Settings()
+
+# Annotation only: the value comes from "__getattr__"
+settings: Settings
+
+
+@functools.lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Settings of the process, read from environment once, on first use.
+    """
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    """
+    "settings" module attribute, built on first access: importing this module
+    (e.g. for "Settings") does not read nor validate the environment.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,21 @@
 """
 Common FastAPI dependency.
 """
-from collections.abc import Generator
+import time
+from collections.abc import AsyncGenerator, Generator
+from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from app import models
-from app.db.session import SessionLocal
+from app import schemas, services
+from app.core.security import InvalidTokenError, decode_access_token
+from app.core.token_cache import token_cache
+from app.db import session as db_session
+from app.db.replicas import client_key, recent_writers
+
+bearer_scheme = HTTPBearer(auto_error=False)
 
 
 def get_session() -> Generator:
@@ -17,7 +25,36 @@ def get_session() -> Generator:
     Returns:
         session: Session
     """
-    session = SessionLocal()
+    session = db_session.SessionLocal()
+    try:
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def get_read_session(request: Request) -> Generator:
+    """
+    Get read-only database session dependency: a healthy replica (round-robin),
+    or the primary when no replica is configured or healthy, or when the client
+    wrote recently (read-your-writes, see app.db.replicas).
+    Sync on purpose: FastAPI runs it in the threadpool, so the recent writers
+    lookup (a Redis round trip with the "redis" backend) and the replica
+    checkout do not block the event loop.
+
+    Args:
+        request: Request
+
+    Returns:
+        session: Session
+    """
+    replica_set = db_session.replica_set
+    if replica_set.engines and client_key(request.scope) not in recent_writers:
+        session = replica_set.session()
+    else:
+        session = db_session.SessionLocal()
     try:
         yield session
     except Exception:
@@ -27,38 +64,85 @@ def get_session() -> Generator:
         session.close()
 
 
+async def get_async_session() -> AsyncGenerator:
+    """
+    Get async database session dependency.
+    Async endpoints using this session do not occupy a threadpool slot.
+
+    Returns:
+        session: AsyncSession
+    """
+    session = db_session.AsyncSessionLocal()
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 def get_current_user(
     session: Session = Depends(get_session),
-) -> models.User:
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> schemas.InDBUserSchema:
     """
-    Authenticate and get current login user.
+    Authenticate and get current login user from "Authorization: Bearer <token>".
+    Verified tokens are cached with a snapshot of their user (see token_cache),
+    known tokens skip JWT decoding and the user query. Revocations are checked
+    on every request.
 
     Args:
         session: Session. SQLAlchemy ORM session.
+        credentials: Optional[HTTPAuthorizationCredentials]. Bearer token.
 
     Returns:
-        user: User. Current login user.
+        user: InDBUserSchema. Snapshot of current login user.
 
     Raises:
         HTTPException
     """
-    # TODO: parse JWT token in request. Authorize and return login user.
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token."
+    invalid_token_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid token.",
+        headers={"WWW-Authenticate": "Bearer"},
     )
+    if credentials is None:
+        raise invalid_token_exception
+    token = credentials.credentials
+    if token_cache.is_revoked(token):
+        raise invalid_token_exception
+
+    cache_entry = token_cache.get(token)
+    if cache_entry is not None:
+        return cache_entry.user
+
+    loaded_at = time.time()
+    try:
+        claims = decode_access_token(token)
+        user_id = int(claims["sub"])
+    except (InvalidTokenError, KeyError, ValueError):
+        raise invalid_token_exception
+    user = services.user_service.get(session, _id=user_id)
+    if user is None:
+        raise invalid_token_exception
+
+    user_snapshot = schemas.InDBUserSchema.from_orm(user)
+    token_cache.set(token, claims=claims, user=user_snapshot, loaded_at=loaded_at)
+    return user_snapshot
 
 
 def get_current_active_user(
-    user: models.User = Depends(get_current_user),
-) -> models.User:
+    user: schemas.InDBUserSchema = Depends(get_current_user),
+) -> schemas.InDBUserSchema:
     """
     Check current user is active or not. Return active user.
 
     Args:
-        user: User. Current login user.
+        user: InDBUserSchema. Current login user.
 
     Returns:
-        user: User
+        user: InDBUserSchema
 
     Raises:
         HTTPException
@@ -67,21 +151,23 @@ def get_current_active_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user."
         )
+    return user
 
 
 def get_current_super_user(
-    user: models.User = Depends(get_current_active_user),
-) -> models.User:
+    user: schemas.InDBUserSchema = Depends(get_current_active_user),
+) -> schemas.InDBUserSchema:
     """
     Check current user is active and is superuser or not. Return super user.
 
     Args:
-        user: User. Current login user.
+        user: InDBUserSchema. Current login user.
 
     Returns:
-        user: User.
+        user: InDBUserSchema.
     """
     if not user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Superuser is required."
         )
+    return user
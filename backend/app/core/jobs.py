@@ -0,0 +1,357 @@
+"""
+In-process background jobs: side effects of requests (notifications, counters..)
+run after the response instead of inside the request.
+
+A job is a payload queued for a job type. Every job type has its own asyncio
+queue and worker tasks in the event loop of the application, and a handler
+called with batches of payloads: jobs queued together (up to "batch_size",
+collected for at most "batch_wait" seconds) are handled by one call, e.g. one
+multi-row statement instead of one round trip per job. Failed batches are
+retried with exponential backoff, then dropped (logged): handlers must be
+idempotent.
+
+Memory is bounded: at most "max_pending" jobs are queued or being handled.
+"enqueue" (async code) waits for free space, "submit" (sync code, any thread)
+waits up to "put_timeout" seconds then raises JobQueueFullError (HTTP 503).
+Before "start" (tests, scripts), jobs are handled inline by the caller.
+
+Jobs live in memory: "stop" (graceful shutdown) drains queued jobs, jobs are
+lost if the process is killed. Work that must never be lost belongs elsewhere.
+
+Usage:
+    async def send_notifications(payloads: list[dict]) -> None:
+        ...
+
+    job_queue.register("comment.notify", send_notifications, batch_size=100)
+    job_queue.submit("comment.notify", {"comment_id": comment.id})
+"""
+import asyncio
+import concurrent.futures
+import inspect
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+from app.core.config import settings
+from app.core.metrics import Sample
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[list[Any]], Union[None, Awaitable[None]]]
+
+
+class JobQueueFullError(Exception):
+    """
+    Raised when background job queue has too many pending jobs.
+    """
+
+
+@dataclass
+class JobType:
+    """
+    Handler and batching/retry options of a job type, and its statistics.
+    """
+
+    name: str
+    # Called with a list of payloads. Sync handlers run in a thread.
+    handler: Handler
+    # Maximum number of jobs per handler call
+    batch_size: int = 100
+    # Seconds waiting for more jobs when a batch is not full
+    batch_wait: float = 0.01
+    # Number of worker tasks (batches handled concurrently)
+    workers: int = 1
+    # Handler calls per batch before dropping it, and backoff between them:
+    # retry_backoff * 2 ** (attempt - 1) seconds, capped, with jitter
+    max_attempts: int = 3
+    retry_backoff: float = 0.5
+    max_retry_backoff: float = 30.0
+    processed: int = 0
+    failed: int = 0
+    queue: Optional[asyncio.Queue] = field(default=None, repr=False)
+
+    @property
+    def is_async(self) -> bool:
+        """
+        Whether handler is a coroutine function (or an object with an async "__call__").
+        """
+        return inspect.iscoroutinefunction(self.handler) or inspect.iscoroutinefunction(
+            getattr(self.handler, "__call__", None)
+        )
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        Seconds before retrying a batch after its "attempt"-th failure.
+        """
+        delay = min(self.retry_backoff * 2 ** (attempt - 1), self.max_retry_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue with batching workers, see module docstring.
+    Enqueue methods are thread safe.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 10_000,
+        put_timeout: float = 1.0,
+        drain_timeout: float = 10.0,
+    ):
+        """
+        Args:
+            max_pending: int. Maximum number of queued + running jobs.
+            put_timeout: float. Seconds "submit" waits for free space.
+            drain_timeout: float. Seconds "stop" waits for pending jobs.
+        """
+        self.max_pending = max_pending
+        self.put_timeout = put_timeout
+        self.drain_timeout = drain_timeout
+        self.job_types: dict[str, JobType] = {}
+        self._pending = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._space: Optional[asyncio.Condition] = None
+        self._workers: list[asyncio.Task] = []
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether jobs are queued (started and not stopping) or handled inline.
+        """
+        return self._loop is not None and not self._stopping
+
+    def register(self, name: str, handler: Handler, **options: Any) -> JobType:
+        """
+        Register handler of a job type, before "start".
+
+        Args:
+            name: str. Job type.
+            handler: Handler. Function (sync or async) called with a list of payloads.
+            options: Any. Batching/retry options, see JobType.
+
+        Returns:
+            job_type: JobType
+        """
+        if self._loop is not None:
+            raise RuntimeError("Job types must be registered before start")
+        job_type = JobType(name=name, handler=handler, **options)
+        self.job_types[name] = job_type
+        return job_type
+
+    async def enqueue(self, name: str, payload: Any) -> None:
+        """
+        Queue a job from async code, waiting for free space (backpressure).
+        Not started: the job is handled now.
+
+        Args:
+            name: str. Registered job type.
+            payload: Any. Argument of the job, passed to the handler in a list.
+        """
+        job_type = self.job_types[name]
+        if not self.running:
+            await self._call(job_type, [payload])
+            return
+        assert self._space is not None
+        async with self._space:
+            await self._space.wait_for(lambda: self._pending < self.max_pending)
+            self._put(job_type, payload)
+
+    def submit(self, name: str, payload: Any) -> None:
+        """
+        Queue a job from sync code, e.g. services and sync endpoints (threadpool).
+        Not started: the job is handled now, in the calling thread.
+
+        Args:
+            name: str. Registered job type.
+            payload: Any. Argument of the job, passed to the handler in a list.
+
+        Raises:
+            JobQueueFullError: no free space within "put_timeout" seconds (at
+                once from the event loop thread, which must not block).
+        """
+        job_type = self.job_types[name]
+        loop = self._loop
+        if loop is None or self._stopping:
+            result = job_type.handler([payload])
+            if inspect.isawaitable(result):
+                asyncio.run(result)  # type: ignore[arg-type]
+            return
+        if _running_loop() is loop:
+            if self._pending >= self.max_pending:
+                raise JobQueueFullError(
+                    f"Too many pending background jobs ({self.max_pending})"
+                )
+            self._put(job_type, payload)
+            return
+        future = asyncio.run_coroutine_threadsafe(self.enqueue(name, payload), loop)
+        try:
+            future.result(timeout=self.put_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise JobQueueFullError(
+                f"Too many pending background jobs ({self.max_pending})"
+            )
+
+    async def start(self) -> None:
+        """
+        Start workers of registered job types in the running event loop.
+        Do nothing if already started.
+        """
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._space = asyncio.Condition()
+        self._stopping = False
+        for job_type in self.job_types.values():
+            job_type.queue = asyncio.Queue()
+            self._workers.extend(
+                asyncio.create_task(
+                    self._work(job_type), name=f"job-worker-{job_type.name}"
+                )
+                for _ in range(job_type.workers)
+            )
+
+    async def stop(self) -> None:
+        """
+        Drain queued jobs (graceful shutdown), waiting up to "drain_timeout"
+        seconds, then stop workers. Jobs submitted meanwhile are handled inline.
+        """
+        if self._loop is None:
+            return
+        self._stopping = True
+        queues = [
+            job_type.queue.join()
+            for job_type in self.job_types.values()
+            if job_type.queue is not None
+        ]
+        try:
+            await asyncio.wait_for(asyncio.gather(*queues), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.error("Dropped %d pending background jobs on stop", self._pending)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._pending = 0
+        self._loop = None
+
+    def samples(self) -> list[Sample]:
+        """
+        Statistics of job types, as metric samples labeled type=name.
+        """
+        samples = []
+        for name, job_type in self.job_types.items():
+            labels = {"type": name}
+            queued = job_type.queue.qsize() if job_type.queue is not None else 0
+            samples += [
+                Sample(
+                    "jobs_queued", "gauge", "Jobs waiting for a worker.", labels, queued
+                ),
+                Sample(
+                    "jobs_processed_total",
+                    "counter",
+                    "Handled jobs.",
+                    labels,
+                    job_type.processed,
+                ),
+                Sample(
+                    "jobs_failed_total",
+                    "counter",
+                    "Jobs dropped after retries.",
+                    labels,
+                    job_type.failed,
+                ),
+            ]
+        return samples
+
+    def _put(self, job_type: JobType, payload: Any) -> None:
+        """
+        Queue job, in the event loop thread.
+        """
+        assert job_type.queue is not None
+        self._pending += 1
+        job_type.queue.put_nowait(payload)
+
+    async def _work(self, job_type: JobType) -> None:
+        """
+        Worker task: take a batch of jobs of job type, handle it, repeat.
+        """
+        queue = job_type.queue
+        assert queue is not None and self._space is not None
+        while True:
+            batch = [await queue.get()]
+            if job_type.batch_wait and not self._stopping:
+                if queue.qsize() < job_type.batch_size - 1:
+                    await asyncio.sleep(job_type.batch_wait)
+            while len(batch) < job_type.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._handle(job_type, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+                async with self._space:
+                    self._pending -= len(batch)
+                    self._space.notify(len(batch))
+
+    async def _handle(self, job_type: JobType, batch: list[Any]) -> None:
+        """
+        Call handler with batch, retry failures with backoff, then drop the batch.
+        """
+        for attempt in range(1, job_type.max_attempts + 1):
+            try:
+                await self._call(job_type, batch)
+            except Exception:
+                if attempt == job_type.max_attempts:
+                    job_type.failed += len(batch)
+                    logger.exception(
+                        "Dropped %d %r jobs after %d attempts",
+                        len(batch),
+                        job_type.name,
+                        attempt,
+                    )
+                    return
+                delay = job_type.retry_delay(attempt)
+                logger.warning(
+                    "Failed %d %r jobs (attempt %d), retry in %.2fs",
+                    len(batch),
+                    job_type.name,
+                    attempt,
+                    delay,
+                    exc_info=True,
+                )
+                await asyncio.sleep(delay)
+            else:
+                job_type.processed += len(batch)
+                return
+
+    @staticmethod
+    async def _call(job_type: JobType, batch: list[Any]) -> None:
+        """
+        Call handler, in a thread if it is sync (it may block on the database).
+        """
+        if job_type.is_async:
+            await job_type.handler(batch)  # type: ignore[misc]
+        else:
+            await asyncio.to_thread(job_type.handler, batch)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """
+    Event loop running in the current thread, if any.
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+job_queue = JobQueue(
+    max_pending=settings.JOB_QUEUE_MAX_PENDING,
+    put_timeout=settings.JOB_QUEUE_PUT_TIMEOUT_SECONDS,
+    drain_timeout=settings.JOB_QUEUE_DRAIN_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,470 @@
+"""
+Request metrics (pure ASGI middleware) rendered in Prometheus text format.
+
+Requests are labeled by route template (e.g. "/api/v1/posts/{post_id}") rather
+than raw path, so the number of series stays bounded.
+
+Every worker process has its own registry. With several workers, set
+METRICS_MULTIPROCESS_DIR: each worker periodically writes a snapshot of its
+registry to "<dir>/<pid>.json" and /metrics sums snapshots of all workers.
+Counters of exited workers are kept, gauges only of running ones. Once the
+master reaps a worker, its snapshot is merged into "<dir>/exited.json" and
+deleted ("mark_process_dead"): recycled workers do not pile up files.
+
+Other components publish their own values with "register_collector" (e.g.
+connection pool statistics, see app.db.pool).
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Literal, NamedTuple, Optional
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Upper bounds of response size histogram buckets (bytes)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+# Route label of requests matching no route (404), whatever their path
+UNMATCHED_ROUTE = "<unmatched>"
+# Any other method is labeled "OTHER", clients choose methods
+METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT")
+)
+
+# Counters and histograms of all exited workers, merged by "mark_process_dead"
+EXITED_SNAPSHOT = "exited.json"
+
+# Histogram series: one count per bucket (not cumulative, last is "+Inf"), then sum
+Series = list[float]
+
+
+class Sample(NamedTuple):
+    """
+    Value of a gauge or counter published by a collector.
+    """
+
+    name: str
+    kind: Literal["gauge", "counter"]
+    help: str
+    labels: dict[str, str]
+    value: float
+
+
+Collector = Callable[[], Iterable[Sample]]
+
+
+def _observe(
+    histogram: dict[tuple[str, ...], Series],
+    key: tuple[str, ...],
+    buckets: Sequence[float],
+    value: float,
+) -> None:
+    """
+    Add value to histogram series of key.
+    """
+    series = histogram.get(key)
+    if series is None:
+        series = histogram[key] = [0] * (len(buckets) + 1) + [0.0]
+    series[bisect_left(buckets, value)] += 1
+    series[-1] += value
+
+
+class MetricsRegistry:
+    """
+    In-process request metrics:
+        - http_requests_total{method, route, status}: counter
+        - http_request_duration_seconds{method, route}: histogram
+        - http_response_size_bytes{method, route}: histogram
+        - http_requests_in_progress: gauge
+        - samples of registered collectors
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Iterable[float] = tuple(settings.METRICS_LATENCY_BUCKETS),
+        size_buckets: Iterable[float] = SIZE_BUCKETS,
+        directory: Optional[str] = None,
+        flush_interval: float = 5.0,
+    ):
+        """
+        Args:
+            latency_buckets: Iterable[float]. Upper bounds of latency buckets (seconds).
+            size_buckets: Iterable[float]. Upper bounds of size buckets (bytes).
+            directory: Optional[str]. Shared directory of worker snapshots.
+                None: single process, only this registry is rendered.
+            flush_interval: float. Seconds between two snapshots written by "start".
+        """
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.size_buckets = tuple(sorted(size_buckets))
+        self.directory = directory
+        self.flush_interval = flush_interval
+        # Requests are observed by the event loop, snapshots taken by other threads
+        self._lock = threading.Lock()
+        self.in_progress = 0
+        self._requests: dict[tuple[str, ...], int] = {}
+        self._latency: dict[tuple[str, ...], Series] = {}
+        self._size: dict[tuple[str, ...], Series] = {}
+        self._collectors: list[Collector] = []
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def observe(
+        self, method: str, route: str, status: str, duration: float, size: int
+    ) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            method: str. HTTP method.
+            route: str. Route template.
+            status: str. Response status code.
+            duration: float. Latency in seconds.
+            size: int. Response body size in bytes.
+        """
+        key = (method, route)
+        request_key = (method, route, status)
+        with self._lock:
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+            _observe(self._latency, key, self.latency_buckets, duration)
+            _observe(self._size, key, self.size_buckets, size)
+
+    def register_collector(self, collector: Collector) -> None:
+        """
+        Add a function called on every snapshot, returning samples to publish.
+        Registering a collector again has no effect.
+        """
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        JSON serializable copy of registry, see "merge_snapshots".
+        """
+        samples = [
+            list(sample) for collector in self._collectors for sample in collector()
+        ]
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "in_progress": self.in_progress,
+                "requests": [[*key, count] for key, count in self._requests.items()],
+                "latency": [[*key, *series] for key, series in self._latency.items()],
+                "size": [[*key, *series] for key, series in self._size.items()],
+                "samples": samples,
+            }
+
+    def write_snapshot(self) -> None:
+        """
+        Write snapshot of this worker to the shared directory, atomically.
+        """
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        _write_atomic(path, self.snapshot())
+
+    def mark_process_dead(self, pid: int) -> None:
+        """
+        Merge snapshot of exited worker "pid" into the snapshot of exited
+        workers, then delete it: counters and histograms are kept, gauges are
+        dropped. Called by the master once it reaped the worker, the only writer
+        of the exited snapshot (like "mark_process_dead" of prometheus_client).
+        """
+        if self.directory is None:
+            return
+        path = os.path.join(self.directory, f"{pid}.json")
+        try:
+            with open(path, "rb") as file:
+                snapshot = orjson.loads(file.read())
+        except FileNotFoundError:
+            return
+        except orjson.JSONDecodeError:
+            # Torn or foreign file, nothing to keep
+            os.remove(path)
+            return
+        exited_path = os.path.join(self.directory, EXITED_SNAPSHOT)
+        snapshots = [{**snapshot, "pid": None}]
+        try:
+            with open(exited_path, "rb") as file:
+                snapshots.append(orjson.loads(file.read()))
+        except FileNotFoundError:
+            pass
+        _write_atomic(exited_path, merge_snapshots(snapshots))
+        os.remove(path)
+
+    def read_snapshots(self) -> list[dict[str, Any]]:
+        """
+        Snapshots of all workers in the shared directory.
+        """
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "rb") as file:
+                    snapshots.append(orjson.loads(file.read()))
+            except (OSError, orjson.JSONDecodeError):
+                # Removed meanwhile or foreign file
+                continue
+        return snapshots
+
+    def render_latest(self) -> str:
+        """
+        Current metrics of all workers in Prometheus text format.
+        """
+        if self.directory is None:
+            return self.render(self.snapshot())
+        # Fresh values for this worker, others are at most "flush_interval" old
+        self.write_snapshot()
+        return self.render(merge_snapshots(self.read_snapshots()))
+
+    def render(self, snapshot: dict[str, Any]) -> str:
+        """
+        Render snapshot in Prometheus text format.
+        """
+        lines = [
+            "# HELP http_requests_total Total HTTP requests.",
+            "# TYPE http_requests_total counter",
+        ]
+        for method, route, status, count in snapshot["requests"]:
+            labels = _labels(method=method, route=route, status=status)
+            lines.append(f"http_requests_total{{{labels}}} {count}")
+        lines += _render_histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency in seconds.",
+            self.latency_buckets,
+            snapshot["latency"],
+        )
+        lines += _render_histogram(
+            "http_response_size_bytes",
+            "HTTP response body size in bytes.",
+            self.size_buckets,
+            snapshot["size"],
+        )
+        lines += [
+            "# HELP http_requests_in_progress HTTP requests being served.",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress {snapshot['in_progress']}",
+        ]
+        lines += _render_samples(snapshot["samples"])
+        return "\n".join(lines) + "\n"
+
+    def start(self) -> None:
+        """
+        Start background thread writing snapshots, when a shared directory is set.
+        """
+        if self.directory is None or self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-snapshot", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop background thread and write a last snapshot.
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        self.write_snapshot()
+
+    def _run(self) -> None:
+        """
+        Background loop writing snapshots.
+        """
+        while not self._stopping.wait(self.flush_interval):
+            self.write_snapshot()
+
+
+def merge_snapshots(snapshots: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Sum snapshots of several workers. Gauges of exited workers (and of snapshots
+    without pid, e.g. merged ones) are ignored (e.g. in-progress requests), their
+    counters and histograms are kept.
+
+    Args:
+        snapshots: Iterable[dict[str, Any]]. Snapshots of "MetricsRegistry.snapshot".
+
+    Returns:
+        snapshot: dict[str, Any]. Merged snapshot.
+    """
+    in_progress = 0
+    requests: dict[tuple, int] = {}
+    histograms: dict[str, dict[tuple, list[float]]] = {"latency": {}, "size": {}}
+    samples: dict[tuple, list] = {}
+    for snapshot in snapshots:
+        running = _is_running(snapshot["pid"])
+        if running:
+            in_progress += snapshot["in_progress"]
+        for name, kind, description, labels, value in snapshot["samples"]:
+            if kind == "gauge" and not running:
+                continue
+            key = (name, *sorted(labels.items()))
+            if key in samples:
+                samples[key][-1] += value
+            else:
+                samples[key] = [name, kind, description, labels, value]
+        for *key, count in snapshot["requests"]:
+            requests[tuple(key)] = requests.get(tuple(key), 0) + count
+        for name, merged in histograms.items():
+            for method, route, *series in snapshot[name]:
+                current = merged.get((method, route))
+                merged[(method, route)] = (
+                    series
+                    if current is None
+                    else [a + b for a, b in zip(current, series)]
+                )
+    return {
+        "pid": None,
+        "in_progress": in_progress,
+        "requests": [[*key, count] for key, count in requests.items()],
+        **{
+            name: [[*key, *series] for key, series in merged.items()]
+            for name, merged in histograms.items()
+        },
+        "samples": list(samples.values()),
+    }
+
+
+def _write_atomic(path: str, snapshot: dict[str, Any]) -> None:
+    """
+    Write snapshot to path, readers never see a partial file.
+    """
+    with open(f"{path}.tmp", "wb") as file:
+        file.write(orjson.dumps(snapshot))
+    os.replace(f"{path}.tmp", path)
+
+
+def _is_running(pid: Optional[int]) -> bool:
+    """
+    Whether process of pid exists. None: a merged snapshot, of no process.
+    """
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        pass
+    return True
+
+
+def _labels(**labels: str) -> str:
+    """
+    Prometheus label set, values escaped.
+    """
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    """
+    Escape label value (backslash, double quote and line feed).
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(
+    name: str, description: str, buckets: Sequence[float], rows: list[list]
+) -> list[str]:
+    """
+    Render histogram series (cumulative buckets, sum and count).
+    """
+    bounds = [repr(bound) for bound in buckets] + ["+Inf"]
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for method, route, *series in rows:
+        labels = _labels(method=method, route=route)
+        cumulative = 0
+        for bound, count in zip(bounds, series):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {series[-1]}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+
+def _render_samples(samples: list[list]) -> list[str]:
+    """
+    Render collector samples, grouped by metric name.
+    """
+    by_name: dict[str, list[list]] = {}
+    for sample in samples:
+        by_name.setdefault(sample[0], []).append(sample)
+    lines = []
+    for name, group in by_name.items():
+        _, kind, description, _, _ = group[0]
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+        for *_, labels, value in group:
+            label_set = f"{{{_labels(**labels)}}}" if labels else ""
+            lines.append(f"{name}{label_set} {value}")
+    return lines
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording every HTTP request in a MetricsRegistry.
+    The route template is read after the request from scope["route"], set by
+    the router when a route matched.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Optional[MetricsRegistry] = None):
+        """
+        Args:
+            app: ASGIApp. Wrapped application.
+            registry: Optional[MetricsRegistry]. None: "metrics_registry".
+        """
+        self.app = app
+        self.registry = registry or metrics_registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Serve request and record its latency, status and response size.
+        Unhandled exceptions are recorded as 500.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        registry = self.registry
+        registry.in_progress += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            registry.in_progress -= 1
+            route = scope.get("route")
+            method = scope["method"]
+            registry.observe(
+                method if method in METHODS else "OTHER",
+                getattr(route, "path", UNMATCHED_ROUTE),
+                str(status),
+                duration,
+                size,
+            )
+
+
+metrics_registry = MetricsRegistry(
+    latency_buckets=settings.METRICS_LATENCY_BUCKETS,
+    directory=settings.METRICS_MULTIPROCESS_DIR,
+    flush_interval=settings.METRICS_FLUSH_INTERVAL_SECONDS,
+)
@@ -0,0 +1,241 @@
+"""
+In-process token bucket rate limiting (pure ASGI middleware).
+
+Buckets are refilled lazily (on access, from elapsed time), there is no timer per
+bucket. Every worker process has its own buckets: with N workers a client gets
+up to N times the configured rate in the worst case.
+"""
+import re
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from math import ceil
+from typing import Optional
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import RateLimitRule, settings
+from app.core.security import InvalidTokenError, decode_access_token
+from app.core.token_cache import token_cache
+
+
+class TokenBucketStore:
+    """
+    Token buckets split in shards, each shard is a dict guarded by its own lock,
+    so concurrent callers (threadpool, several event loops) rarely contend.
+    A bucket is [tokens, updated_at, full_at]: once "full_at" is reached the
+    bucket equals a new one, idle buckets are evicted without changing any limit.
+    """
+
+    def __init__(self, shards: int = 16, sweep_interval: float = 60.0):
+        """
+        Args:
+            shards: int. Number of independently locked dicts.
+            sweep_interval: float. Seconds to sweep all shards once, one shard per
+                "sweep_interval / shards" seconds to keep every sweep short.
+        """
+        self._shards: list[tuple[dict[str, list[float]], threading.Lock]] = [
+            ({}, threading.Lock()) for _ in range(shards)
+        ]
+        self._sweep_step = sweep_interval / shards
+        self._next_sweep = time.monotonic() + self._sweep_step
+        self._sweep_shard = 0
+
+    def consume(
+        self, key: str, rate: float, burst: int, now: Optional[float] = None
+    ) -> float:
+        """
+        Take one token from bucket of key.
+
+        Args:
+            key: str. Bucket key.
+            rate: float. Refill rate (tokens per second).
+            burst: int. Bucket capacity.
+            now: Optional[float]. Monotonic time, None: current time.
+
+        Returns:
+            retry_after: float. 0 if token was taken, else seconds until a token is available.
+        """
+        if now is None:
+            now = time.monotonic()
+        buckets, lock = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                tokens = float(burst)
+            else:
+                tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            buckets[key] = [tokens, now, now + (burst - tokens) / rate]
+        if now >= self._next_sweep:
+            self.sweep(now)
+        return 0.0 if allowed else (1 - tokens) / rate
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Evict full buckets of the next shard (round-robin).
+
+        Returns:
+            count: int. Number of evicted buckets.
+        """
+        if now is None:
+            now = time.monotonic()
+        self._next_sweep = now + self._sweep_step
+        buckets, lock = self._shards[self._sweep_shard]
+        self._sweep_shard = (self._sweep_shard + 1) % len(self._shards)
+        with lock:
+            idle_keys = [key for key, bucket in buckets.items() if bucket[2] <= now]
+            for key in idle_keys:
+                del buckets[key]
+        return len(idle_keys)
+
+    def __len__(self) -> int:
+        """
+        Number of buckets (include idle buckets not yet evicted).
+        """
+        return sum(len(buckets) for buckets, _ in self._shards)
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    """
+    Rate limit rule with compiled path pattern and bucket key prefix.
+    """
+
+    rule: RateLimitRule
+    pattern: re.Pattern
+    prefix: str
+
+
+def compile_path(path: str) -> re.Pattern:
+    """
+    Compile path template: "{param}" matches one path segment.
+    """
+    parts = re.split(r"\{[^/{}]+\}", path)
+    return re.compile("[^/]+".join(re.escape(part) for part in parts) + "/?")
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware rejecting requests over their route limit with 429.
+    Requests matching no rule only pay one dict lookup.
+    """
+
+    # Maximum number of cached (method, path) -> rule matches
+    MATCH_CACHE_SIZE = 10_000
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Sequence[RateLimitRule],
+        store: Optional[TokenBucketStore] = None,
+    ):
+        """
+        Args:
+            app: ASGIApp. Wrapped application.
+            rules: Sequence[RateLimitRule]. First matching rule applies.
+            store: Optional[TokenBucketStore]. None: store configured by settings.
+        """
+        self.app = app
+        self.rules = [
+            _CompiledRule(rule=rule, pattern=compile_path(rule.path), prefix=f"{i}:")
+            for i, rule in enumerate(rules)
+        ]
+        self.store = store or TokenBucketStore(
+            shards=settings.RATE_LIMIT_SHARDS,
+            sweep_interval=settings.RATE_LIMIT_SWEEP_INTERVAL_SECONDS,
+        )
+        self._matches: dict[tuple[str, str], Optional[_CompiledRule]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Take a token of the matching rule bucket, or answer 429 with Retry-After.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        compiled = self.match(scope["method"], scope["path"])
+        if compiled is None:
+            await self.app(scope, receive, send)
+            return
+
+        rule = compiled.rule
+        retry_after = self.store.consume(
+            compiled.prefix + self.client_key(rule, scope), rule.rate, rule.burst
+        )
+        if retry_after:
+            response = ORJSONResponse(
+                {"detail": "Too many requests."},
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    def match(self, method: str, path: str) -> Optional[_CompiledRule]:
+        """
+        First rule matching method and path, cached by (method, path).
+        """
+        cache_key = (method, path)
+        try:
+            return self._matches[cache_key]
+        except KeyError:
+            pass
+        compiled = next(
+            (
+                compiled
+                for compiled in self.rules
+                if compiled.rule.method in ("*", method)
+                and compiled.pattern.fullmatch(path)
+            ),
+            None,
+        )
+        if len(self._matches) >= self.MATCH_CACHE_SIZE:
+            self._matches.clear()
+        self._matches[cache_key] = compiled
+        return compiled
+
+    @staticmethod
+    def client_key(rule: RateLimitRule, scope: Scope) -> str:
+        """
+        Bucket key of request for rule: route, "user:<id>" or "ip:<address>".
+        """
+        if rule.key == "route":
+            return "route"
+        if rule.key == "user":
+            user_id = _user_id(scope)
+            if user_id is not None:
+                return f"user:{user_id}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else ''}"
+
+
+def _user_id(scope: Scope) -> Optional[str]:
+    """
+    Id of user authenticated by bearer token of request, None for anonymous or
+    invalid token. Tokens verified by "get_current_user" are served by token_cache,
+    peeked: the lookup is not counted as a hit or miss of the request. Revocations
+    are not checked (a store round trip in the event loop): requests of revoked
+    tokens are limited as their user, then rejected by "get_current_user".
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            break
+    else:
+        return None
+    if scheme.lower() != "bearer" or not token:
+        return None
+    cache_entry = token_cache.peek(token)
+    if cache_entry is not None:
+        return str(cache_entry.user.id)
+    try:
+        return str(decode_access_token(token)["sub"])
+    except (InvalidTokenError, KeyError):
+        return None
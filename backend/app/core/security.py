@@ -1,12 +1,39 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any
-
-from jose import jwt
-from passlib.context import CryptContext
+from math import ceil
+from typing import TYPE_CHECKING, Any, Optional
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# jose (with cryptography) and passlib are imported on first use: they are
+# heavy imports, not needed to start the application.
+
+
+class InvalidTokenError(ValueError):
+    """
+    Raised when an access token is malformed, badly signed or expired.
+    """
+
+
+@functools.lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """
+    Password hashing context of PASSWORD_HASH_SCHEME, created on first use.
+    """
+    from passlib.context import CryptContext
+
+    if settings.PASSWORD_HASH_SCHEME == "fast":
+        return CryptContext(schemes=["bcrypt"], bcrypt__rounds=4, deprecated="auto")
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_access_token(subject: Any, expires_delta: timedelta = None) -> str:
@@ -27,6 +54,8 @@ def create_access_token(subject: Any, expires_delta: timedelta = None) -> str:
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
+    from jose import jwt
+
     to_encode = {"exp": expire, "sub": subject}
     encoded_jwt = jwt.encode(
         claims=to_encode, key=settings.SECRET_KEY, algorithm=settings.AUTH_ALGORITH
@@ -34,6 +63,29 @@ def create_access_token(subject: Any, expires_delta: timedelta = None) -> str:
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> dict[str, Any]:
+    """
+    Decode and verify access token (signature and expiration).
+
+    Args:
+        token: str. Access token created by "create_access_token".
+
+    Returns:
+        claims: dict[str, Any]
+
+    Raises:
+        InvalidTokenError: token is invalid or expired.
+    """
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(
+            token=token, key=settings.SECRET_KEY, algorithms=[settings.AUTH_ALGORITH]
+        )
+    except JWTError as error:
+        raise InvalidTokenError(str(error)) from error
+
+
 def generate_hashed_password(password: str) -> str:
     """
     Encrypt and keep password secret with hash algorithm.
@@ -44,7 +96,7 @@ def generate_hashed_password(password: str) -> str:
     Returns:
         hashed_password: str
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
@@ -58,4 +110,161 @@ def verify_password(password: str, hashed_password: str) -> bool:
     Returns:
         is_valid: bool.
     """
-    return pwd_context.verify(password, hashed_password)
+    return get_pwd_context().verify(password, hashed_password)
+
+
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    """
+    Hash a chunk of passwords in one worker call (batch API).
+    """
+    return [generate_hashed_password(password) for password in passwords]
+
+
+class PasswordHashQueueFullError(Exception):
+    """
+    Raised when password hash executor has too many pending jobs.
+    """
+
+
+class PasswordHashExecutor:
+    """
+    Run CPU-bound password hashing/verifying in a process pool.
+    Number of queued + running jobs is bounded: when it is full, new jobs are
+    rejected immediately with PasswordHashQueueFullError (mapped to HTTP 503)
+    instead of piling up behind the busy workers.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 64):
+        """
+        Args:
+            max_workers: Optional[int]. Size of process pool. None: number of CPU cores.
+                0: run jobs inline in the calling thread (no pool).
+            max_pending: int. Maximum number of queued + running jobs.
+        """
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """
+        Lazily started process pool. Workers are spawned (not forked) so they
+        do not inherit threads and sockets of the web process.
+        """
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def submit(self, fn: Callable, *args: Any, block: bool = False) -> Future:
+        """
+        Submit a job to the pool.
+
+        Args:
+            fn: Callable. Picklable (module level) function.
+            args: Any. Arguments of function.
+            block: bool. Wait for a free slot instead of raising error.
+
+        Returns:
+            future: Future
+
+        Raises:
+            PasswordHashQueueFullError
+        """
+        if self.max_workers == 0:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+
+        if not self._slots.acquire(blocking=block):
+            raise PasswordHashQueueFullError(
+                "Password hashing service is busy. Please retry later."
+            )
+        try:
+            future = self.executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def hash_password(self, password: str) -> str:
+        """
+        Hash password in the pool and wait for result.
+        """
+        return self.submit(generate_hashed_password, password).result()
+
+    def verify_password(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify password in the pool and wait for result.
+        """
+        return self.submit(verify_password, password, hashed_password).result()
+
+    async def async_hash_password(self, password: str) -> str:
+        """
+        Hash password in the pool without blocking the event loop.
+        """
+        return await asyncio.wrap_future(
+            self.submit(generate_hashed_password, password)
+        )
+
+    async def async_verify_password(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify password in the pool without blocking the event loop.
+        """
+        return await asyncio.wrap_future(
+            self.submit(verify_password, password, hashed_password)
+        )
+
+    def hash_passwords(
+        self, passwords: list[str], chunk_size: Optional[int] = None
+    ) -> list[str]:
+        """
+        Batch hash passwords (bulk user imports). Passwords are split in chunks
+        spread over the workers. Batch jobs wait for free slots, they are never
+        rejected.
+
+        Args:
+            passwords: list[str]
+            chunk_size: Optional[int]. Number of passwords per job. By default,
+                passwords are split evenly between workers.
+
+        Returns:
+            hashed_passwords: list[str]. Same order as "passwords".
+        """
+        if not passwords:
+            return []
+        chunk_size = chunk_size or ceil(len(passwords) / max(self.max_workers, 1))
+        chunks = [
+            passwords[start:stop]
+            for start, stop in zip(
+                range(0, len(passwords), chunk_size),
+                range(chunk_size, len(passwords) + chunk_size, chunk_size),
+            )
+        ]
+        futures = [self.submit(_hash_passwords, chunk, block=True) for chunk in chunks]
+        return [hashed for future in futures for hashed in future.result()]
+
+    def shutdown(self) -> None:
+        """
+        Stop worker processes. The pool is restarted lazily on next job.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+password_hash_executor = PasswordHashExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
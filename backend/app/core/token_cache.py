@@ -0,0 +1,249 @@
+"""
+In-process cache of verified access tokens.
+Skip JWT decoding and the user query of "get_current_user" for known tokens.
+
+Only verified tokens are cached in process. Revoked tokens and evicted users
+are recorded in a cache backend (TOKEN_REVOCATION_BACKEND), checked by every
+lookup: with several worker processes, it must be shared ("redis"), a "memory"
+store only reaches the worker which revoked.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.cache import CacheBackend, MemoryCacheBackend, create_cache_backend
+from app.core.config import settings
+from app.schemas.user import InDBUserSchema
+
+
+@dataclass(frozen=True)
+class TokenCacheEntry:
+    """
+    Verified claims of token and snapshot of its user.
+    """
+
+    claims: dict[str, Any]
+    user: InDBUserSchema
+    expires_at: float
+    # Time the user snapshot was read
+    loaded_at: float
+
+
+class TokenCache:
+    """
+    Bounded LRU + TTL cache keyed by token digest (raw tokens are not kept).
+    Entries expire at the token "exp" claim, or after "ttl" seconds, whichever
+    comes first. Thread safe: sync dependencies run in the threadpool.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: int = 60,
+        enabled: bool = True,
+        revocations: Optional[CacheBackend] = None,
+    ):
+        """
+        Args:
+            max_size: int. Maximum number of entries, least recently used are evicted.
+            ttl: int. Maximum lifetime (seconds) of an entry.
+            enabled: bool. Disabled cache never stores entries (revocation still works).
+            revocations: Optional[CacheBackend]. Store of revoked tokens and evicted
+                users, shared by workers to be exact. None: in-process store.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self.revocations = MemoryCacheBackend() if revocations is None else revocations
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, TokenCacheEntry] = OrderedDict()
+        self._user_digests: dict[Any, set[bytes]] = {}
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """
+        Cache key of token.
+        """
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[TokenCacheEntry]:
+        """
+        Get cached entry of token. Return None if missing, expired or loaded
+        before an eviction of its user (by any worker, see "evict_user").
+
+        Args:
+            token: str. Access token.
+
+        Returns:
+            entry: Optional[TokenCacheEntry]
+        """
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                self._discard(key)
+                self.misses += 1
+                return None
+        if entry.loaded_at <= self._evicted_at(entry.user.id):
+            with self._lock:
+                # Unless replaced meanwhile
+                if self._entries.get(key) is entry:
+                    self._discard(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry
+
+    def peek(self, token: str) -> Optional[TokenCacheEntry]:
+        """
+        Get cached entry of token without side effect: hit/miss counters, LRU
+        order and expired entries are left unchanged, revocations are not
+        checked. Return None if missing or expired.
+
+        Args:
+            token: str. Access token.
+
+        Returns:
+            entry: Optional[TokenCacheEntry]
+        """
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry
+
+    def set(
+        self,
+        token: str,
+        claims: dict[str, Any],
+        user: InDBUserSchema,
+        loaded_at: Optional[float] = None,
+    ) -> None:
+        """
+        Cache verified claims and user snapshot of token.
+
+        Args:
+            token: str. Access token.
+            claims: dict[str, Any]. Verified claims of token.
+            user: InDBUserSchema. Snapshot of token user.
+            loaded_at: Optional[float]. Time (before) the user was read, entries
+                of users evicted since are dropped. Default: now.
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        expires_at = min(float(claims["exp"]), now + self.ttl)
+        key = self.digest(token)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = TokenCacheEntry(
+                claims=claims,
+                user=user,
+                expires_at=expires_at,
+                loaded_at=now if loaded_at is None else loaded_at,
+            )
+            self._user_digests.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def revoke(self, token: str, exp: Optional[float] = None) -> None:
+        """
+        Revoke token: drop cached entry and reject token until it expires.
+
+        Args:
+            token: str. Access token.
+            exp: Optional[float]. "exp" claim of token. Default: now + the longest
+                token lifetime (ACCESS_TOKEN_EXPIRE_MINUTES).
+        """
+        key = self.digest(token)
+        if exp is None:
+            exp = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        lifetime = math.ceil(exp - time.time())
+        if lifetime > 0:
+            self.revocations.set(f"revoked:{key.hex()}", b"1", ttl=lifetime)
+        with self._lock:
+            self._discard(key)
+
+    def is_revoked(self, token: str) -> bool:
+        """
+        Check token is revoked or not.
+        """
+        key = self.digest(token)
+        return self.revocations.get(f"revoked:{key.hex()}") is not None
+
+    def evict_user(self, user_id: Any) -> None:
+        """
+        Drop all cached entries of user, e.g. when its permissions change. Other
+        workers drop theirs on their next lookup.
+        """
+        # Entries live at most "ttl" seconds: older evictions are irrelevant
+        self.revocations.set(
+            f"evicted:{user_id}", repr(time.time()).encode(), ttl=self.ttl + 1
+        )
+        with self._lock:
+            for key in list(self._user_digests.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset counters (revocations are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._user_digests.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Hit/miss counters and size of cache.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+        }
+
+    def _evicted_at(self, user_id: Any) -> float:
+        """
+        Time of the last eviction of user, 0 if none within "ttl".
+        """
+        evicted_at = self.revocations.get(f"evicted:{user_id}")
+        return 0.0 if evicted_at is None else float(evicted_at)
+
+    def _discard(self, key: bytes) -> None:
+        """
+        Remove entry of digest. Caller must hold the lock.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        digests = self._user_digests.get(entry.user.id)
+        if digests is not None:
+            digests.discard(key)
+            if not digests:
+                del self._user_digests[entry.user.id]
+
+
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+    enabled=settings.TOKEN_CACHE_ENABLED,
+    revocations=create_cache_backend(
+        settings.TOKEN_REVOCATION_BACKEND,
+        ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        max_size=settings.TOKEN_REVOCATION_MAX_SIZE,
+        redis_url=settings.TOKEN_REVOCATION_REDIS_URL,
+    ),
+)
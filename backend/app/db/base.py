@@ -5,5 +5,7 @@ from app.models.category import Category  # noqa
 from app.models.comment import Comment  # noqa
 from app.models.post import Post  # noqa
 from app.models.post_tag import PostTag  # noqa
+from app.models.rollup import RollupRefresh  # noqa
 from app.models.tag import Tag  # noqa
 from app.models.user import User  # noqa
+from app.models.vote import Vote  # noqa
@@ -2,8 +2,9 @@
 Base SQLAlchemy model class
 """
 
-from typing import Any
+from typing import Any, ClassVar
 
+from sqlalchemy import Column, DateTime, Table, func
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 
 
@@ -15,6 +16,7 @@ class Base:
 
     id: Any
     __name__: str
+    __table__: ClassVar[Table]
 
     # Generate __tablename__ automatically
     @declared_attr  # type: ignore[arg-type]
@@ -26,3 +28,23 @@ class Base:
             tablename: str
         """
         return cls.__name__.lower()
+
+
+class TimestampMixin:
+    """
+    Creation and last modification time of rows, set by the database clock.
+    "updated_at" is refreshed when an ORM flush updates the row (BaseService.update
+    with changed values) and by upserts of BaseService.bulk_insert/bulk_copy.
+    "statement_timestamp()": every update of a transaction gets its own time
+    ("now()" is the start time of the transaction).
+    """
+
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.statement_timestamp(),
+    )
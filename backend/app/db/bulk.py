@@ -0,0 +1,144 @@
+"""
+Helpers of high volume imports: chunking, Postgres COPY and ON CONFLICT clauses.
+"""
+import io
+import itertools
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from typing import Any, Optional
+
+from sqlalchemy import Column, MetaData, Table, func, select, text
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.engine import Connection
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """
+    Split iterable in lists of "size" items, without materializing the iterable.
+    """
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def apply_on_conflict(
+    stmt: Insert,
+    conflict_columns: Optional[Sequence[str]],
+    update_fields: Optional[Sequence[str]],
+) -> Insert:
+    """
+    Add "ON CONFLICT (conflict_columns)" clause to insert statement.
+
+    Args:
+        stmt: Insert. Postgres insert statement.
+        conflict_columns: Optional[Sequence[str]]. Columns of unique constraint/index.
+            None: no ON CONFLICT clause.
+        update_fields: Optional[Sequence[str]]. Columns updated from the conflicting
+            row ("DO UPDATE"). None or empty: "DO NOTHING".
+
+    Returns:
+        stmt: Insert
+    """
+    if not conflict_columns:
+        return stmt
+    if not update_fields:
+        return stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+    set_ = {field: stmt.excluded[field] for field in update_fields}
+    # "onupdate" column defaults do not apply to ON CONFLICT clauses
+    if "updated_at" in stmt.table.c and "updated_at" not in set_:
+        set_["updated_at"] = func.statement_timestamp()
+    return stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+
+
+def _copy_text_value(value: Any) -> str:
+    """
+    Encode value for COPY text format.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(
+    connection: Connection, table_name: str, columns: Sequence[str], rows: list[dict]
+) -> None:
+    """
+    Load rows with "COPY table (columns) FROM STDIN" (psycopg2 driver).
+
+    Args:
+        connection: Connection. SQLAlchemy connection.
+        table_name: str. Target table.
+        columns: Sequence[str]. Columns of rows, same order for every row.
+        rows: list[dict]. Rows (column dicts).
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_text_value(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    preparer = connection.dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(column) for column in columns)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {preparer.quote(table_name)} ({column_list}) FROM STDIN", buffer
+        )
+    finally:
+        cursor.close()
+
+
+def copy_upsert_rows(
+    connection: Connection,
+    table: Table,
+    columns: Sequence[str],
+    rows: list[dict],
+    conflict_columns: Sequence[str],
+    update_fields: Optional[Sequence[str]],
+) -> list[Any]:
+    """
+    COPY rows into a temporary staging table, then move them to "table" with
+    "INSERT ... SELECT ... ON CONFLICT". COPY itself does not support ON CONFLICT.
+
+    Args:
+        connection: Connection. SQLAlchemy connection.
+        table: Table. Target table.
+        columns: Sequence[str]. Columns of rows.
+        rows: list[dict]. Rows (column dicts).
+        conflict_columns: Sequence[str]. Columns of unique constraint/index.
+        update_fields: Optional[Sequence[str]]. Columns updated on conflict, None: DO NOTHING.
+
+    Returns:
+        ids: list[Any]. Primary keys of inserted/updated rows.
+    """
+    staging_name = f"staging_{table.name}_{uuid.uuid4().hex[:8]}"
+    preparer = connection.dialect.identifier_preparer
+    connection.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {preparer.quote(staging_name)} "
+            f"(LIKE {preparer.quote(table.name)} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+    )
+    copy_rows(connection, staging_name, columns, rows)
+
+    staging = Table(
+        staging_name,
+        MetaData(),
+        *(Column(column, table.c[column].type) for column in columns),
+    )
+    stmt = insert(table).from_select(list(columns), select(staging))
+    stmt = apply_on_conflict(stmt, conflict_columns, update_fields)
+    ids = connection.execute(stmt.returning(table.c.id)).scalars().all()
+    connection.execute(text(f"DROP TABLE {preparer.quote(staging_name)}"))
+    return list(ids)
@@ -0,0 +1,176 @@
+"""
+Denormalized counters (post.comment_count, post.tag_count, tag.post_count),
+maintained by Postgres triggers and repaired in bulk by "reconcile_counters".
+
+Triggers are statement-level with transition tables: a bulk insert/COPY of many
+rows updates each counted row once per statement (not once per inserted row),
+and every write path (ORM, bulk helpers, cascades, raw SQL) is covered.
+Migrations hold frozen copies of this SQL: a change needs a new revision.
+
+Usage (repair drift):
+    python -m app.db.counters
+"""
+import argparse
+from dataclasses import dataclass
+
+from sqlalchemy import DDL, Table, event, text
+from sqlalchemy.engine import Connection
+
+
+@dataclass(frozen=True)
+class Counter:
+    """
+    Number of "source" rows referencing a "target" row, stored in "target.column".
+    """
+
+    source: str
+    foreign_key: str
+    target: str
+    column: str
+
+    @property
+    def name(self) -> str:
+        """
+        Base name of trigger function and triggers.
+        """
+        return f"{self.source}_{self.target}_{self.column}"
+
+
+COUNTERS = (
+    Counter(source="comment", foreign_key="post_id", target="post", column="comment_count"),
+    Counter(source="posttag", foreign_key="post_id", target="post", column="tag_count"),
+    Counter(source="posttag", foreign_key="tag_id", target="tag", column="post_count"),
+)  # fmt: skip
+
+
+def create_counter_sql(counter: Counter) -> list[str]:
+    """
+    SQL statements creating trigger function and triggers of counter.
+    Postgres allows a single event per trigger with transition tables: one
+    trigger per INSERT, DELETE and UPDATE, sharing the same function.
+
+    Args:
+        counter: Counter
+
+    Returns:
+        statements: list[str]
+    """
+    delta_by_op = {
+        "INSERT": f"SELECT {counter.foreign_key} AS id, 1 AS delta FROM new_rows",
+        "DELETE": f"SELECT {counter.foreign_key} AS id, -1 AS delta FROM old_rows",
+        "UPDATE": (
+            f"SELECT {counter.foreign_key} AS id, 1 AS delta FROM new_rows "
+            f"UNION ALL SELECT {counter.foreign_key}, -1 FROM old_rows"
+        ),
+    }
+    branches = "\n".join(
+        f"""
+    IF TG_OP = '{op}' THEN
+        UPDATE {counter.target} SET {counter.column} = {counter.target}.{counter.column} + changes.delta
+        FROM (
+            SELECT id, sum(delta) AS delta FROM ({rows}) AS rows
+            WHERE id IS NOT NULL GROUP BY id HAVING sum(delta) <> 0
+        ) AS changes
+        WHERE {counter.target}.id = changes.id;
+    END IF;"""  # noqa: E501
+        for op, rows in delta_by_op.items()
+    )
+    statements = [
+        f"""
+CREATE OR REPLACE FUNCTION {counter.name}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN{branches}
+    RETURN NULL;
+END;
+$$"""
+    ]
+    transitions = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    }
+    for op, transition in transitions.items():
+        statements.append(
+            f"CREATE TRIGGER {counter.name}_{op.lower()} AFTER {op} ON {counter.source} "
+            f"REFERENCING {transition} FOR EACH STATEMENT "
+            f"EXECUTE FUNCTION {counter.name}()"
+        )
+    return statements
+
+
+def drop_counter_sql(counter: Counter) -> list[str]:
+    """
+    SQL statements dropping triggers and trigger function of counter.
+    """
+    return [
+        *(
+            f"DROP TRIGGER IF EXISTS {counter.name}_{op} ON {counter.source}"
+            for op in ("insert", "delete", "update")
+        ),
+        f"DROP FUNCTION IF EXISTS {counter.name}()",
+    ]
+
+
+def reconcile_counter_sql(counter: Counter) -> str:
+    """
+    SQL statement recomputing counter of every target row, only rows with a
+    wrong value are written.
+    """
+    return f"""
+UPDATE {counter.target} SET {counter.column} = actual.count
+FROM (
+    SELECT target.id, count(source.{counter.foreign_key}) AS count
+    FROM {counter.target} AS target
+    LEFT JOIN {counter.source} AS source ON source.{counter.foreign_key} = target.id
+    GROUP BY target.id
+) AS actual
+WHERE {counter.target}.id = actual.id
+AND {counter.target}.{counter.column} IS DISTINCT FROM actual.count
+"""
+
+
+def reconcile_counters(connection: Connection) -> dict[str, int]:
+    """
+    Repair drifted counters in bulk (one statement per counter). Commit is left to caller.
+
+    Args:
+        connection: Connection. SQLAlchemy connection.
+
+    Returns:
+        repaired: dict[str, int]. "target.column" -> number of repaired rows.
+    """
+    repaired = {}
+    for counter in COUNTERS:
+        result = connection.execute(text(reconcile_counter_sql(counter)))
+        repaired[f"{counter.target}.{counter.column}"] = result.rowcount
+    return repaired
+
+
+def install_counter_triggers(table: Table) -> None:
+    """
+    Create triggers of counters sourced from "table" whenever the table is created
+    by "metadata.create_all" (e.g. testing database). Alembic migrations create
+    them explicitly.
+    """
+    for counter in COUNTERS:
+        if counter.source == table.name:
+            for statement in create_counter_sql(counter):
+                event.listen(table, "after_create", DDL(statement))
+
+
+def main() -> None:
+    """
+    Repair drifted counters and print the number of repaired rows.
+    """
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as session:
+        repaired = reconcile_counters(session.connection())
+        session.commit()
+    for column, count in repaired.items():
+        print(f"{column}: {count} rows repaired")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__).parse_args()
+    main()
@@ -0,0 +1,247 @@
+"""
+SQL instrumentation: per-request query count and DB time, slow query log with
+parameters and plan, N+1 detection.
+
+Statements are timed by engine events ("before/after_cursor_execute") and
+recorded in the QueryStats of the current context ("track_queries"). The
+QueryStatsMiddleware opens one QueryStats per HTTP request; sync endpoints and
+dependencies run in threads which inherit the request context.
+"""
+import contextlib
+import logging
+import time
+from collections.abc import Generator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Only these statements are explained, EXPLAIN of anything else may fail
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+EXPLAIN = "EXPLAIN"
+# Isolates EXPLAIN from the transaction of the caller
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+# Transaction control statements are neither counted nor logged, like
+# BEGIN/COMMIT which the drivers send without engine events.
+TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+# Attribute of the execution context holding the start time of its statement:
+# failed statements (no "after_cursor_execute") leave nothing behind
+START_TIME_ATTR = "_query_stats_start"
+
+
+@dataclass
+class QueryStats:
+    """
+    Statements executed within one context (usually an HTTP request).
+    """
+
+    # Request "METHOD path" or any label, used in logs
+    label: str = ""
+    count: int = 0
+    # Seconds spent in the database (cursor execution, without result fetching)
+    duration: float = 0.0
+    # Statement text -> number of executions. Statements of one code path have
+    # the same text, only their bound parameters differ.
+    statements: dict[str, int] = field(default_factory=dict)
+
+    def record(self, statement: str, duration: float) -> None:
+        """
+        Record an executed statement, warn once when it is repeated
+        SQL_N_PLUS_ONE_THRESHOLD times.
+        """
+        self.count += 1
+        self.duration += duration
+        executions = self.statements.get(statement, 0) + 1
+        self.statements[statement] = executions
+        if executions == settings.SQL_N_PLUS_ONE_THRESHOLD:
+            logger.warning(
+                "Possible N+1 queries in %s, statement executed %d times: %s",
+                self.label or "<no request>",
+                executions,
+                statement,
+            )
+
+    @property
+    def repeated(self) -> dict[str, int]:
+        """
+        Statements executed more than once, with their number of executions.
+        """
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count > 1
+        }
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextlib.contextmanager
+def track_queries(label: str = "") -> Generator[QueryStats, None, None]:
+    """
+    Record statements executed in the current context (and threads started from it)
+    on instrumented engines.
+
+    Args:
+        label: str. Name of tracked unit of work, used in logs.
+
+    Returns:
+        stats: QueryStats
+    """
+    stats = QueryStats(label=label)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    """
+    Store start time of statement in its execution context.
+    """
+    setattr(context, START_TIME_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    """
+    Record statement in current QueryStats, log it when slow.
+    """
+    if statement.startswith(TRANSACTION_CONTROL):
+        return
+    duration = time.perf_counter() - getattr(context, START_TIME_ATTR)
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    if (
+        settings.SQL_SLOW_QUERY_MS is not None
+        and duration * 1000 >= settings.SQL_SLOW_QUERY_MS
+    ):
+        _log_slow_query(conn, statement, parameters, duration, executemany)
+
+
+def _log_slow_query(
+    conn: Connection,
+    statement: str,
+    parameters: Any,
+    duration: float,
+    executemany: bool,
+) -> None:
+    """
+    Log slow statement with its parameters and plan.
+    The plan is read with a raw DBAPI cursor, which fires no engine event, within
+    a savepoint: a failing EXPLAIN must not abort the transaction of the caller.
+    """
+    plan = None
+    if (
+        settings.SQL_SLOW_QUERY_EXPLAIN
+        and not executemany
+        and statement.lstrip().upper().startswith(EXPLAINABLE)
+    ):
+        # Out of a transaction block (autocommit) a failure aborts nothing
+        savepoint = not getattr(conn.connection.dbapi_connection, "autocommit", False)
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                if savepoint:
+                    cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                try:
+                    cursor.execute(f"{EXPLAIN} {statement}", parameters)
+                    plan = "\n".join(row[0] for row in cursor.fetchall())
+                except Exception:
+                    if savepoint:
+                        cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                    raise
+                if savepoint:
+                    cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            finally:
+                cursor.close()
+        except Exception:
+            logger.exception("Failed to explain slow query")
+    logger.warning(
+        "Slow query (%.1f ms): %s\nParameters: %r\nPlan:\n%s",
+        duration * 1000,
+        statement,
+        parameters,
+        plan,
+    )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement of engine. For an AsyncEngine, pass its "sync_engine".
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware tracking statements of every HTTP request.
+    Query count and DB time are logged (DEBUG) at the end of the request and,
+    with SQL_STATS_HEADERS, sent in "X-DB-Query-Count" and "Server-Timing"
+    headers (statements executed until the response starts).
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Args:
+            app: ASGIApp. Wrapped application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Serve request within "track_queries".
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}") as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                # Read per request: tests enable headers after the app is built
+                if message["type"] == "http.response.start" and (
+                    settings.SQL_STATS_HEADERS
+                ):
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"',
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                logger.debug(
+                    "%s: %d queries in %.1f ms",
+                    stats.label,
+                    stats.count,
+                    stats.duration * 1000,
+                )
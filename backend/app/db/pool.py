@@ -0,0 +1,196 @@
+"""
+Connection pool configuration (DB_POOL_* settings) and statistics.
+
+Pools record checkouts, timeouts and the time spent getting a connection,
+published with "pool_samples" (e.g. as metrics, see app.core.metrics). Waits
+close to DB_POOL_TIMEOUT, timeouts or a constant overflow mean the pool is too
+small for the load of a worker.
+"""
+import threading
+import time
+from typing import Any, cast
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    NullPool,
+    QueuePool,
+)
+
+from app.core.config import settings
+from app.core.metrics import Sample
+
+
+class PoolStats:
+    """
+    Checkout counters of a pool. Thread safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        # Seconds spent getting connections: waiting for a checked in one or
+        # opening a new one (pool not full yet or overflow)
+        self.wait_seconds = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        """
+        Record a checkout, or a checkout given up after DB_POOL_TIMEOUT.
+        """
+        with self._lock:
+            self.wait_seconds += wait
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool timing connection checkouts in "stats".
+    """
+
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        """
+        New pool (engine.dispose) keeping statistics: counters stay monotonic.
+        """
+        # Pool.recreate builds an instance of "self.__class__"
+        pool = cast(InstrumentedQueuePool, super().recreate())
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool with checkout statistics, for AsyncEngine.
+    """
+
+
+def engine_options(is_async: bool = False) -> dict[str, Any]:
+    """
+    Pool arguments of "create_engine" / "create_async_engine" from settings.
+
+    Args:
+        is_async: bool. Options of an AsyncEngine.
+
+    Returns:
+        options: dict[str, Any]
+    """
+    if settings.DB_POOL_MODE == "null":
+        # Every checkout opens a new connection, there is nothing to ping
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": (
+            InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool
+        ),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def install_idle_ping(engine: Engine, interval: float) -> None:
+    """
+    Ping connections on checkout only when unused for "interval" seconds: busy
+    connections skip the round trip of "pool_pre_ping", connections dropped while
+    idle (server restart, idle timeout of a proxy) are replaced transparently.
+    For an AsyncEngine, pass its "sync_engine".
+    """
+
+    def mark_used(dbapi_connection, connection_record, *args) -> None:  # noqa
+        connection_record.info["last_used"] = time.monotonic()
+
+    def ping_if_idle(dbapi_connection, connection_record, connection_proxy) -> None:
+        last_used = connection_record.info.get("last_used", 0.0)
+        if time.monotonic() - last_used < interval:
+            return
+        # Dialects return False on disconnect errors, raise on other errors
+        try:
+            alive = engine.dialect.do_ping(dbapi_connection)
+        except Exception as error:
+            raise exc.DisconnectionError() from error
+        if not alive:
+            # The pool invalidates the connection and checks out another one
+            raise exc.DisconnectionError()
+
+    event.listen(engine, "connect", mark_used)
+    event.listen(engine, "checkin", mark_used)
+    event.listen(engine, "checkout", ping_if_idle)
+
+
+def pool_samples(engine: Engine, name: str) -> list[Sample]:
+    """
+    Current statistics of pool of engine, as metric samples labeled pool=name.
+    Pools without statistics (NullPool) publish nothing.
+    """
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return []
+    stats = pool.stats
+    labels = {"pool": name}
+    return [
+        Sample("db_pool_size", "gauge", "Configured pool size.", labels, pool.size()),
+        Sample(
+            "db_pool_checked_out",
+            "gauge",
+            "Connections in use.",
+            labels,
+            pool.checkedout(),
+        ),
+        Sample(
+            "db_pool_checked_in",
+            "gauge",
+            "Idle connections in the pool.",
+            labels,
+            pool.checkedin(),
+        ),
+        Sample(
+            "db_pool_overflow",
+            "gauge",
+            "Connections opened beyond the pool size.",
+            labels,
+            max(pool.overflow(), 0),
+        ),
+        Sample(
+            "db_pool_checkouts_total",
+            "counter",
+            "Connection checkouts.",
+            labels,
+            stats.checkouts,
+        ),
+        Sample(
+            "db_pool_checkout_timeouts_total",
+            "counter",
+            "Checkouts given up after the pool timeout.",
+            labels,
+            stats.timeouts,
+        ),
+        Sample(
+            "db_pool_checkout_wait_seconds_total",
+            "counter",
+            "Seconds spent getting connections from the pool.",
+            labels,
+            stats.wait_seconds,
+        ),
+    ]
@@ -0,0 +1,222 @@
+"""
+Read replica routing.
+
+Read-only endpoints take their session from "get_read_session": a replica chosen
+round-robin among healthy ones, or the primary when no replica is healthy or
+when the client wrote recently (read-your-writes).
+
+A replica is ejected for REPLICA_EJECT_SECONDS when connecting to it fails or a
+statement hits a disconnect error, then tried again.
+
+Recent writers are clients (bearer token, else IP address) whose last unsafe
+request (POST, PUT, PATCH, DELETE) was answered less than
+REPLICA_READ_YOUR_WRITES_SECONDS ago, recorded by ReadYourWritesMiddleware.
+"""
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, ExceptionContext
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import CacheBackend, MemoryCacheBackend, create_cache_backend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "TRACE"))
+
+
+class ReplicaSet:
+    """
+    Replica engines with round-robin selection and health-based ejection.
+    Thread safe.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        primary: sessionmaker,
+        eject_seconds: float = 30.0,
+    ):
+        """
+        Args:
+            engines: Sequence[Engine]. Engines of replicas.
+            primary: sessionmaker. Sessions of primary, used when no replica is healthy.
+            eject_seconds: float. Seconds a failing replica is skipped.
+        """
+        self.engines = list(engines)
+        self.primary = primary
+        self.eject_seconds = eject_seconds
+        self._sessionmakers = {
+            engine: sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            for engine in self.engines
+        }
+        self._lock = threading.Lock()
+        self._ejected_until: dict[Engine, float] = {}
+        self._counter = itertools.count()
+        for engine in self.engines:
+            event.listen(engine, "handle_error", self._handle_error)
+
+    def session(self) -> Session:
+        """
+        Session on the next healthy replica, on primary if no replica is healthy.
+        A connection is checked out eagerly: a replica failing to connect is
+        ejected and the next one is tried, the request does not fail.
+
+        Returns:
+            session: Session
+        """
+        for engine in self.candidates():
+            session = self._sessionmakers[engine]()
+            try:
+                session.connection()
+            except exc.DBAPIError:
+                session.close()
+                self.eject(engine)
+                continue
+            return session
+        return self.primary()
+
+    def candidates(self, now: Optional[float] = None) -> list[Engine]:
+        """
+        Healthy replicas, in round-robin order.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            healthy = [
+                engine
+                for engine in self.engines
+                if self._ejected_until.get(engine, 0.0) <= now
+            ]
+            if not healthy:
+                return []
+            start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def eject(self, engine: Engine) -> None:
+        """
+        Skip replica for "eject_seconds".
+        """
+        with self._lock:
+            self._ejected_until[engine] = time.monotonic() + self.eject_seconds
+        logger.warning(
+            "Replica %s ejected for %s seconds",
+            engine.url.render_as_string(hide_password=True),
+            self.eject_seconds,
+        )
+
+    def _handle_error(self, context: ExceptionContext) -> None:
+        """
+        Eject replica of a statement failing with a disconnect error.
+        """
+        if context.is_disconnect and context.engine is not None:
+            self.eject(context.engine)
+
+
+class RecentWriters:
+    """
+    Clients which wrote recently, stored with a TTL in a cache backend.
+    """
+
+    def __init__(self, cache: CacheBackend, window: int):
+        """
+        Args:
+            cache: CacheBackend. Store of markers, shared by workers to be exact.
+            window: int. Seconds a client stays a recent writer.
+        """
+        self.cache = cache
+        self.window = window
+
+    def mark(self, client_key: str) -> None:
+        """
+        Record a write of client.
+        """
+        self.cache.set(f"writer:{client_key}", b"1", ttl=self.window)
+
+    async def amark(self, client_key: str) -> None:
+        """
+        Record a write of client from the event loop. A shared backend is called
+        in the threadpool: its client blocks on a network round trip.
+        """
+        if isinstance(self.cache, MemoryCacheBackend):
+            self.mark(client_key)
+        else:
+            await run_in_threadpool(self.mark, client_key)
+
+    def __contains__(self, client_key: str) -> bool:
+        """
+        Whether client wrote within the window.
+        """
+        return self.cache.get(f"writer:{client_key}") is not None
+
+
+def client_key(scope: Scope) -> str:
+    """
+    Key of request client: digest of "Authorization" header, IP for anonymous.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return "auth:" + hashlib.sha1(value).hexdigest()
+    client = scope.get("client")
+    return f"ip:{client[0] if client else ''}"
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware marking clients of unsafe requests as recent writers.
+    """
+
+    def __init__(self, app: ASGIApp, writers: Optional[RecentWriters] = None):
+        """
+        Args:
+            app: ASGIApp. Wrapped application.
+            writers: Optional[RecentWriters]. None: "recent_writers".
+        """
+        self.app = app
+        self.writers = writers or recent_writers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Serve request, mark client when method is unsafe. The mark is set when
+        the response starts (its transaction is committed), before the client
+        can read the status and send its next request.
+        """
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        key = client_key(scope)
+        marked = False
+
+        async def send_marking(message: Message) -> None:
+            nonlocal marked
+            if message["type"] == "http.response.start" and not marked:
+                marked = True
+                await self.writers.amark(key)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_marking)
+        finally:
+            # No response started (e.g. unhandled error): mark anyway
+            if not marked:
+                await self.writers.amark(key)
+
+
+recent_writers = RecentWriters(
+    create_cache_backend(
+        settings.REPLICA_STICKY_BACKEND,
+        ttl=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+        max_size=settings.REPLICA_STICKY_MAX_SIZE,
+        redis_url=settings.REPLICA_STICKY_REDIS_URL,
+    ),
+    window=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+)
@@ -0,0 +1,229 @@
+"""
+Rollups of home page widgets (most commented posts, top tags, posts per category):
+aggregates over "post", "comment" and "posttag" stored in Postgres materialized
+views, read instead of being recomputed on every page view.
+
+Rollups are refreshed with "REFRESH MATERIALIZED VIEW CONCURRENTLY": reads are
+not blocked during a refresh, which requires a unique index on every view. Last
+refresh time of each rollup is stored in "rolluprefresh" (app.models.rollup).
+Migrations hold frozen copies of the view SQL: a change needs a new revision.
+
+Usage (refresh now):
+    python -m app.db.rollups
+"""
+import argparse
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    event,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+# Materialized views are not tables of the application metadata: they are only
+# described here for reading.
+rollup_metadata = MetaData()
+
+# Number of posts kept in "rollup_popular_post"
+POPULAR_POSTS_LIMIT = 100
+
+# Advisory lock class of refreshes (the rollup index is the object id)
+REFRESH_LOCK_KEY = 5_372_911
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """
+    Materialized view of "query", described by "table". Rows are read in
+    "order_by" order, backed by an index.
+    """
+
+    table: Table
+    query: str
+    unique_columns: tuple[str, ...]
+    order_by: str
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the materialized view.
+        """
+        return self.table.name
+
+
+POPULAR_POSTS = Rollup(
+    table=Table(
+        "rollup_popular_post",
+        rollup_metadata,
+        Column("post_id", Integer, primary_key=True),
+        Column("title", String),
+        Column("author_id", Integer),
+        Column("category_id", Integer),
+        Column("comment_count", Integer),
+        Column("vote_count", BigInteger),
+        Column("created_at", DateTime(timezone=True)),
+    ),
+    # Ranked by the denormalized "post.comment_count" (app.db.counters): a
+    # refresh reads "post" only, "comment" is not aggregated again.
+    query=f"""
+SELECT post.id AS post_id, post.title, post.author_id, post.category_id,
+    post.comment_count, coalesce(vote.count, 0) AS vote_count, post.created_at
+FROM post
+LEFT JOIN vote ON vote.post_id = post.id
+WHERE post.comment_count > 0
+ORDER BY post.comment_count DESC, post.id DESC LIMIT {POPULAR_POSTS_LIMIT}
+""",
+    unique_columns=("post_id",),
+    order_by="comment_count DESC, post_id DESC",
+)
+
+TAG_ROLLUP = Rollup(
+    table=Table(
+        "rollup_tag",
+        rollup_metadata,
+        Column("tag_id", Integer, primary_key=True),
+        Column("name", String),
+        Column("post_count", BigInteger),
+        Column("last_post_at", DateTime(timezone=True)),
+    ),
+    query="""
+SELECT tag.id AS tag_id, tag.name, count(post.id) AS post_count,
+    max(post.created_at) AS last_post_at
+FROM tag
+LEFT JOIN posttag ON posttag.tag_id = tag.id
+LEFT JOIN post ON post.id = posttag.post_id
+GROUP BY tag.id
+""",
+    unique_columns=("tag_id",),
+    order_by="post_count DESC, tag_id",
+)
+
+CATEGORY_ROLLUP = Rollup(
+    table=Table(
+        "rollup_category",
+        rollup_metadata,
+        Column("category_id", Integer, primary_key=True),
+        Column("name", String),
+        Column("post_count", BigInteger),
+        Column("last_post_at", DateTime(timezone=True)),
+    ),
+    query="""
+SELECT category.id AS category_id, category.name, count(post.id) AS post_count,
+    max(post.created_at) AS last_post_at
+FROM category
+LEFT JOIN post ON post.category_id = category.id
+GROUP BY category.id
+""",
+    unique_columns=("category_id",),
+    order_by="post_count DESC, category_id",
+)
+
+ROLLUPS = (POPULAR_POSTS, TAG_ROLLUP, CATEGORY_ROLLUP)
+
+
+def create_rollup_sql(rollup: Rollup) -> list[str]:
+    """
+    SQL statements creating materialized view of rollup (populated) and its
+    indexes: unique (needed by concurrent refreshes) and reading order.
+
+    Args:
+        rollup: Rollup
+
+    Returns:
+        statements: list[str]
+    """
+    return [
+        f"CREATE MATERIALIZED VIEW {rollup.name} AS {rollup.query}",
+        f"CREATE UNIQUE INDEX uq_{rollup.name} ON {rollup.name} "
+        f"({', '.join(rollup.unique_columns)})",
+        f"CREATE INDEX ix_{rollup.name}_order ON {rollup.name} ({rollup.order_by})",
+    ]
+
+
+def drop_rollup_sql(rollup: Rollup) -> str:
+    """
+    SQL statement dropping materialized view of rollup (and its indexes).
+    """
+    return f"DROP MATERIALIZED VIEW IF EXISTS {rollup.name}"
+
+
+def refresh_rollup(
+    connection: Connection, rollup: Rollup, max_age_seconds: float = 0
+) -> bool:
+    """
+    Refresh rollup, unless it was refreshed less than "max_age_seconds" ago or
+    another process is refreshing it (advisory lock held until the end of the
+    transaction): concurrent refreshers of several workers refresh once per
+    interval. Commit is left to caller.
+
+    Args:
+        connection: Connection. SQLAlchemy connection.
+        rollup: Rollup
+        max_age_seconds: float. 0: refresh unless another process is refreshing.
+
+    Returns:
+        refreshed: bool
+    """
+    locked = connection.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key, :index)"),
+        {"key": REFRESH_LOCK_KEY, "index": ROLLUPS.index(rollup)},
+    ).scalar_one()
+    if not locked:
+        return False
+    fresh = connection.execute(
+        text(
+            "SELECT refreshed_at > now() - make_interval(secs => :max_age) "
+            "FROM rolluprefresh WHERE name = :name"
+        ),
+        {"name": rollup.name, "max_age": max_age_seconds},
+    ).scalar()
+    if fresh:
+        return False
+    connection.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {rollup.name}"))
+    # Rows are as of the start of the transaction
+    connection.execute(
+        text(
+            "INSERT INTO rolluprefresh (name, refreshed_at) VALUES (:name, now()) "
+            "ON CONFLICT (name) DO UPDATE SET refreshed_at = excluded.refreshed_at"
+        ),
+        {"name": rollup.name},
+    )
+    return True
+
+
+def install_rollups(metadata: MetaData) -> None:
+    """
+    Create materialized views of rollups after the tables of "metadata" by
+    "metadata.create_all" (e.g. testing database), drop them before the tables.
+    Alembic migrations create them explicitly.
+    """
+    for rollup in ROLLUPS:
+        for statement in create_rollup_sql(rollup):
+            event.listen(metadata, "after_create", DDL(statement))
+        event.listen(metadata, "before_drop", DDL(drop_rollup_sql(rollup)))
+
+
+def main() -> None:
+    """
+    Refresh every rollup and print refreshed ones.
+    """
+    from app.db.session import SessionLocal
+
+    for rollup in ROLLUPS:
+        with SessionLocal() as session:
+            refreshed = refresh_rollup(session.connection(), rollup)
+            session.commit()
+        print(f"{rollup.name}: {'refreshed' if refreshed else 'being refreshed'}")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__).parse_args()
+    main()
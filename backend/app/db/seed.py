@@ -0,0 +1,519 @@
+"""
+Seed the database of settings with a large dataset for capacity testing: users,
+categories, tags, posts, comments and post tags, generated with the factory-boy
+factories of app.tests.factories (development requirements).
+
+Rows are generated in chunks by worker processes and written with COPY, one
+transaction per chunk. Each chunk has its own random seed (derived from "--seed"):
+the same arguments give the same dataset, whatever the number of workers.
+Users, categories, tags and posts get explicit ids, reserved after the current
+maximum id of their table, so that chunks reference each other without reading
+the database. Users share "--passwords" passwords ("seed-password-<n>"), each
+hashed once.
+
+Chunks are written with "session_replication_role = replica" (superuser): foreign
+key checks and counter triggers are skipped. Post counters are computed while
+generating, tag counters are repaired at the end (app.db.counters). Without
+superuser, "--no-replica-role" keeps checks and triggers on: chunks are written
+one at a time (triggers of concurrent chunks would deadlock on the same tag
+rows) and all counters are repaired at the end. The database must not receive
+other inserts while seeding.
+
+Distributions:
+    authors of posts and comments  Zipf law ("--author-zipf"): few users write most
+    tags of posts                  Zipf law ("--tag-zipf"): few tags are on most posts
+    tags per post                  uniform in [0, "--max-tags-per-post"]
+    comments per post              geometric, of mean "--comments-per-post"
+    category of post               uniform
+    creation time of posts         increasing with id over the last "--days" days
+
+Usage:
+    python -m app.db.seed --posts 1000000 --users 100000 --workers 4
+    python -m app.db.seed --posts 1000000 --no-replica-role
+"""
+import argparse
+import functools
+import itertools
+import math
+import multiprocessing
+import random
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db import session as db_session
+from app.db.bulk import copy_rows
+from app.db.counters import reconcile_counters
+
+# Tables with explicit ids, in insertion order
+SEEDED_TABLES = ("user", "category", "tag", "post")
+# Category/tag names are unique words, fewer than a thousand: made unique by id
+UNIQUE_WORDS_BATCH = 500
+# Advisory lock serializing chunk writes with triggers on
+WRITE_LOCK_ID = 0x5EED
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    """
+    Size and distributions of the seeded dataset.
+    """
+
+    users: int = 10_000
+    categories: int = 20
+    tags: int = 1_000
+    posts: int = 100_000
+    # Tags per post: uniform in [0, max_tags_per_post], picked with a Zipf law
+    max_tags_per_post: int = 5
+    tag_zipf: float = 1.1
+    # Authors of posts and comments, picked with a Zipf law
+    author_zipf: float = 1.2
+    # Comments per post: geometric distribution of this mean
+    comments_per_post: float = 2.0
+    # Distinct passwords of users, each hashed once
+    passwords: int = 8
+    # Creation times of posts spread over the last "days" days
+    days: int = 365
+    # Users/posts per chunk (unit of work of worker processes)
+    chunk_size: int = 10_000
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    """
+    Everything needed to generate any chunk, shared with worker processes.
+    """
+
+    config: SeedConfig
+    # Table -> id of its first seeded row
+    first_ids: dict[str, int]
+    hashed_passwords: tuple[str, ...]
+    # Write with "session_replication_role = replica" (superuser), see "write_rows"
+    replica_role: bool = True
+    # Creation time of the last post
+    end_time: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def chunks(self, count: int) -> int:
+        """
+        Number of chunks of "count" rows.
+        """
+        return math.ceil(count / self.config.chunk_size)
+
+
+@functools.lru_cache(maxsize=8)
+def zipf_cum_weights(count: int, exponent: float) -> tuple[float, ...]:
+    """
+    Cumulative weights of ranks 0..count-1 following a Zipf law (weight of rank
+    k: 1 / (k + 1) ** exponent), for "random.choices".
+    """
+    return tuple(itertools.accumulate(1 / (k + 1) ** exponent for k in range(count)))
+
+
+def geometric(rng: random.Random, mean: float) -> int:
+    """
+    Random integer >= 0 of geometric distribution of "mean".
+    """
+    if mean <= 0:
+        return 0
+    return int(math.log(1 - rng.random()) / math.log(mean / (mean + 1)))
+
+
+def _reseed(plan: SeedPlan, kind: str, chunk: int) -> random.Random:
+    """
+    Reseed factory-boy/Faker for chunk, return a random generator of the chunk.
+    """
+    import factory.random
+
+    from app.tests.factories.utils import faker
+
+    chunk_seed = f"{plan.config.seed}-{kind}-{chunk}"
+    factory.random.reseed_random(chunk_seed)
+    faker.unique.clear()
+    return random.Random(chunk_seed)
+
+
+def _unique_name(name: str, index: int, max_length: int) -> str:
+    """
+    Make generated name unique by suffixing the row index, within "max_length".
+    """
+    suffix = f"-{index}"
+    return f"{name[: max_length - len(suffix)]}{suffix}"
+
+
+def _build_batch(factory_model: Any, count: int, unique_batch: int) -> list[dict]:
+    """
+    Build "count" subjects, forgetting values of "faker.unique" every
+    "unique_batch" subjects: their source (e.g. words) may be smaller than "count".
+    """
+    from app.tests.factories.utils import faker
+
+    subjects = []
+    for start in range(0, count, unique_batch):
+        faker.unique.clear()
+        subjects.extend(factory_model.build_batch(min(unique_batch, count - start)))
+    return subjects
+
+
+def taxonomy_rows(plan: SeedPlan) -> dict[str, list[dict]]:
+    """
+    Rows of "category" and "tag" tables.
+    """
+    from app.models.category import CategoryModelConfig
+    from app.models.tag import TagModelConfig
+    from app.tests.factories.taxonomy import CategoryFactory, TagFactory
+
+    rows: dict[str, list[dict]] = {}
+    for table, factory_model, count, max_length in (
+        ("category", CategoryFactory, plan.config.categories, CategoryModelConfig.NAME_MAX_LENGTH),
+        ("tag", TagFactory, plan.config.tags, TagModelConfig.NAME_MAX_LENGTH),
+    ):  # fmt: skip
+        _reseed(plan, table, 0)
+        first_id = plan.first_ids[table]
+        rows[table] = [
+            {
+                "id": first_id + i,
+                "name": _unique_name(data["name"], first_id + i, max_length),
+            }
+            for i, data in enumerate(
+                _build_batch(factory_model, count, UNIQUE_WORDS_BATCH)
+            )
+        ]
+    return rows
+
+
+def user_rows(plan: SeedPlan, chunk: int) -> dict[str, list[dict]]:
+    """
+    Rows of "user" table of chunk.
+    """
+    from app.models.user import UserModelConfig
+    from app.tests.factories.user import UserFactory
+    from app.tests.factories.utils import faker_email
+
+    config = plan.config
+    _reseed(plan, "user", chunk)
+    start = chunk * config.chunk_size
+    stop = min(start + config.chunk_size, config.users)
+    users = []
+    for index, data in zip(range(start, stop), UserFactory.build_batch(stop - start)):
+        user_id = plan.first_ids["user"] + index
+        users.append(
+            {
+                "id": user_id,
+                "name": data["name"],
+                # Names repeat over chunks: email made unique with the id
+                "email": faker_email(
+                    name=f"{data['name']} {user_id}",
+                    length=UserModelConfig.EMAIL_MAX_LENGTH,
+                ),
+                "is_active": True,
+                "is_superuser": False,
+                "hashed_password": plan.hashed_passwords[
+                    index % len(plan.hashed_passwords)
+                ],
+            }
+        )
+    return {"user": users}
+
+
+def post_rows(plan: SeedPlan, chunk: int) -> dict[str, list[dict]]:
+    """
+    Rows of "post" table of chunk, with their "posttag" and "comment" rows.
+    """
+    from app.models.post import PostModelConfig
+    from app.tests.factories.comment import CommentFactory
+    from app.tests.factories.post import PostFactory
+
+    config = plan.config
+    rng = _reseed(plan, "post", chunk)
+    start = chunk * config.chunk_size
+    stop = min(start + config.chunk_size, config.posts)
+    first_tag_id = plan.first_ids["tag"]
+    author_weights = zipf_cum_weights(config.users, config.author_zipf)
+    tag_weights = zipf_cum_weights(config.tags, config.tag_zipf)
+    span = timedelta(days=config.days)
+    start_time = plan.end_time - span
+
+    def pick_author() -> Optional[int]:
+        if not config.users:
+            return None
+        (rank,) = rng.choices(range(config.users), cum_weights=author_weights)
+        return plan.first_ids["user"] + rank
+
+    posts: list[dict[str, Any]] = []
+    post_tags: list[dict[str, Any]] = []
+    comments: list[dict[str, Any]] = []
+    for index, data in zip(range(start, stop), PostFactory.build_batch(stop - start)):
+        post_id = plan.first_ids["post"] + index
+        created_at = start_time + span * (index + 1) / config.posts
+
+        tag_ids: set[int] = set()
+        tags_count = min(rng.randint(0, config.max_tags_per_post), config.tags)
+        while len(tag_ids) < tags_count:
+            (rank,) = rng.choices(range(config.tags), cum_weights=tag_weights)
+            tag_ids.add(first_tag_id + rank)
+        post_tags.extend({"post_id": post_id, "tag_id": tag_id} for tag_id in tag_ids)
+
+        comments_count = geometric(rng, config.comments_per_post)
+        for comment_data in CommentFactory.build_batch(comments_count):
+            comment_time = created_at + (plan.end_time - created_at) * rng.random()
+            comments.append(
+                {
+                    **comment_data,
+                    "post_id": post_id,
+                    "author_id": pick_author(),
+                    "created_at": comment_time,
+                    "updated_at": comment_time,
+                }
+            )
+
+        category_id = None
+        if config.categories:
+            category_id = plan.first_ids["category"] + rng.randrange(config.categories)
+        posts.append(
+            {
+                "id": post_id,
+                # Titles are unique, the factory ensures it within a chunk only
+                "title": _unique_name(
+                    data["title"], post_id, PostModelConfig.TITLE_MAX_LENGTH
+                ),
+                "short_description": data["short_description"],
+                "content": data["content"],
+                "author_id": pick_author(),
+                "category_id": category_id,
+                "comment_count": comments_count,
+                "tag_count": tags_count,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+    return {"post": posts, "posttag": post_tags, "comment": comments}
+
+
+def write_rows(
+    connection: Connection, rows: dict[str, list[dict]], replica_role: bool = True
+) -> int:
+    """
+    COPY rows by table (in order).
+
+    Args:
+        connection: Connection
+        rows: dict[str, list[dict]]. Rows by table.
+        replica_role: bool. Skip foreign key checks and triggers for the rest of
+            the transaction (superuser). False: keep them on, serialize writes
+            of concurrent transactions until commit; counters written by
+            triggers are added to generated ones, "reconcile_counters" repairs them.
+
+    Returns:
+        count: int. Number of written rows.
+    """
+    if replica_role:
+        connection.execute(text("SET LOCAL session_replication_role = replica"))
+    else:
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": WRITE_LOCK_ID}
+        )
+    for table, table_rows in rows.items():
+        if table_rows:
+            copy_rows(connection, table, list(table_rows[0]), table_rows)
+    return sum(len(table_rows) for table_rows in rows.values())
+
+
+def run_chunk(
+    generate: Callable[[SeedPlan, int], dict[str, list[dict]]],
+    plan: SeedPlan,
+    chunk: int,
+) -> int:
+    """
+    Generate and write rows of chunk in one transaction (worker process job).
+    """
+    rows = generate(plan, chunk)
+    with db_session.engine.begin() as connection:
+        return write_rows(connection, rows, plan.replica_role)
+
+
+def _init_worker() -> None:
+    """
+    Drop connection pools inherited from the parent process, without closing
+    their connections (they belong to the parent).
+    """
+    for sync_engine in db_session.built_engines().values():
+        sync_engine.dispose(close=False)
+
+
+def check_superuser(connection: Connection) -> None:
+    """
+    Exit with an error if the database user may not set
+    "session_replication_role" (superuser only).
+    """
+    if connection.scalar(text("SELECT current_setting('is_superuser')")) != "on":
+        raise SystemExit(
+            'Seeding with "session_replication_role = replica" requires a '
+            "superuser, use --no-replica-role to seed with triggers and foreign "
+            "key checks on."
+        )
+
+
+def reserve_ids(connection: Connection) -> dict[str, int]:
+    """
+    First free id of seeded tables: after their rows and the values already
+    taken from their sequence, so that sequences only move forward.
+    """
+    return {
+        table: connection.execute(
+            text(
+                "SELECT greatest(coalesce(max(id), 0), coalesce(pg_sequence_last_value("
+                f"pg_get_serial_sequence(:table, 'id')::regclass), 0)) + 1 FROM \"{table}\""
+            ),
+            {"table": f'"{table}"'},
+        ).scalar_one()
+        for table in SEEDED_TABLES
+    }
+
+
+def finalize(connection: Connection, plan: SeedPlan) -> dict[str, int]:
+    """
+    Move sequences past the seeded ids, repair counters and refresh statistics
+    of the planner.
+
+    Returns:
+        repaired: dict[str, int]. Repaired rows by counter, see "reconcile_counters".
+    """
+    counts = {
+        "user": plan.config.users,
+        "category": plan.config.categories,
+        "tag": plan.config.tags,
+        "post": plan.config.posts,
+    }
+    for table in SEEDED_TABLES:
+        if counts[table]:
+            connection.execute(
+                text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :value)"),
+                {
+                    "table": f'"{table}"',
+                    "value": plan.first_ids[table] + counts[table] - 1,
+                },
+            )
+    repaired = reconcile_counters(connection)
+    for table in (*SEEDED_TABLES, "posttag", "comment"):
+        connection.execute(text(f'ANALYZE "{table}"'))
+    return repaired
+
+
+def run_chunks(
+    name: str,
+    generate: Callable[[SeedPlan, int], dict[str, list[dict]]],
+    plan: SeedPlan,
+    chunks: int,
+    map_func: Callable,
+) -> None:
+    """
+    Run chunks with "map_func" (inline or in a pool) and print progress.
+    """
+    start = time.perf_counter()
+    rows = 0
+    job = functools.partial(run_chunk, generate, plan)
+    for done, count in enumerate(map_func(job, range(chunks)), start=1):
+        rows += count
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name}: chunk {done}/{chunks}, {rows} rows, "
+            f"{rows / elapsed:.0f} rows/s, {elapsed:.1f}s"
+        )
+
+
+def seed(config: SeedConfig, workers: int, replica_role: bool = True) -> SeedPlan:
+    """
+    Seed the database of settings.
+
+    Args:
+        config: SeedConfig
+        workers: int. Number of worker processes. 0: generate in this process.
+        replica_role: bool. Write with "session_replication_role = replica",
+            see "write_rows". Exit early if the database user is not superuser.
+
+    Returns:
+        plan: SeedPlan. Ids and passwords of the seeded dataset.
+    """
+    from app.core.security import password_hash_executor
+
+    if replica_role:
+        with db_session.engine.connect() as connection:
+            check_superuser(connection)
+
+    passwords = [f"seed-password-{n}" for n in range(max(config.passwords, 1))]
+    hashed_passwords = tuple(password_hash_executor.hash_passwords(passwords))
+    password_hash_executor.shutdown()
+
+    with db_session.engine.begin() as connection:
+        plan = SeedPlan(
+            config=config,
+            first_ids=reserve_ids(connection),
+            hashed_passwords=hashed_passwords,
+            replica_role=replica_role,
+        )
+        write_rows(connection, taxonomy_rows(plan), replica_role)
+
+    pool = None
+    map_func: Callable = map
+    if workers:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker)
+        map_func = pool.imap_unordered
+    try:
+        run_chunks("users", user_rows, plan, plan.chunks(config.users), map_func)
+        run_chunks("posts", post_rows, plan, plan.chunks(config.posts), map_func)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    with db_session.engine.begin() as connection:
+        finalize(connection, plan)
+    return plan
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    Seed with configuration of arguments, print elapsed time and ids.
+    """
+    config = SeedConfig(
+        **{option.name: getattr(args, option.name) for option in fields(SeedConfig)}
+    )
+    start = time.perf_counter()
+    plan = seed(config, args.workers, args.replica_role)
+    print(f"seeded in {time.perf_counter() - start:.1f}s, first ids: {plan.first_ids}")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Command line options: one per SeedConfig field, "--workers" and
+    "--no-replica-role".
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    for option in fields(SeedConfig):
+        parser.add_argument(
+            f"--{option.name.replace('_', '-')}",
+            type=type(option.default),
+            default=option.default,
+        )
+    parser.add_argument(
+        "--workers", type=int, default=multiprocessing.cpu_count(), help="0: no pool"
+    )
+    parser.add_argument(
+        "--no-replica-role",
+        dest="replica_role",
+        action="store_false",
+        help="keep triggers and foreign key checks on (no superuser required)",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
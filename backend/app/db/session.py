@@ -1,8 +1,129 @@
+"""
+Engines and session factories, built on first access of a module attribute:
+"engine", "SessionLocal", "async_engine", "AsyncSessionLocal", "replica_engines"
+and "replica_set". Importing this module neither imports database drivers nor
+connects; a process only pays for the engines it uses.
+"""
+import threading
+from collections.abc import Callable
+from typing import Any
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import Sample
+from app.db.instrumentation import instrument_engine
+from app.db.pool import engine_options, install_idle_ping, pool_samples
+from app.db.replicas import ReplicaSet
+
+_lock = threading.RLock()
+
+
+def _setup(sync_engine: Engine) -> Engine:
+    """
+    Install idle ping and instrumentation on a new engine, from settings.
+    """
+    if settings.DB_POOL_MODE == "queue" and settings.DB_POOL_PRE_PING == "idle":
+        install_idle_ping(sync_engine, settings.DB_POOL_PING_INTERVAL_SECONDS)
+    if settings.SQL_INSTRUMENTATION_ENABLED:
+        instrument_engine(sync_engine)
+    return sync_engine
+
+
+def _build_engine() -> Engine:
+    return _setup(create_engine(settings.SQLALCHEMY_DATABASE_URI, **engine_options()))
+
+
+def _build_session_local() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=_get("engine"))
+
+
+def _build_async_engine() -> AsyncEngine:
+    async_engine = create_async_engine(
+        settings.SQLALCHEMY_ASYNC_DATABASE_URI, **engine_options(is_async=True)
+    )
+    _setup(async_engine.sync_engine)
+    return async_engine
+
+
+def _build_async_session_local() -> async_sessionmaker:
+    # "expire_on_commit" is disabled: attributes of committed objects cannot be
+    # lazy loaded from an async context.
+    return async_sessionmaker(
+        bind=_get("async_engine"), autoflush=False, expire_on_commit=False
+    )
+
+
+def _build_replica_engines() -> list[Engine]:
+    # Read replicas, see app.db.replicas. No replica: reads use SessionLocal.
+    return [
+        _setup(create_engine(uri, **engine_options()))
+        for uri in settings.SQLALCHEMY_REPLICA_URIS
+    ]
+
+
+def _build_replica_set() -> ReplicaSet:
+    return ReplicaSet(
+        _get("replica_engines"),
+        primary=_get("SessionLocal"),
+        eject_seconds=settings.REPLICA_EJECT_SECONDS,
+    )
+
+
+_BUILDERS: dict[str, Callable[[], Any]] = {
+    "engine": _build_engine,
+    "SessionLocal": _build_session_local,
+    "async_engine": _build_async_engine,
+    "AsyncSessionLocal": _build_async_session_local,
+    "replica_engines": _build_replica_engines,
+    "replica_set": _build_replica_set,
+}
+
+
+def _get(name: str) -> Any:
+    """
+    Lazy attribute, built once per process and then stored as a module global.
+    """
+    with _lock:
+        if name not in globals():
+            globals()[name] = _BUILDERS[name]()
+        return globals()[name]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Build lazy attributes on first access (module attribute fallback, PEP 562).
+    """
+    if name not in _BUILDERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _get(name)
+
+
+def built_engines() -> dict[str, Engine]:
+    """
+    Sync engines created so far by name: "sync", "async" (its "sync_engine") and
+    "replica-<index>".
+    """
+    namespace = globals()
+    engines = {}
+    if "engine" in namespace:
+        engines["sync"] = namespace["engine"]
+    if "async_engine" in namespace:
+        engines["async"] = namespace["async_engine"].sync_engine
+    for i, replica_engine in enumerate(namespace.get("replica_engines", [])):
+        engines[f"replica-{i}"] = replica_engine
+    return engines
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def engines_pool_samples() -> list[Sample]:
+    """
+    Pool statistics of engines created so far, see "pool_samples".
+    """
+    return [
+        sample
+        for name, sync_engine in built_engines().items()
+        for sample in pool_samples(sync_engine, name)
+    ]
@@ -1,28 +1,119 @@
-import uvicorn
-from fastapi import Depends, FastAPI
+"""
+Application factory.
+
+"create_app" imports routers, services and middlewares when called: importing
+this module is cheap. "app" (e.g. "app.main:app" for uvicorn) is the application
+built on first access.
+"""
+from typing import Any
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from app.api.api_v1.api import api_router
-from app.core.config import settings
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    # openapi_url=f'{settings.API_V1_STR}/openapi.json',
-)
+def create_app() -> FastAPI:
+    """
+    Build the application: middlewares, routers, exception handlers and events.
+    Database engines, password hashing and JWT backends are created on first use,
+    not here.
 
+    Returns:
+        app: FastAPI
+    """
+    from app.api import metrics
+    from app.api.api_v1.api import api_router
+    from app.core.config import settings
+    from app.core.jobs import JobQueueFullError, job_queue
+    from app.core.metrics import MetricsMiddleware, metrics_registry
+    from app.core.rate_limit import RateLimitMiddleware
+    from app.core.security import PasswordHashQueueFullError, password_hash_executor
+    from app.db.instrumentation import QueryStatsMiddleware
+    from app.db.replicas import ReadYourWritesMiddleware
+    from app.db.session import engines_pool_samples
+    from app.services import rollup_refresher, vote_buffer
 
-# Set all CORS enabled origins
-if settings.BACKEND_CORS_ORIGINS:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        # orjson encodes responses several times faster than stdlib json
+        default_response_class=ORJSONResponse,
+        # openapi_url=f'{settings.API_V1_STR}/openapi.json',
     )
 
-app.include_router(api_router, prefix=settings.API_V1_STR)
+    # Rate limit requests before routing. Added before CORS (inner middleware):
+    # preflight requests are not counted and 429 responses keep CORS headers.
+    if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_RULES:
+        app.add_middleware(RateLimitMiddleware, rules=settings.RATE_LIMIT_RULES)
+
+    # Set all CORS enabled origins
+    if settings.BACKEND_CORS_ORIGINS:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+    # Clients of unsafe requests read from the primary for a while, see app.db.replicas
+    if settings.SQLALCHEMY_REPLICA_URIS:
+        app.add_middleware(ReadYourWritesMiddleware)
+
+    # Query count and DB time of every request, see app.db.instrumentation
+    if settings.SQL_INSTRUMENTATION_ENABLED:
+        app.add_middleware(QueryStatsMiddleware)
+
+    # Record metrics of every request (outermost middleware, added last)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+        app.include_router(metrics.router, prefix=settings.METRICS_PATH)
+        metrics_registry.register_collector(engines_pool_samples)
+        metrics_registry.register_collector(job_queue.samples)
+
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+
+    app.add_exception_handler(PasswordHashQueueFullError, queue_full_handler)
+    app.add_exception_handler(JobQueueFullError, queue_full_handler)
+
+    app.add_event_handler("startup", job_queue.start)
+    app.add_event_handler("startup", vote_buffer.start)
+    app.add_event_handler("startup", metrics_registry.start)
+    if settings.ROLLUP_REFRESH_ENABLED:
+        app.add_event_handler("startup", rollup_refresher.start)
+        app.add_event_handler("shutdown", rollup_refresher.stop)
+    # Drain background jobs first, they may use other components
+    app.add_event_handler("shutdown", job_queue.stop)
+    app.add_event_handler("shutdown", password_hash_executor.shutdown)
+    # Flush buffered votes before exit
+    app.add_event_handler("shutdown", vote_buffer.stop)
+    # Last snapshot of this worker, in-progress requests are over
+    app.add_event_handler("shutdown", metrics_registry.stop)
+    return app
+
+
+async def queue_full_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    """
+    Reject fast with 503 when password hashing workers or background jobs are
+    saturated.
+    """
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """
+    "app" module attribute, built by "create_app" on first access.
+    """
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8080, reload=True)
+    from app.server import main
+
+    main()
@@ -1 +1,8 @@
+from .category import Category  # noqa
+from .comment import Comment  # noqa
+from .post import Post  # noqa
+from .post_tag import PostTag  # noqa
+from .rollup import RollupRefresh  # noqa
+from .tag import Tag  # noqa
 from .user import User  # noqa
+from .vote import Vote  # noqa
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, TimestampMixin
 
 if TYPE_CHECKING:
     from .post import Post
@@ -17,7 +17,7 @@ class CategoryModelConfig:
     NAME_MAX_LENGTH = 20
 
 
-class Category(Base):
+class Category(TimestampMixin, Base):
     """
     SQLAlchemy ORM model for "category" table database.
     """
@@ -3,7 +3,8 @@ from typing import TYPE_CHECKING
 from sqlalchemy import Column, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, TimestampMixin
+from app.db.counters import install_counter_triggers
 
 if TYPE_CHECKING:
     from .post import Post
@@ -18,7 +19,7 @@ class CommentModelConfig:
     COMMENT_MAX_LENGTH = 255
 
 
-class Comment(Base):
+class Comment(TimestampMixin, Base):
     """
     SQLAlchemy ORM model for "comment" table database.
     """
@@ -32,5 +33,9 @@ class Comment(Base):
     )
     author: Mapped["User"] = relationship("User")
 
-    post_id = Column(Integer, ForeignKey("post.id", ondelete="CASCADE"))
+    post_id = Column(Integer, ForeignKey("post.id", ondelete="CASCADE"), index=True)
     post: Mapped["Post"] = relationship("Post", back_populates="comments")
+
+
+# Maintain "post.comment_count"
+install_counter_triggers(Comment.__table__)
@@ -1,9 +1,10 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import Column, Computed, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, deferred, relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, TimestampMixin
 
 if TYPE_CHECKING:
     from .category import Category
@@ -19,9 +20,17 @@ class PostModelConfig:
 
     TITLE_MAX_LENGTH = 255
     SHORT_DES_MAX_LENGTH = 255
+    # Text search configuration of "search_vector"
+    SEARCH_CONFIG = "english"
+    # Weighted document: title (A) > short_description (B) > content (C)
+    SEARCH_VECTOR_EXPRESSION = (
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(short_description, '')), 'B') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')"
+    )
 
 
-class Post(Base):
+class Post(TimestampMixin, Base):
     """
     SQLAlchemy ORM model for "post" table database.
     """
@@ -32,6 +41,16 @@ class Post(Base):
         String(PostModelConfig.SHORT_DES_MAX_LENGTH), nullable=True
     )
     content = Column(Text(), nullable=True)
+    # Denormalized counters, maintained by database triggers (see app.db.counters)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    tag_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Full-text search document, maintained by Postgres (generated column).
+    # Deferred: never loaded with post objects.
+    search_vector = deferred(
+        Column(
+            TSVECTOR, Computed(PostModelConfig.SEARCH_VECTOR_EXPRESSION, persisted=True)
+        )
+    )
 
     # foreign key & relationship
     author_id = Column(
@@ -46,4 +65,13 @@ class Post(Base):
 
     comments: Mapped[list["Comment"]] = relationship("Comment", back_populates="post")
 
-    tags: Mapped[list["Tag"]] = relationship("Tag", secondary="posttag")
+    tags: Mapped[list["Tag"]] = relationship(
+        "Tag", secondary="posttag", back_populates="posts"
+    )
+
+    __table_args__ = (
+        Index("ix_post_search_vector", "search_vector", postgresql_using="gin"),
+        # Newest posts of a category/author, keyset paginated on "id".
+        Index("ix_post_category_id_id", "category_id", "id"),
+        Index("ix_post_author_id_id", "author_id", "id"),
+    )
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy import Column, ForeignKey, Index, Integer, UniqueConstraint
 
 from app.db.base_class import Base
+from app.db.counters import install_counter_triggers
 
 
 class PostTag(Base):
@@ -12,3 +13,14 @@ class PostTag(Base):
     id = Column(Integer, primary_key=True)
     post_id = Column(Integer, ForeignKey("post.id", ondelete="CASCADE"))
     tag_id = Column(Integer, ForeignKey("tag.id", ondelete="CASCADE"))
+
+    __table_args__ = (
+        # A tag is linked once per post. Also serves lookups by "post_id" (leading column).
+        UniqueConstraint("post_id", "tag_id", name="uq_posttag_post_id_tag_id"),
+        # Lookups by "tag_id" (filter posts by tag), index-only with "post_id".
+        Index("ix_posttag_tag_id_post_id", "tag_id", "post_id"),
+    )
+
+
+# Maintain "post.tag_count" and "tag.post_count"
+install_counter_triggers(PostTag.__table__)
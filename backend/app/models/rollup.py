@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, String
+
+from app.db.base_class import Base
+from app.db.rollups import install_rollups
+
+
+class RollupRefresh(Base):
+    """
+    SQLAlchemy ORM model for "rolluprefresh" table database.
+    Last refresh time of every rollup (materialized view, see app.db.rollups).
+    """
+
+    name = Column(String(63), primary_key=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+
+# Create rollups (materialized views) with the tables
+install_rollups(Base.metadata)
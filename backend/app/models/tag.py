@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, TimestampMixin
 
 if TYPE_CHECKING:
     from .post import Post
@@ -17,13 +17,17 @@ class TagModelConfig:
     NAME_MAX_LENGTH = 20
 
 
-class Tag(Base):
+class Tag(TimestampMixin, Base):
     """
     SQLAlchemy ORM model for "tag" table database.
     """
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(TagModelConfig.NAME_MAX_LENGTH), unique=True)
+    # Denormalized counter, maintained by database triggers (see app.db.counters)
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # foreign key & relationship
-    posts: Mapped[list["Post"]] = relationship("Post", secondary="posttag")
+    posts: Mapped[list["Post"]] = relationship(
+        "Post", secondary="posttag", back_populates="tags"
+    )
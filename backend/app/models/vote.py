@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, relationship
+
+from app.db.base_class import Base
+
+if TYPE_CHECKING:
+    from .post import Post
+
+
+class Vote(Base):
+    """
+    SQLAlchemy ORM model for "vote" table database.
+    Vote counter of a post, one row per post. Votes are anonymous: the row only
+    holds the total, increments are buffered and merged by app.services.vote.
+    """
+
+    id = Column(Integer, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    # foreign key & relationship
+    post_id = Column(
+        Integer,
+        ForeignKey("post.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    post: Mapped["Post"] = relationship("Post")
@@ -1,7 +1,49 @@
+from .category import (  # noqa
+    CreateCategorySchema,
+    InDBCategorySchema,
+    RetrieveCategorySchema,
+    UpdateCategorySchema,
+)
+from .comment import (  # noqa
+    CreateCommentSchema,
+    InDBCommentSchema,
+    RetrieveCommentSchema,
+    UpdateCommentSchema,
+)
+from .pagination import CursorPageSchema  # noqa
 from .ping import PingSchema  # noqa
+from .post import (  # noqa
+    CreatePostSchema,
+    DetailPostSchema,
+    InDBPostSchema,
+    ListPostSchema,
+    PostAuthorSchema,
+    RetrievePostSchema,
+    SearchPostSchema,
+    UpdatePostSchema,
+)
+from .rollup import (  # noqa
+    CategoryRollupSchema,
+    PopularPostSchema,
+    RollupSchema,
+    TagRollupSchema,
+)
+from .tag import (  # noqa
+    CreateTagSchema,
+    InDBTagSchema,
+    RetrieveTagSchema,
+    UpdateTagSchema,
+)
 from .user import (  # noqa
     CreateUserSchema,
     InDBUserSchema,
     RetrieveUserSchema,
     UpdateUserSchema,
 )
+from .vote import (  # noqa
+    CastVoteSchema,
+    CreateVoteSchema,
+    InDBVoteSchema,
+    RetrieveVoteSchema,
+    UpdateVoteSchema,
+)
@@ -0,0 +1,42 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BaseCategorySchema(BaseModel):
+    """
+    Schema share properties of "Category" model.
+    """
+
+    name: Optional[str] = None
+
+
+class CreateCategorySchema(BaseCategorySchema):
+    """
+    Schema for creating category via API.
+    """
+
+    name: str
+
+
+class UpdateCategorySchema(BaseCategorySchema):
+    """
+    Schema for updating category via API.
+    """
+
+
+class InDBCategorySchema(BaseCategorySchema):
+    """
+    Schema describe properties of "Category" in database.
+    """
+
+    id: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+
+class RetrieveCategorySchema(InDBCategorySchema):
+    """
+    Schema for retrieving category via API.
+    """
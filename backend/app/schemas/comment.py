@@ -0,0 +1,46 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BaseCommentSchema(BaseModel):
+    """
+    Schema share properties of "Comment" model.
+    """
+
+    comment: Optional[str] = None
+
+
+class CreateCommentSchema(BaseCommentSchema):
+    """
+    Schema for creating comment via API.
+    """
+
+    comment: str
+    post_id: int
+    author_id: Optional[int] = None
+
+
+class UpdateCommentSchema(BaseCommentSchema):
+    """
+    Schema for updating comment via API.
+    """
+
+
+class InDBCommentSchema(BaseCommentSchema):
+    """
+    Schema describe properties of "Comment" in database.
+    """
+
+    id: Optional[int] = None
+    post_id: Optional[int] = None
+    author_id: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+
+class RetrieveCommentSchema(InDBCommentSchema):
+    """
+    Schema for retrieving comment via API.
+    """
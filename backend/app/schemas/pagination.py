@@ -0,0 +1,18 @@
+from typing import Generic, Optional, TypeVar
+
+from pydantic.generics import GenericModel
+
+ItemSchemaType = TypeVar("ItemSchemaType")
+
+
+class CursorPageSchema(GenericModel, Generic[ItemSchemaType]):
+    """
+    Schema for keyset (cursor) paginated API response.
+    Pass "next_cursor" back as "cursor" query parameter to get the next page.
+    """
+
+    items: list[ItemSchemaType]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        orm_mode = True
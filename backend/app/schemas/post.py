@@ -0,0 +1,98 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .category import RetrieveCategorySchema
+from .comment import RetrieveCommentSchema
+from .tag import RetrieveTagSchema
+
+
+class BasePostSchema(BaseModel):
+    """
+    Schema share properties of "Post" model.
+    """
+
+    title: Optional[str] = None
+    short_description: Optional[str] = None
+    content: Optional[str] = None
+    category_id: Optional[int] = None
+
+
+class CreatePostSchema(BasePostSchema):
+    """
+    Schema for creating post via API.
+    """
+
+    title: str
+    author_id: Optional[int] = None
+
+
+class UpdatePostSchema(BasePostSchema):
+    """
+    Schema for updating post via API.
+    """
+
+
+class InDBPostSchema(BasePostSchema):
+    """
+    Schema describe properties of "Post" in database.
+    """
+
+    id: Optional[int] = None
+    author_id: Optional[int] = None
+    comment_count: int = 0
+    tag_count: int = 0
+
+    class Config:
+        orm_mode = True
+
+
+class RetrievePostSchema(InDBPostSchema):
+    """
+    Schema for retrieving post via API.
+    """
+
+
+class PostAuthorSchema(BaseModel):
+    """
+    Schema for public properties of post author (no email, no permissions).
+    """
+
+    id: int
+    name: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ListPostSchema(InDBPostSchema):
+    """
+    Schema for post item of list API. Related objects are loaded by the "list"
+    loading profile of PostService.
+    """
+
+    author: Optional[PostAuthorSchema] = None
+    category: Optional[RetrieveCategorySchema] = None
+    tags: list[RetrieveTagSchema] = []
+
+
+class DetailPostSchema(ListPostSchema):
+    """
+    Schema for retrieving post with its comments via API ("detail" loading profile).
+    """
+
+    comments: list[RetrieveCommentSchema] = []
+
+
+class SearchPostSchema(BaseModel):
+    """
+    Schema for post search result via API. Content is replaced by a highlighted snippet.
+    """
+
+    id: int
+    title: str
+    short_description: Optional[str] = None
+    author_id: Optional[int] = None
+    category_id: Optional[int] = None
+    rank: float
+    snippet: str
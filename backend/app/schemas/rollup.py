@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Generic, Optional
+
+from pydantic import BaseModel
+from pydantic.generics import GenericModel
+
+from .pagination import ItemSchemaType
+
+
+class RollupSchema(GenericModel, Generic[ItemSchemaType]):
+    """
+    Schema for API response read from a rollup (materialized view).
+    Rows are as of "refreshed_at" (None: never refreshed since created).
+    """
+
+    items: list[ItemSchemaType]
+    refreshed_at: Optional[datetime] = None
+
+
+class PopularPostSchema(BaseModel):
+    """
+    Schema of a most commented post.
+    """
+
+    post_id: int
+    title: str
+    author_id: Optional[int] = None
+    category_id: Optional[int] = None
+    comment_count: int
+    vote_count: int
+    created_at: datetime
+
+
+class TagRollupSchema(BaseModel):
+    """
+    Schema of number of posts of a tag.
+    """
+
+    tag_id: int
+    name: str
+    post_count: int
+    last_post_at: Optional[datetime] = None
+
+
+class CategoryRollupSchema(BaseModel):
+    """
+    Schema of number of posts of a category.
+    """
+
+    category_id: int
+    name: str
+    post_count: int
+    last_post_at: Optional[datetime] = None
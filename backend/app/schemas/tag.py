@@ -0,0 +1,43 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BaseTagSchema(BaseModel):
+    """
+    Schema share properties of "Tag" model.
+    """
+
+    name: Optional[str] = None
+
+
+class CreateTagSchema(BaseTagSchema):
+    """
+    Schema for creating tag via API.
+    """
+
+    name: str
+
+
+class UpdateTagSchema(BaseTagSchema):
+    """
+    Schema for updating tag via API.
+    """
+
+
+class InDBTagSchema(BaseTagSchema):
+    """
+    Schema describe properties of "Tag" in database.
+    """
+
+    id: Optional[int] = None
+    post_count: int = 0
+
+    class Config:
+        orm_mode = True
+
+
+class RetrieveTagSchema(InDBTagSchema):
+    """
+    Schema for retrieving tag via API.
+    """
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BaseVoteSchema(BaseModel):
+    """
+    Schema share properties of "Vote" model.
+    """
+
+    count: Optional[int] = None
+
+
+class CreateVoteSchema(BaseVoteSchema):
+    """
+    Schema for creating vote counter of post.
+    """
+
+    post_id: int
+    count: int = 0
+
+
+class UpdateVoteSchema(BaseVoteSchema):
+    """
+    Schema for updating vote counter of post.
+    """
+
+
+class InDBVoteSchema(BaseVoteSchema):
+    """
+    Schema describe properties of "Vote" in database.
+    """
+
+    id: Optional[int] = None
+    post_id: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+
+class RetrieveVoteSchema(BaseModel):
+    """
+    Schema for retrieving vote count of post via API. Include votes not flushed yet.
+    """
+
+    post_id: int
+    count: int
+
+
+class CastVoteSchema(BaseModel):
+    """
+    Schema for vote API response. "accepted" is False for a duplicated vote.
+    """
+
+    accepted: bool
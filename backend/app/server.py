@@ -0,0 +1,406 @@
+"""
+Production server: a pre-forking master supervising uvicorn workers.
+
+    python -m app.server [--workers N] [--host HOST] [--port PORT]
+
+- The application is imported once by the master, before workers are forked
+  (preload): workers share its memory pages copy-on-write and start fast.
+- Workers accept connections on the listening socket bound by the master.
+- A worker exits after SERVER_MAX_REQUESTS requests (plus a random jitter, so
+  workers do not restart together) and is replaced, bounding memory growth.
+- uvloop and httptools are used when installed (requirements/production.txt).
+
+Signals of the master:
+    SIGTERM, SIGINT: graceful stop. Workers finish in-flight requests, and are
+        killed after SERVER_GRACEFUL_TIMEOUT seconds.
+    SIGHUP: rolling restart, loading new code. The master executes itself again,
+        keeping the listening socket, imports the application, then replaces
+        old workers one at a time: an old worker is stopped only once its
+        replacement is ready, so capacity never drops.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Any, Optional
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+# Environment of a master executed again by SIGHUP
+LISTEN_FD_ENV = "SERVER_LISTEN_FD"
+OLD_WORKERS_ENV = "SERVER_OLD_WORKERS"
+# Workers failing sooner after their start: wait before respawning them
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+# Seconds a stopping worker waits, once it stopped accepting, for the requests of
+# connections it has just accepted (uvicorn closes them at once if still idle)
+SHUTDOWN_ACCEPT_GRACE_SECONDS = 0.25
+
+
+def default_workers() -> int:
+    """
+    Number of CPU cores usable by the process (CPU affinity aware).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def reset_after_fork() -> None:
+    """
+    Drop connection pools inherited from the master, without closing their
+    connections (they belong to the master).
+    """
+    from app.db.session import built_engines
+
+    for sync_engine in built_engines().values():
+        sync_engine.dispose(close=False)
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Fold metrics snapshot of an exited worker into the snapshot of exited
+    workers (METRICS_MULTIPROCESS_DIR), see app.core.metrics.
+    """
+    from app.core.metrics import metrics_registry
+
+    try:
+        metrics_registry.mark_process_dead(pid)
+    except OSError:
+        logger.exception("Failed to merge metrics of worker %d", pid)
+
+
+class WorkerServer(uvicorn.Server):
+    """
+    uvicorn server notifying the master through a pipe once started.
+    """
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[list] = None) -> None:
+        """
+        Start server (application startup events included), then notify master.
+        """
+        await super().startup(sockets=sockets)
+        try:
+            if not self.should_exit:
+                os.write(self.ready_fd, b"1")
+        except OSError:
+            # Master did not wait for this worker
+            pass
+        finally:
+            os.close(self.ready_fd)
+
+    async def shutdown(self, sockets: Optional[list] = None) -> None:
+        """
+        Stop accepting connections, let connections accepted before (e.g. while
+        reaching max requests) send their request, then shut down.
+        """
+        for server in self.servers:
+            server.close()
+        await asyncio.sleep(SHUTDOWN_ACCEPT_GRACE_SECONDS)
+        await super().shutdown(sockets=sockets)
+
+
+class Master:
+    """
+    Pre-forking master: preloads the application, forks and supervises workers.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        *,
+        app: str = APP,
+        workers: int = 1,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: float = 30.0,
+        access_log: bool = False,
+    ):
+        """
+        Args:
+            sock: socket.socket. Listening socket shared by workers.
+            app: str. Import string of ASGI application.
+            workers: int. Number of worker processes.
+            max_requests: int. Requests served by a worker before it is replaced, 0: never.
+            max_requests_jitter: int. Random extra requests per worker.
+            graceful_timeout: float. Seconds given to a stopping worker.
+            access_log: bool. Log every request.
+        """
+        self.sock = sock
+        self.app = app
+        self.worker_count = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.access_log = access_log
+        self.application: Any = None
+        # Running worker pid -> start time
+        self.workers: dict[int, float] = {}
+        # Stopping worker pid -> deadline before SIGKILL
+        self.stopping: dict[int, float] = {}
+        self._signals: list[int] = []
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._respawn_at = 0.0
+
+    def run(self, old_workers: tuple[int, ...] = ()) -> None:
+        """
+        Preload application, start workers (replacing workers of a previous
+        master one by one) and supervise them until SIGTERM/SIGINT.
+        """
+        self.application = import_from_string(self.app)
+        self.install_signal_handlers()
+        logger.info(
+            "Master %d serving %s on %s with %d workers",
+            os.getpid(),
+            self.app,
+            self.sock.getsockname(),
+            self.worker_count,
+        )
+        for pid in old_workers:
+            self.spawn(wait_ready=True)
+            self.terminate(pid)
+        while True:
+            self.spawn_missing()
+            signum = self.wait_signal(timeout=1.0)
+            self.reap()
+            self.kill_overdue()
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                self.stop()
+                return
+            if signum == signal.SIGHUP:
+                self.reexec()
+
+    def install_signal_handlers(self) -> None:
+        """
+        Queue signals, the main loop wakes up through the wakeup pipe.
+        """
+        os.set_blocking(self._wakeup_w, False)
+        signal.set_wakeup_fd(self._wakeup_w)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, lambda sig, frame: self._signals.append(sig))
+
+    def wait_signal(self, timeout: float) -> Optional[int]:
+        """
+        Wait for a signal, return the most important one received (None: timeout
+        or SIGCHLD only).
+        """
+        if not self._signals:
+            select.select([self._wakeup_r], [], [], timeout)
+        try:
+            os.read(self._wakeup_r, 1024)
+        except BlockingIOError:
+            pass
+        received, self._signals = set(self._signals), []
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            if signum in received:
+                return signum
+        return None
+
+    def spawn_missing(self) -> None:
+        """
+        Start workers up to the configured number.
+        """
+        if time.monotonic() < self._respawn_at:
+            return
+        while len(self.workers) < self.worker_count:
+            self.spawn()
+
+    def spawn(self, wait_ready: bool = False) -> int:
+        """
+        Fork a worker.
+
+        Args:
+            wait_ready: bool. Return once the worker accepts connections.
+
+        Returns:
+            pid: int
+        """
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            status = 0
+            try:
+                self.run_worker(ready_w)
+            except BaseException:
+                logger.exception("Worker %d failed", os.getpid())
+                status = 1
+            finally:
+                os._exit(status)
+        os.close(ready_w)
+        self.workers[pid] = time.monotonic()
+        if wait_ready:
+            ready, _, _ = select.select([ready_r], [], [], self.graceful_timeout)
+            if not ready or not os.read(ready_r, 1):
+                logger.warning("Worker %d not ready, continuing", pid)
+        os.close(ready_r)
+        return pid
+
+    def run_worker(self, ready_fd: int) -> None:
+        """
+        Body of a worker process: serve the preloaded application.
+        """
+        signal.set_wakeup_fd(-1)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+        reset_after_fork()
+        max_requests = None
+        if self.max_requests:
+            max_requests = self.max_requests + random.randint(
+                0, self.max_requests_jitter
+            )
+        config = uvicorn.Config(
+            self.application,
+            loop="auto",
+            http="auto",
+            lifespan="on",
+            access_log=self.access_log,
+            limit_max_requests=max_requests,
+        )
+        WorkerServer(config, ready_fd).run(sockets=[self.sock])
+
+    def terminate(self, pid: int) -> None:
+        """
+        Ask worker to stop gracefully, kill it after "graceful_timeout".
+        """
+        self.workers.pop(pid, None)
+        self.stopping[pid] = time.monotonic() + self.graceful_timeout
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            self.stopping.pop(pid)
+
+    def reap(self) -> None:
+        """
+        Collect exited workers. Running workers exiting (max requests reached,
+        crash) are replaced by the main loop.
+        """
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.stopping.pop(pid, None)
+            mark_process_dead(pid)
+            started_at = self.workers.pop(pid, None)
+            if started_at is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            logger.info("Worker %d exited (%d), replacing it", pid, code)
+            if (
+                code != 0
+                and time.monotonic() - started_at < MIN_WORKER_LIFETIME_SECONDS
+            ):
+                self._respawn_at = time.monotonic() + MIN_WORKER_LIFETIME_SECONDS
+
+    def kill_overdue(self) -> None:
+        """
+        Kill stopping workers past their graceful timeout.
+        """
+        now = time.monotonic()
+        for pid, deadline in list(self.stopping.items()):
+            if now >= deadline:
+                logger.warning("Worker %d did not stop in time, killing it", pid)
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.stopping[pid] = float("inf")
+
+    def stop(self) -> None:
+        """
+        Stop all workers gracefully and wait for them.
+        """
+        for pid in list(self.workers):
+            self.terminate(pid)
+        while self.stopping:
+            time.sleep(0.1)
+            self.reap()
+            self.kill_overdue()
+        logger.info("Master %d stopped", os.getpid())
+
+    def reexec(self) -> None:
+        """
+        Execute the master again (new code), handing over the listening socket
+        and running workers, see "run".
+        """
+        while self.stopping:
+            time.sleep(0.1)
+            self.reap()
+            self.kill_overdue()
+        logger.info("Master %d restarting %d workers", os.getpid(), len(self.workers))
+        signal.set_wakeup_fd(-1)
+        os.set_inheritable(self.sock.fileno(), True)
+        env = dict(os.environ)
+        env[LISTEN_FD_ENV] = str(self.sock.fileno())
+        env[OLD_WORKERS_ENV] = ",".join(str(pid) for pid in self.workers)
+        os.execve(
+            sys.executable, [sys.executable, "-m", "app.server", *sys.argv[1:]], env
+        )
+
+
+def listen(host: str, port: int) -> socket.socket:
+    """
+    Listening socket, inherited from a previous master when executed again.
+    """
+    fd = os.environ.pop(LISTEN_FD_ENV, None)
+    if fd is not None:
+        sock = socket.socket(fileno=int(fd))
+        os.set_inheritable(sock.fileno(), False)
+        return sock
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    return sock
+
+
+def main() -> None:
+    """
+    Parse arguments (defaults from settings) and run the master.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+    logger.setLevel(logging.INFO)
+    old_workers = tuple(
+        int(pid) for pid in os.environ.pop(OLD_WORKERS_ENV, "").split(",") if pid
+    )
+    master = Master(
+        listen(args.host, args.port),
+        workers=args.workers or default_workers(),
+        max_requests=settings.SERVER_MAX_REQUESTS,
+        max_requests_jitter=settings.SERVER_MAX_REQUESTS_JITTER,
+        graceful_timeout=settings.SERVER_GRACEFUL_TIMEOUT,
+        access_log=settings.SERVER_ACCESS_LOG,
+    )
+    master.run(old_workers=old_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,7 @@
-from .user import user_service  # noqa
+from .category import category_service  # noqa
+from .comment import comment_service  # noqa
+from .post import post_service  # noqa
+from .rollup import rollup_refresher, rollup_service  # noqa
+from .tag import tag_service  # noqa
+from .user import async_user_service, user_service  # noqa
+from .vote import vote_buffer, vote_service  # noqa
@@ -1,34 +1,121 @@
+import datetime
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from decimal import Decimal
 from typing import Any, Generic, Optional, TypeVar, Union
 
-from fastapi.encoders import jsonable_encoder
+import orjson
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import RowMapping, inspect, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.types import TypeEngine
 
+from app.core.cache import CacheBackend
 from app.db.base_class import Base
+from app.db.bulk import apply_on_conflict, chunked, copy_rows, copy_upsert_rows
+from app.services.pagination import CursorPage, build_page, keyset_clauses
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def to_column_dict(
+    obj_in: Union[BaseModel, dict[str, Any]], exclude_unset: bool = False
+) -> dict[str, Any]:
+    """
+    Convert create/update subject to a (new) dict of column values.
+    Values keep their python types (datetime, Decimal..) which database drivers
+    adapt natively, no JSON-compatible conversion ("jsonable_encoder") is needed.
+
+    Args:
+        obj_in: Union[BaseModel, dict[str, Any]]. Schema object or subject.
+        exclude_unset: bool. Skip fields of schema not explicitly set (partial update).
+
+    Returns:
+        obj_data: dict[str, Any]
+    """
+    if isinstance(obj_in, BaseModel):
+        return obj_in.dict(exclude_unset=exclude_unset)
+    return dict(obj_in)
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    JSON-compatible value of column value: datetime, date, time, Decimal and UUID
+    become strings, see "from_json_value".
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def from_json_value(column_type: TypeEngine, value: Any) -> Any:
+    """
+    Column value of JSON value generated by "to_json_value".
+
+    Args:
+        column_type: TypeEngine. SQLAlchemy type of column.
+        value: Any. JSON value.
+
+    Returns:
+        value: Any
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
+    if python_type is datetime.time:
+        return datetime.time.fromisoformat(value)
+    if python_type in (Decimal, uuid.UUID):
+        return python_type(value)
+    return value
+
+
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     BaseService class. Provide default methods(CRUD,..).
     """
 
-    def __init__(self, model: type[ModelType]):
+    # Ordering columns of keyset (cursor) pagination. They have to be unique
+    # together and covered by an index, e.g. ("created_at", "id").
+    cursor_fields: tuple[str, ...] = ("id",)
+    cursor_descending: bool = False
+
+    def __init__(
+        self,
+        model: type[ModelType],
+        cache: Optional[CacheBackend] = None,
+        cache_ttl: Optional[int] = None,
+    ):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD)
 
         Args:
             model: type[ModelType]. A SQLAlchemy model class
+            cache: Optional[CacheBackend]. Read-through cache of "get". None: disabled.
+            cache_ttl: Optional[int]. Lifetime (seconds) of cached objects. None: backend default.
         """
         self.model = model
+        self.cache = cache
+        self.cache_ttl = cache_ttl
 
     def get(self, session: Session, _id: Any) -> Optional[ModelType]:
         """
         Get one object of model based on primary key (id).
         Return None if object does not exist.
+        With cache enabled, a cached snapshot (JSON, never unpickled: the cache
+        may be shared) is merged into the session without a database round trip.
 
         Args:
             session: Session. SQLAlchemy ORM Session.
@@ -37,7 +124,79 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             obj: ModelType
         """
-        return session.query(self.model).filter(self.model.id == _id).first()
+        if self.cache is None:
+            return session.query(self.model).filter(self.model.id == _id).first()
+
+        key = self.cache_key(_id)
+        snapshot = self.cache.get(key)
+        if snapshot is not None:
+            try:
+                return self.from_snapshot(session, orjson.loads(snapshot))
+            except orjson.JSONDecodeError:
+                # Written by a previous version: reloaded and replaced
+                pass
+
+        db_obj = session.query(self.model).filter(self.model.id == _id).first()
+        if db_obj is not None:
+            self.cache.set(
+                key, orjson.dumps(self.to_snapshot(db_obj)), ttl=self.cache_ttl
+            )
+        return db_obj
+
+    def cache_key(self, _id: Any) -> str:
+        """
+        Cache key of object.
+        """
+        return f"{self.model.__tablename__}:{_id}"
+
+    def invalidate_cache(self, *ids: Any) -> None:
+        """
+        Drop cached snapshots of objects.
+
+        Args:
+            ids: Any. Primary keys of objects.
+        """
+        if self.cache is not None and ids:
+            self.cache.delete(*(self.cache_key(_id) for _id in ids))
+
+    def to_snapshot(self, db_obj: ModelType) -> dict[str, Any]:
+        """
+        Detached, JSON-compatible snapshot of loaded column attributes of object.
+
+        Args:
+            db_obj: ModelType. SQLAlchemy ORM object.
+
+        Returns:
+            snapshot: dict[str, Any]
+        """
+        loaded = inspect(db_obj).dict
+        return {
+            attr.key: to_json_value(loaded[attr.key])
+            for attr in inspect(self.model).column_attrs
+            if attr.key in loaded
+        }
+
+    def from_snapshot(self, session: Session, snapshot: dict[str, Any]) -> ModelType:
+        """
+        Rebuild object from snapshot and attach it to session as a persistent
+        object (no database round trip). Missing attributes are loaded on access.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            snapshot: dict[str, Any]. Snapshot generated by "to_snapshot".
+
+        Returns:
+            obj: ModelType
+        """
+        column_attrs = inspect(self.model).column_attrs
+        db_obj = self.model(
+            **{
+                key: from_json_value(column_attrs[key].expression.type, value)
+                for key, value in snapshot.items()
+            }
+        )
+        make_transient_to_detached(db_obj)
+        return session.merge(db_obj, load=False)
 
     def get_multi(
         self,
@@ -59,6 +218,72 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return session.query(self.model).offset(offset).limit(limit).all()
 
+    def get_multi_by_cursor(
+        self,
+        session: Session,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> CursorPage[ModelType]:
+        """
+        Get multiple objects of model with keyset (cursor) pagination.
+        Seek directly after the last item of previous page instead of skipping
+        "offset" rows, so latency of deep pages stays flat.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            limit: int. The limit number of objects can be retrieved.
+            cursor: Optional[str]. "next_cursor" of previous page. None for the first page.
+
+        Returns:
+            page: CursorPage[ModelType]
+
+        Raises:
+            ValueError: cursor is malformed.
+        """
+        columns = [getattr(self.model, field) for field in self.cursor_fields]
+        criteria, order_by = keyset_clauses(columns, cursor, self.cursor_descending)
+        objs = (
+            session.query(self.model)
+            .filter(*criteria)
+            .order_by(*order_by)
+            .limit(limit + 1)
+            .all()
+        )
+        return build_page(objs, columns, limit)
+
+    def iter_all(
+        self,
+        session: Session,
+        *,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[RowMapping]:
+        """
+        Iterate over all rows of model table, ordered by primary key.
+        Rows are fetched by a server-side cursor, "batch_size" rows at a time,
+        so memory stays constant regardless of table size. The session must stay
+        open until the iteration ends.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            columns: Optional[Sequence[str]]. Selected columns. None: all columns.
+            batch_size: int. Number of rows fetched per round trip.
+
+        Returns:
+            rows: Iterator[RowMapping]. Column name -> value mappings.
+        """
+        table = self.model.__table__
+        selected = [table.c[column] for column in columns] if columns else list(table.c)
+        stmt = (
+            select(*selected)
+            .order_by(table.c.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        result = session.execute(stmt)
+        for partition in result.mappings().partitions():
+            yield from partition
+
     def perform_create_update_data(self, obj_in: dict):  # noqa
         """
         Perform create/update subject.
@@ -87,7 +312,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             obj: ModelType
         """
-        obj_data = jsonable_encoder(obj_in)
+        obj_data = to_column_dict(obj_in)
         db_obj = self.model(**self.perform_create_update_data(obj_data))
         session.add(db_obj)
         session.commit()
@@ -98,27 +323,124 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self,
         session: Session,
         *,
-        lst_objs_in: list[Union[CreateSchemaType, dict[str, Any]]],
+        lst_objs_in: Sequence[Union[CreateSchemaType, dict[str, Any]]],
     ) -> list[ModelType]:
         """
         Bulk create instance of model (insert to database) based on input instance (schema).
 
         Args:
             session: Session. SQLAlchemy ORM Session.
-            lst_objs_in: list[Union[CreateSchemaType, dict[str, Any]]]. List of create schema object/subject.
+            lst_objs_in: Sequence[Union[CreateSchemaType, dict[str, Any]]]. List of create schema object/subject.
 
         Returns:
             objs: list[ModelType]
         """
-        lst_objs_data = jsonable_encoder(lst_objs_in)
+        lst_objs_data = [to_column_dict(obj_in) for obj_in in lst_objs_in]
         db_objs = [
             self.model(**self.perform_create_update_data(obj_data))
             for obj_data in lst_objs_data
         ]
         session.bulk_save_objects(objects=db_objs)
         session.commit()
+        # subjects with explicit primary keys may replace cached objects
+        self.invalidate_cache(*(obj.id for obj in db_objs if obj.id is not None))
         return db_objs
 
+    def bulk_insert(
+        self,
+        session: Session,
+        *,
+        objs_in: Iterable[Union[CreateSchemaType, dict[str, Any]]],
+        chunk_size: int = 1000,
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_fields: Optional[Sequence[str]] = None,
+    ) -> list[Any]:
+        """
+        High volume import with multi-row "INSERT ... RETURNING id".
+        Subjects are consumed lazily in chunks (no ORM instances are built), so
+        memory is bounded by "chunk_size". Runs in one transaction.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            objs_in: Iterable[Union[CreateSchemaType, dict[str, Any]]]. Create subjects,
+                can be a generator.
+            chunk_size: int. Number of rows sent per statement.
+            conflict_columns: Optional[Sequence[str]]. Upsert on this unique constraint,
+                e.g. ["title"]. None: plain insert.
+            update_fields: Optional[Sequence[str]]. Columns updated on conflict.
+                None: "ON CONFLICT DO NOTHING".
+
+        Returns:
+            ids: list[Any]. Primary keys of inserted/updated rows.
+        """
+        table = self.model.__table__
+        stmt = apply_on_conflict(
+            insert(table), conflict_columns, update_fields
+        ).returning(table.c.id)
+
+        ids: list[Any] = []
+        for chunk in chunked(objs_in, chunk_size):
+            rows = [
+                self.perform_create_update_data(to_column_dict(obj)) for obj in chunk
+            ]
+            ids.extend(session.execute(stmt, rows).scalars().all())
+        session.commit()
+        if update_fields:
+            for ids_chunk in chunked(ids, chunk_size):
+                self.invalidate_cache(*ids_chunk)
+        return ids
+
+    def bulk_copy(
+        self,
+        session: Session,
+        *,
+        objs_in: Iterable[Union[CreateSchemaType, dict[str, Any]]],
+        chunk_size: int = 10_000,
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_fields: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Fastest high volume import with Postgres "COPY FROM STDIN".
+        Subjects are consumed lazily in chunks, all subjects must have the same keys.
+        With "conflict_columns", chunks are copied to a temporary staging table
+        and moved with "INSERT ... SELECT ... ON CONFLICT". Runs in one transaction.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            objs_in: Iterable[Union[CreateSchemaType, dict[str, Any]]]. Create subjects,
+                can be a generator.
+            chunk_size: int. Number of rows sent per COPY.
+            conflict_columns: Optional[Sequence[str]]. Upsert on this unique constraint.
+            update_fields: Optional[Sequence[str]]. Columns updated on conflict.
+                None: "ON CONFLICT DO NOTHING".
+
+        Returns:
+            count: int. Number of inserted/updated rows.
+        """
+        table = self.model.__table__
+        connection = session.connection()
+        count = 0
+        updated_ids: list[Any] = []
+        for chunk in chunked(objs_in, chunk_size):
+            rows = [
+                self.perform_create_update_data(to_column_dict(obj)) for obj in chunk
+            ]
+            columns = list(rows[0])
+            if conflict_columns:
+                ids = copy_upsert_rows(
+                    connection, table, columns, rows, conflict_columns, update_fields
+                )
+                count += len(ids)
+                if update_fields and self.cache is not None:
+                    updated_ids.extend(ids)
+            else:
+                copy_rows(connection, table.name, columns, rows)
+                count += len(rows)
+        session.commit()
+        for ids_chunk in chunked(updated_ids, chunk_size):
+            self.invalidate_cache(*ids_chunk)
+        return count
+
     def update(  # noqa
         self,
         session: Session,
@@ -137,19 +459,15 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             obj: ModelType
         """
-        obj_data = jsonable_encoder(obj_in)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        update_data = to_column_dict(obj_in, exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
 
         # update to database
         session.add(db_obj)
         session.commit()
         session.refresh(db_obj)
+        self.invalidate_cache(db_obj.id)
         return db_obj
 
     def remove(
@@ -171,6 +489,207 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             )
         if db_obj is None:
             db_obj = session.query(self.model).filter(self.model.id == _id).one()
+        _id = db_obj.id
         session.delete(db_obj)
         session.commit()
+        self.invalidate_cache(_id)
+        return None
+
+
+class AsyncBaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    AsyncBaseService class. Provide default async methods(CRUD,..).
+    Same interface as BaseService, working on AsyncSession.
+    """
+
+    cursor_fields: tuple[str, ...] = ("id",)
+    cursor_descending: bool = False
+
+    def __init__(self, model: type[ModelType]):
+        """
+        Async CRUD object with default methods to Create, Read, Update, Delete (CRUD)
+
+        Args:
+            model: type[ModelType]. A SQLAlchemy model class
+        """
+        self.model = model
+
+    async def get(self, session: AsyncSession, _id: Any) -> Optional[ModelType]:
+        """
+        Get one object of model based on primary key (id).
+        Return None if object does not exist.
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            _id: Any
+
+        Returns:
+            obj: ModelType
+        """
+        result = await session.execute(select(self.model).where(self.model.id == _id))
+        return result.scalars().first()
+
+    async def get_multi(
+        self,
+        session: AsyncSession,
+        *,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[ModelType]:
+        """
+        Get multiple objects of model. With default limit/offset
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            offset: int. The number of objects need to skip.
+            limit: int. The limit number of objects can be retrieved.
+
+        Returns:
+            objs: list[ModelType]
+        """
+        result = await session.execute(select(self.model).offset(offset).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_multi_by_cursor(
+        self,
+        session: AsyncSession,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> CursorPage[ModelType]:
+        """
+        Get multiple objects of model with keyset (cursor) pagination.
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            limit: int. The limit number of objects can be retrieved.
+            cursor: Optional[str]. "next_cursor" of previous page. None for the first page.
+
+        Returns:
+            page: CursorPage[ModelType]
+
+        Raises:
+            ValueError: cursor is malformed.
+        """
+        columns = [getattr(self.model, field) for field in self.cursor_fields]
+        criteria, order_by = keyset_clauses(columns, cursor, self.cursor_descending)
+        result = await session.execute(
+            select(self.model).where(*criteria).order_by(*order_by).limit(limit + 1)
+        )
+        return build_page(list(result.scalars().all()), columns, limit)
+
+    def perform_create_update_data(self, obj_in: dict):  # noqa
+        """
+        Perform create/update subject.
+
+        Args:
+            obj_in: dict
+
+        Returns:
+            performed_ins_in: dict
+        """
+        return obj_in
+
+    async def create(
+        self,
+        session: AsyncSession,
+        *,
+        obj_in: Union[CreateSchemaType, dict[str, Any]],
+    ) -> ModelType:
+        """
+        Create object of model (insert to database) based on input object (schema).
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            obj_in: CreateSchemaType, dict. Create schema object/subject.
+
+        Returns:
+            obj: ModelType
+        """
+        obj_data = to_column_dict(obj_in)
+        db_obj = self.model(**self.perform_create_update_data(obj_data))
+        session.add(db_obj)
+        await session.commit()
+        await session.refresh(db_obj)
+        return db_obj
+
+    async def bulk_create(
+        self,
+        session: AsyncSession,
+        *,
+        lst_objs_in: Sequence[Union[CreateSchemaType, dict[str, Any]]],
+    ) -> list[ModelType]:
+        """
+        Bulk create instance of model (insert to database) based on input instance (schema).
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            lst_objs_in: Sequence[Union[CreateSchemaType, dict[str, Any]]]. List of create schema object/subject.
+
+        Returns:
+            objs: list[ModelType]
+        """
+        lst_objs_data = [to_column_dict(obj_in) for obj_in in lst_objs_in]
+        db_objs = [
+            self.model(**self.perform_create_update_data(obj_data))
+            for obj_data in lst_objs_data
+        ]
+        await session.run_sync(
+            lambda sync_session: sync_session.bulk_save_objects(objects=db_objs)
+        )
+        await session.commit()
+        return db_objs
+
+    async def update(  # noqa
+        self,
+        session: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, dict[str, Any]],
+    ) -> ModelType:
+        """
+        Update object of model (update to database) based on input instance (schema).
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            db_obj: ModelType. SQLAlchemy ORM object.
+            obj_in: Union[UpdateSchemaType, dict[str, Any]]. Update schema object/subject.
+
+        Returns:
+            obj: ModelType
+        """
+        update_data = to_column_dict(obj_in, exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        # update to database
+        session.add(db_obj)
+        await session.commit()
+        await session.refresh(db_obj)
+        return db_obj
+
+    async def remove(
+        self, session: AsyncSession, *, _id: Any = None, db_obj: ModelType = None
+    ) -> None:
+        """
+        Remove object of model (delete from database) based on instance primary key (id).
+        By default, function will retrieve and delete object.
+        Providing "db_obj" to bypass retrieve step.
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            _id: Any. Primary key of instance.
+            db_obj: Optional[ModelType]. Object of model (optional).
+        """
+        if not any((_id, db_obj)):
+            raise ValueError(
+                "Cannot implement. '_id' or 'db_obj' parameter is required."
+            )
+        if db_obj is None:
+            result = await session.execute(
+                select(self.model).where(self.model.id == _id)
+            )
+            db_obj = result.scalars().one()
+        await session.delete(db_obj)
+        await session.commit()
         return None
@@ -0,0 +1,14 @@
+from app.models.category import Category
+from app.schemas.category import CreateCategorySchema, UpdateCategorySchema
+from app.services.base import BaseService
+
+
+class CategoryService(
+    BaseService[Category, CreateCategorySchema, UpdateCategorySchema]
+):
+    """
+    CategoryService class. Provide methods related to "Category" model.
+    """
+
+
+category_service = CategoryService(model=Category)
@@ -0,0 +1,12 @@
+from app.models.comment import Comment
+from app.schemas.comment import CreateCommentSchema, UpdateCommentSchema
+from app.services.base import BaseService
+
+
+class CommentService(BaseService[Comment, CreateCommentSchema, UpdateCommentSchema]):
+    """
+    CommentService class. Provide methods related to "Comment" model.
+    """
+
+
+comment_service = CommentService(model=Comment)
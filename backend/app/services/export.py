@@ -0,0 +1,74 @@
+"""
+Incremental encoders of exported rows (NDJSON, CSV).
+"""
+import csv
+import io
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+import orjson
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Encode values not supported by orjson (Decimal..). Datetime, date and UUID
+    are supported natively.
+    """
+    return str(value)
+
+
+def iter_ndjson(
+    rows: Iterable[Mapping[str, Any]], batch_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    Encode rows as newline delimited JSON, one chunk of bytes per "batch_size" rows.
+
+    Args:
+        rows: Iterable[Mapping[str, Any]]
+        batch_size: int. Number of rows per yielded chunk.
+
+    Returns:
+        chunks: Iterator[bytes]
+    """
+    lines: list[bytes] = []
+    for row in rows:
+        lines.append(orjson.dumps(dict(row), default=_json_default))
+        if len(lines) >= batch_size:
+            yield b"\n".join(lines) + b"\n"
+            lines.clear()
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def iter_csv(
+    rows: Iterable[Mapping[str, Any]], columns: Sequence[str], batch_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    Encode rows as CSV with header, one chunk of bytes per "batch_size" rows.
+    The header is yielded first, before any row is fetched.
+
+    Args:
+        rows: Iterable[Mapping[str, Any]]
+        columns: Sequence[str]. Header and order of columns.
+        batch_size: int. Number of rows per yielded chunk.
+
+    Returns:
+        chunks: Iterator[bytes]
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+
+    count = 0
+    for row in rows:
+        writer.writerow([row[column] for column in columns])
+        count += 1
+        if count % batch_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,124 @@
+"""
+Keyset (cursor) pagination helpers shared by services.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Generic, Optional, TypeVar
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import ColumnElement, tuple_
+
+ItemType = TypeVar("ItemType")
+
+
+@dataclass
+class CursorPage(Generic[ItemType]):
+    """
+    One page of keyset pagination result.
+    "next_cursor" is None on the last page.
+    """
+
+    items: list[ItemType]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """
+    Encode values of ordering columns into an opaque url-safe token.
+
+    Args:
+        values: list[Any]. Values of ordering columns of the last item of page.
+
+    Returns:
+        cursor: str
+    """
+    raw = json.dumps(jsonable_encoder(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list[Any]) -> list[Any]:
+    """
+    Decode token generated by "encode_cursor". Values are converted back to the
+    python type of ordering columns (datetime, date).
+
+    Args:
+        cursor: str. Token generated by "encode_cursor".
+        columns: list[Any]. Ordering columns.
+
+    Returns:
+        values: list[Any]
+
+    Raises:
+        ValueError: cursor is malformed.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+    decoded_values = []
+    for column, value in zip(columns, values):
+        python_type = column.type.python_type
+        if python_type in (datetime, date) and isinstance(value, str):
+            value = python_type.fromisoformat(value)
+        decoded_values.append(value)
+    return decoded_values
+
+
+def keyset_clauses(
+    columns: list[Any], cursor: Optional[str], descending: bool = False
+) -> tuple[list[ColumnElement], list[ColumnElement]]:
+    """
+    Build filter and order_by clauses to seek the page right after "cursor".
+    Row value comparison "(a, b) > (:a, :b)" can be resolved by a composite
+    index on ordering columns, the cost does not depend on page depth.
+
+    Args:
+        columns: list[Any]. Ordering columns, should be unique together (end with primary key).
+        cursor: Optional[str]. Cursor of previous page. None for the first page.
+        descending: bool. Order direction, apply for all columns.
+
+    Returns:
+        (criteria, order_by): tuple[list[ColumnElement], list[ColumnElement]]
+    """
+    order_by = [column.desc() if descending else column.asc() for column in columns]
+    if cursor is None:
+        return [], order_by
+
+    values = decode_cursor(cursor, columns)
+    if len(columns) == 1:
+        left, right = columns[0], values[0]
+    else:
+        left, right = tuple_(*columns), tuple_(*values)
+    criterion = left < right if descending else left > right
+    return [criterion], order_by
+
+
+def build_page(
+    objs: list[ItemType], columns: list[Any], limit: int
+) -> CursorPage[ItemType]:
+    """
+    Build CursorPage from "limit + 1" fetched objects.
+    The extra object only tells that a next page exists.
+
+    Args:
+        objs: list[ItemType]. Objects fetched with "limit + 1".
+        columns: list[Any]. Ordering columns.
+        limit: int. Page size.
+
+    Returns:
+        page: CursorPage[ItemType]
+    """
+    if len(objs) <= limit:
+        return CursorPage(items=objs, next_cursor=None)
+
+    items = objs[:limit]
+    last = items[-1]
+    next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return CursorPage(items=items, next_cursor=next_cursor)
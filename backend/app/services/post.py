@@ -0,0 +1,276 @@
+from typing import Any, Literal, Optional
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.core.conditional import Validators
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.post import Post, PostModelConfig
+from app.models.post_tag import PostTag
+from app.models.tag import Tag
+from app.schemas.post import CreatePostSchema, UpdatePostSchema
+from app.services.base import BaseService
+from app.services.pagination import CursorPage, build_page, keyset_clauses
+
+LoadingProfile = Literal["list", "detail"]
+
+# Eager loading options of each profile, every relationship is loaded in a fixed
+# number of queries whatever the number of posts:
+#   - many-to-one (author, category): LEFT JOIN in the posts query.
+#   - collections (tags, comments): one "SELECT ... WHERE post_id IN (...)" each.
+# "raiseload" is not used, relationships outside of the profile still lazy load.
+LOADING_PROFILES = {
+    "list": (
+        joinedload(Post.author),
+        joinedload(Post.category),
+        selectinload(Post.tags),
+    ),
+    "detail": (
+        joinedload(Post.author),
+        joinedload(Post.category),
+        selectinload(Post.tags),
+        selectinload(Post.comments),
+    ),
+}
+
+# Options of "ts_headline": highlight matches with <mark>, up to 2 fragments.
+SNIPPET_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, "
+    "MaxFragments=2, FragmentDelimiter= ... "
+)
+
+
+class PostService(BaseService[Post, CreatePostSchema, UpdatePostSchema]):
+    """
+    PostService class. Provide methods related to "Post" model.
+    """
+
+    # Newest posts first
+    cursor_descending = True
+
+    def get_with_profile(
+        self, session: Session, _id: Any, *, profile: LoadingProfile = "detail"
+    ) -> Optional[Post]:
+        """
+        Get one post with related objects of loading profile.
+        Return None if post does not exist.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            _id: Any. Primary key of post.
+            profile: LoadingProfile. Key of LOADING_PROFILES.
+
+        Returns:
+            post: Optional[Post]
+        """
+        stmt = select(Post).options(*LOADING_PROFILES[profile]).where(Post.id == _id)
+        return session.scalars(stmt).unique().first()
+
+    def list_posts(
+        self,
+        session: Session,
+        *,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        category_id: Optional[int] = None,
+        tag_id: Optional[int] = None,
+        profile: LoadingProfile = "list",
+    ) -> CursorPage[Post]:
+        """
+        Get newest posts with related objects of loading profile, keyset paginated.
+        The number of queries is bounded by the profile (2 for "list", 3 for
+        "detail"), not by the number of posts. Category filter uses index
+        "ix_post_category_id_id", tag filter joins "posttag" through index
+        "ix_posttag_tag_id_post_id".
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            limit: int. The limit number of posts can be retrieved.
+            cursor: Optional[str]. "next_cursor" of previous page. None for the first page.
+            category_id: Optional[int]. Only posts of this category.
+            tag_id: Optional[int]. Only posts linked to this tag.
+            profile: LoadingProfile. Key of LOADING_PROFILES.
+
+        Returns:
+            page: CursorPage[Post]
+
+        Raises:
+            ValueError: cursor is malformed.
+        """
+        stmt = self._page_statement(
+            select(Post).options(*LOADING_PROFILES[profile]),
+            limit=limit,
+            cursor=cursor,
+            category_id=category_id,
+            tag_id=tag_id,
+        )
+        posts = session.scalars(stmt).unique().all()
+        columns = [getattr(Post, field) for field in self.cursor_fields]
+        return build_page(list(posts), columns, limit)
+
+    def list_validators(
+        self,
+        session: Session,
+        *,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        category_id: Optional[int] = None,
+        tag_id: Optional[int] = None,
+    ) -> Validators:
+        """
+        Conditional GET validators of "list_posts" page, in one query selecting
+        only version columns of the page posts (no eager loading, no rendering).
+        The ETag changes when a post of the page, any category/tag (renamed) or
+        tag links change. Authors have no modification time, a renamed author
+        is seen on the next change of the page.
+
+        Args:
+            Same as "list_posts".
+
+        Returns:
+            validators: Validators
+
+        Raises:
+            ValueError: cursor is malformed.
+        """
+        related_versions = [
+            select(func.max(Category.updated_at)).scalar_subquery(),
+            select(func.max(Tag.updated_at)).scalar_subquery(),
+            select(func.max(PostTag.id)).scalar_subquery(),
+        ]
+        stmt = self._page_statement(
+            select(
+                Post.id,
+                Post.updated_at,
+                Post.comment_count,
+                Post.tag_count,
+                *related_versions,
+            ),
+            limit=limit,
+            cursor=cursor,
+            category_id=category_id,
+            tag_id=tag_id,
+        )
+        rows = [tuple(row) for row in session.execute(stmt)]
+        return Validators.build(("posts", limit, cursor, category_id, tag_id, rows))
+
+    def detail_validators(self, session: Session, _id: Any) -> Optional[Validators]:
+        """
+        Conditional GET validators of post detail (post, comments, tags, category),
+        in one query. Return None if post does not exist.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            _id: Any. Primary key of post.
+
+        Returns:
+            validators: Optional[Validators]
+        """
+        stmt = select(
+            Post.id,
+            Post.updated_at,
+            Post.comment_count,
+            Post.tag_count,
+            select(func.max(Comment.updated_at))
+            .where(Comment.post_id == Post.id)
+            .scalar_subquery(),
+            select(func.max(Tag.updated_at))
+            .join(PostTag, PostTag.tag_id == Tag.id)
+            .where(PostTag.post_id == Post.id)
+            .scalar_subquery(),
+            select(func.max(PostTag.id))
+            .where(PostTag.post_id == Post.id)
+            .scalar_subquery(),
+            select(Category.updated_at)
+            .where(Category.id == Post.category_id)
+            .scalar_subquery(),
+        ).where(Post.id == _id)
+        row = session.execute(stmt).first()
+        if row is None:
+            return None
+        return Validators.build(("post", tuple(row)))
+
+    def _page_statement(
+        self,
+        stmt: Select,
+        *,
+        limit: int,
+        cursor: Optional[str],
+        category_id: Optional[int],
+        tag_id: Optional[int],
+    ) -> Select:
+        """
+        Add filters, keyset and limit ("limit + 1" rows) of a posts page to stmt.
+
+        Raises:
+            ValueError: cursor is malformed.
+        """
+        columns = [getattr(Post, field) for field in self.cursor_fields]
+        criteria, order_by = keyset_clauses(columns, cursor, self.cursor_descending)
+        stmt = stmt.where(*criteria)
+        if category_id is not None:
+            stmt = stmt.where(Post.category_id == category_id)
+        if tag_id is not None:
+            # (post_id, tag_id) is unique: the join does not duplicate posts.
+            stmt = stmt.join(PostTag, PostTag.post_id == Post.id).where(
+                PostTag.tag_id == tag_id
+            )
+        return stmt.order_by(*order_by).limit(limit + 1)
+
+    def search(
+        self,
+        session: Session,
+        *,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        Full-text search posts, ranked by relevance. Title matches weigh more than
+        short description matches, which weigh more than content matches.
+        The GIN index on "search_vector" finds matches, then the highlighted
+        snippet ("ts_headline", costly) is built only for the returned page.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            query: str. Web search syntax: words, "quoted phrase", OR, -excluded.
+            limit: int. The limit number of results.
+            offset: int. The number of results need to skip.
+
+        Returns:
+            results: list[dict[str, Any]]. Post columns (without content), "rank" and "snippet".
+        """
+        ts_query = func.websearch_to_tsquery(PostModelConfig.SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(Post.search_vector, ts_query).label("rank")
+        matched = (
+            select(Post.id, rank)
+            .where(Post.search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), Post.id.desc())
+            .limit(limit)
+            .offset(offset)
+            .subquery()
+        )
+        snippet = func.ts_headline(
+            PostModelConfig.SEARCH_CONFIG,
+            func.coalesce(Post.content, Post.short_description, ""),
+            ts_query,
+            SNIPPET_OPTIONS,
+        ).label("snippet")
+        stmt = (
+            select(
+                Post.id,
+                Post.title,
+                Post.short_description,
+                Post.author_id,
+                Post.category_id,
+                matched.c.rank,
+                snippet,
+            )
+            .join(matched, Post.id == matched.c.id)
+            .order_by(matched.c.rank.desc(), Post.id.desc())
+        )
+        return [dict(row) for row in session.execute(stmt).mappings()]
+
+
+post_service = PostService(model=Post)
@@ -0,0 +1,146 @@
+"""
+Home page widgets (most commented posts, top tags, posts per category), read from
+rollups (materialized views of app.db.rollups) only: a page view never runs the
+aggregates. "RollupRefresher" refreshes rollups in the background.
+"""
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.rollups import (
+    CATEGORY_ROLLUP,
+    POPULAR_POSTS,
+    ROLLUPS,
+    TAG_ROLLUP,
+    Rollup,
+    refresh_rollup,
+)
+from app.models.rollup import RollupRefresh
+
+logger = logging.getLogger(__name__)
+
+
+class RollupService:
+    """
+    RollupService class. Provide methods reading rollups.
+    """
+
+    def read(self, session: Session, rollup: Rollup, limit: int) -> dict[str, Any]:
+        """
+        Read first rows of rollup (in "rollup.order_by" order, indexed) and its
+        last refresh time.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            rollup: Rollup
+            limit: int. Number of rows.
+
+        Returns:
+            rollup: dict[str, Any]. "items" (row dicts) and "refreshed_at".
+        """
+        stmt = select(rollup.table).order_by(text(rollup.order_by)).limit(limit)
+        items = session.execute(stmt).mappings().all()
+        refreshed_at = session.scalar(
+            select(RollupRefresh.refreshed_at).where(RollupRefresh.name == rollup.name)
+        )
+        return {"items": [dict(item) for item in items], "refreshed_at": refreshed_at}
+
+    def popular_posts(self, session: Session, limit: int = 10) -> dict[str, Any]:
+        """
+        Most commented posts, see "read".
+        """
+        return self.read(session, POPULAR_POSTS, limit)
+
+    def top_tags(self, session: Session, limit: int = 10) -> dict[str, Any]:
+        """
+        Tags with most posts, see "read".
+        """
+        return self.read(session, TAG_ROLLUP, limit)
+
+    def categories(self, session: Session, limit: int = 100) -> dict[str, Any]:
+        """
+        Categories with their number of posts, most posts first, see "read".
+        """
+        return self.read(session, CATEGORY_ROLLUP, limit)
+
+
+class RollupRefresher:
+    """
+    Background thread refreshing rollups every "interval" seconds. Every worker
+    process runs one: a rollup refreshed less than "interval" seconds ago (by
+    any worker) is skipped, see "refresh_rollup".
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ):
+        """
+        Args:
+            interval: float. Seconds between two refreshes of a rollup.
+            session_factory: Optional[Callable[[], Session]]. Sessions of refreshes.
+                None: "SessionLocal" (primary database), created on first refresh.
+        """
+        self.interval = interval
+        self.session_factory = session_factory
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> list[str]:
+        """
+        Refresh stale rollups, one transaction per rollup.
+
+        Returns:
+            names: list[str]. Names of refreshed rollups.
+        """
+        session_factory = self.session_factory or db_session.SessionLocal
+        refreshed = []
+        for rollup in ROLLUPS:
+            with session_factory() as session:
+                if refresh_rollup(session.connection(), rollup, self.interval):
+                    refreshed.append(rollup.name)
+                session.commit()
+        return refreshed
+
+    def start(self) -> None:
+        """
+        Start background refresh thread. Do nothing if it is already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="rollup-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop background refresh thread, after the refresh in progress if any.
+        """
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """
+        Refresh stale rollups on start, then every "interval" seconds.
+        """
+        while not self._stopping.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh rollups, retry later")
+            self._stopping.wait(self.interval)
+
+
+rollup_service = RollupService()
+rollup_refresher = RollupRefresher(interval=settings.ROLLUP_REFRESH_INTERVAL_SECONDS)
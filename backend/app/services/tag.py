@@ -0,0 +1,12 @@
+from app.models.tag import Tag
+from app.schemas.tag import CreateTagSchema, UpdateTagSchema
+from app.services.base import BaseService
+
+
+class TagService(BaseService[Tag, CreateTagSchema, UpdateTagSchema]):
+    """
+    TagService class. Provide methods related to "Tag" model.
+    """
+
+
+tag_service = TagService(model=Tag)
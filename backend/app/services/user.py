@@ -1,12 +1,35 @@
+from collections.abc import Sequence
 from typing import Any, Union
 
-from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import generate_hashed_password, verify_password
+from app.core.cache import object_cache
+from app.core.security import password_hash_executor
+from app.core.token_cache import token_cache
 from app.models.user import User
 from app.schemas.user import CreateUserSchema, UpdateUserSchema
-from app.services.base import BaseService
+from app.services.base import AsyncBaseService, BaseService, to_column_dict
+
+# Fields of cached user snapshot (token_cache) which affect authorization.
+PERMISSION_FIELDS = ("is_active", "is_superuser")
+
+
+def is_permission_changed(db_obj: User, update_data: dict[str, Any]) -> bool:
+    """
+    Check update subject changes permission fields of user or not.
+
+    Args:
+        db_obj: User. User ORM instance (before update).
+        update_data: dict[str, Any]. Update subject.
+
+    Returns:
+        is_changed: bool.
+    """
+    return any(
+        field in update_data and update_data[field] != getattr(db_obj, field)
+        for field in PERMISSION_FIELDS
+    )
 
 
 class UserService(BaseService[User, CreateUserSchema, UpdateUserSchema]):
@@ -43,14 +66,40 @@ class UserService(BaseService[User, CreateUserSchema, UpdateUserSchema]):
         Returns:
             object: User.
         """
-        instance_data = jsonable_encoder(obj_in)
+        instance_data = to_column_dict(obj_in)
 
         password = instance_data.pop("password")
-        hashed_password = generate_hashed_password(password=password)
+        hashed_password = password_hash_executor.hash_password(password)
 
         instance_data["hashed_password"] = hashed_password
         return super().create(session=session, obj_in=instance_data)
 
+    def bulk_create(
+        self,
+        session: Session,
+        *,
+        lst_objs_in: Sequence[Union[CreateUserSchema, dict[str, Any]]],
+    ) -> list[User]:
+        """
+        Bulk create users (bulk user imports).
+        Passwords of all subjects are hashed in batch by password_hash_executor.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            lst_objs_in: Sequence[Union[CreateUserSchema, dict[str, Any]]]. List of user subjects.
+
+        Returns:
+            objects: list[User].
+        """
+        lst_objs_data = [to_column_dict(obj_in) for obj_in in lst_objs_in]
+        lst_with_password = [obj for obj in lst_objs_data if obj.get("password")]
+        hashed_passwords = password_hash_executor.hash_passwords(
+            [obj.pop("password") for obj in lst_with_password]
+        )
+        for obj_data, hashed_password in zip(lst_with_password, hashed_passwords):
+            obj_data["hashed_password"] = hashed_password
+        return super().bulk_create(session=session, lst_objs_in=lst_objs_data)
+
     def update(  # noqa
         self,
         session: Session,
@@ -70,15 +119,31 @@ class UserService(BaseService[User, CreateUserSchema, UpdateUserSchema]):
         Returns:
             instance: User.
         """
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
+        update_data = to_column_dict(obj_in, exclude_unset=True)
         if update_data.get("password"):
-            hashed_password = generate_hashed_password(update_data["password"])
+            hashed_password = password_hash_executor.hash_password(
+                update_data["password"]
+            )
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(session=session, db_obj=db_obj, obj_in=update_data)
+        permission_changed = is_permission_changed(db_obj, update_data)
+        user = super().update(session=session, db_obj=db_obj, obj_in=update_data)
+        if permission_changed:
+            token_cache.evict_user(user.id)
+        return user
+
+    def remove(self, session: Session, *, _id: Any = None, db_obj: User = None) -> None:
+        """
+        Remove user and drop its cached tokens.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            _id: Any. Primary key of user.
+            db_obj: Optional[User]. User ORM instance (optional).
+        """
+        user_id = db_obj.id if db_obj is not None else _id
+        super().remove(session=session, _id=_id, db_obj=db_obj)
+        token_cache.evict_user(user_id)
 
     @staticmethod
     def verify_user_password(user: User, password: str) -> bool:
@@ -92,7 +157,105 @@ class UserService(BaseService[User, CreateUserSchema, UpdateUserSchema]):
         Returns:
             is_valid: bool.
         """
-        return verify_password(password=password, hashed_password=user.hashed_password)
+        return password_hash_executor.verify_password(
+            password=password, hashed_password=user.hashed_password
+        )
+
+
+class AsyncUserService(AsyncBaseService[User, CreateUserSchema, UpdateUserSchema]):
+    """
+    AsyncUserService class. Provide async methods related to "User" model.
+    Password hashing runs in password_hash_executor to avoid blocking the event loop.
+    """
+
+    async def create(
+        self,
+        session: AsyncSession,
+        *,
+        obj_in: Union[CreateUserSchema, dict[str, Any]],
+    ) -> User:
+        """
+        Create user object based on user subject / user input subject.
+        Generate hashed_password from provided password.
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            obj_in: Union[CreateUserSchema, dict[str, Any]]. User subject or input user schema.
+
+        Returns:
+            object: User.
+        """
+        instance_data = to_column_dict(obj_in)
+
+        password = instance_data.pop("password")
+        hashed_password = await password_hash_executor.async_hash_password(password)
+
+        instance_data["hashed_password"] = hashed_password
+        return await super().create(session=session, obj_in=instance_data)
+
+    async def update(  # noqa
+        self,
+        session: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UpdateUserSchema, dict[str, Any]],
+    ) -> User:
+        """
+        Update user instance based on user subject / user input subject.
+        Generate and update hashed_password if input has password.
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            db_obj: User. User ORM instance.
+            obj_in: Union[UpdateUserSchema, dict[str, Any]]. Update user schema / update subject.
+
+        Returns:
+            instance: User.
+        """
+        update_data = to_column_dict(obj_in, exclude_unset=True)
+        if update_data.get("password"):
+            hashed_password = await password_hash_executor.async_hash_password(
+                update_data["password"]
+            )
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        permission_changed = is_permission_changed(db_obj, update_data)
+        user = await super().update(session=session, db_obj=db_obj, obj_in=update_data)
+        if permission_changed:
+            token_cache.evict_user(user.id)
+        return user
+
+    async def remove(
+        self, session: AsyncSession, *, _id: Any = None, db_obj: User = None
+    ) -> None:
+        """
+        Remove user and drop its cached tokens.
+
+        Args:
+            session: AsyncSession. SQLAlchemy ORM AsyncSession.
+            _id: Any. Primary key of user.
+            db_obj: Optional[User]. User ORM instance (optional).
+        """
+        user_id = db_obj.id if db_obj is not None else _id
+        await super().remove(session=session, _id=_id, db_obj=db_obj)
+        token_cache.evict_user(user_id)
+
+    @staticmethod
+    async def verify_user_password(user: User, password: str) -> bool:
+        """
+        Verify "password" is valid for user or not.
+
+        Args:
+            user: User.
+            password: str.
+
+        Returns:
+            is_valid: bool.
+        """
+        return await password_hash_executor.async_verify_password(
+            password=password, hashed_password=user.hashed_password
+        )
 
 
-user_service = UserService(model=User)
+user_service = UserService(model=User, cache=object_cache)
+async_user_service = AsyncUserService(model=User)
@@ -0,0 +1,252 @@
+"""
+Anonymous post votes, counted write-behind.
+
+Every vote is a hot-row update for popular posts, so votes are not written one by
+one: "VoteBuffer" merges increments per post in memory and a background thread
+flushes them with a single upsert every "flush_interval" seconds or after
+"flush_max_events" votes. Buffered votes are lost only if the process is killed
+without a graceful shutdown (at most one flush interval of votes).
+"""
+import logging
+import threading
+from collections.abc import Callable, Mapping
+from contextlib import AbstractContextManager
+from typing import Optional, cast
+
+from sqlalchemy import BigInteger, CursorResult, Integer, column, select, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheBackend, MemoryCacheBackend
+from app.core.config import settings
+from app.db import session as db_session
+from app.models.post import Post
+from app.models.vote import Vote
+from app.schemas.vote import CreateVoteSchema, UpdateVoteSchema
+from app.services.base import BaseService
+
+logger = logging.getLogger(__name__)
+
+
+class VoteService(BaseService[Vote, CreateVoteSchema, UpdateVoteSchema]):
+    """
+    VoteService class. Provide methods related to "Vote" model.
+    """
+
+    def increment_many(
+        self, session: Session, deltas: Mapping[int, int], commit: bool = True
+    ) -> int:
+        """
+        Add vote deltas to counters of posts in one "INSERT ... ON CONFLICT DO UPDATE"
+        statement, then commit. Rows are locked in "post_id" order, concurrent
+        flushes (other workers) cannot deadlock. Deltas of deleted posts are dropped.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            deltas: Mapping[int, int]. Post id -> number of new votes.
+            commit: bool. False: the caller commits.
+
+        Returns:
+            count: int. Number of updated counters.
+        """
+        if not deltas:
+            return 0
+        delta = values(
+            column("post_id", Integer), column("count", BigInteger), name="delta"
+        ).data(sorted(deltas.items()))
+        stmt = insert(Vote).from_select(
+            ["post_id", "count"],
+            select(delta.c.post_id, delta.c.count).join(
+                Post, Post.id == delta.c.post_id
+            ),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Vote.post_id],
+            set_={"count": Vote.count + stmt.excluded["count"]},
+        )
+        # DML statements return a CursorResult
+        result = cast(CursorResult, session.execute(stmt))
+        if commit:
+            session.commit()
+        return result.rowcount
+
+    def get_count(self, session: Session, post_id: int) -> int:
+        """
+        Get flushed vote count of post, 0 if post has no vote yet.
+
+        Args:
+            session: Session. SQLAlchemy ORM Session.
+            post_id: int
+
+        Returns:
+            count: int
+        """
+        count = session.scalar(select(Vote.count).where(Vote.post_id == post_id))
+        return count or 0
+
+
+class VoteBuffer:
+    """
+    In-process write-behind buffer of votes. Thread safe.
+    Every worker process has its own buffer and its own dedup window.
+    """
+
+    def __init__(
+        self,
+        service: VoteService,
+        *,
+        flush_interval: float = 0.5,
+        flush_max_events: int = 1000,
+        dedup: Optional[CacheBackend] = None,
+        session_factory: Optional[Callable[[], AbstractContextManager[Session]]] = None,
+    ):
+        """
+        Args:
+            service: VoteService. Service writing merged deltas.
+            flush_interval: float. Seconds between two flushes of background thread.
+            flush_max_events: int. Number of buffered votes waking up the flush earlier.
+            dedup: Optional[CacheBackend]. Seen (post, client) keys. None: no dedup.
+            session_factory: Optional[Callable[[], AbstractContextManager[Session]]].
+                Sessions of background flushes. None: "SessionLocal", created on
+                first flush.
+        """
+        self.service = service
+        self.flush_interval = flush_interval
+        self.flush_max_events = flush_max_events
+        self.dedup = dedup
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        # Only one flush at a time, flushes of thread and "stop" never interleave.
+        self._flush_lock = threading.Lock()
+        self._deltas: dict[int, int] = {}
+        self._in_flight: dict[int, int] = {}
+        self._events = 0
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, post_id: int, client_id: Optional[str] = None) -> bool:
+        """
+        Buffer one vote of client for post.
+
+        Args:
+            post_id: int
+            client_id: Optional[str]. Identity of voter (e.g. IP address).
+                None: not deduplicated.
+
+        Returns:
+            accepted: bool. False if client already voted for post within dedup window.
+        """
+        with self._lock:
+            if client_id is not None and self.dedup is not None:
+                key = f"vote:{post_id}:{client_id}"
+                if self.dedup.get(key) is not None:
+                    return False
+                self.dedup.set(key, b"1")
+            self._deltas[post_id] = self._deltas.get(post_id, 0) + 1
+            self._events += 1
+            if self._events >= self.flush_max_events:
+                self._wakeup.set()
+        return True
+
+    def pending(self, post_id: int) -> int:
+        """
+        Number of votes of post not committed yet (buffered or being flushed).
+        Flushed votes leave this count when their transaction commits, not later:
+        added to the committed count, they are never counted twice.
+        """
+        with self._lock:
+            return self._deltas.get(post_id, 0) + self._in_flight.get(post_id, 0)
+
+    def flush(self, session: Optional[Session] = None) -> int:
+        """
+        Write buffered votes in one statement. On failure, votes are put back in
+        the buffer and retried by the next flush.
+
+        Args:
+            session: Optional[Session]. None: a session of "session_factory".
+
+        Returns:
+            count: int. Number of flushed votes.
+        """
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._deltas = self._deltas, {}
+                self._in_flight = deltas
+                self._events = 0
+            if not deltas:
+                return 0
+            try:
+                if session is None:
+                    session_factory = self.session_factory or db_session.SessionLocal
+                    with session_factory() as session:
+                        self._write(session, deltas)
+                else:
+                    self._write(session, deltas)
+            except Exception:
+                with self._lock:
+                    self._in_flight = {}
+                    for post_id, delta in deltas.items():
+                        self._deltas[post_id] = self._deltas.get(post_id, 0) + delta
+                        self._events += delta
+                raise
+            return sum(deltas.values())
+
+    def _write(self, session: Session, deltas: dict[int, int]) -> None:
+        """
+        Write deltas, commit and drop them from "_in_flight" in one critical
+        section: "pending" sees them either pending or committed.
+        """
+        self.service.increment_many(session, deltas, commit=False)
+        with self._lock:
+            session.commit()
+            self._in_flight = {}
+
+    def start(self) -> None:
+        """
+        Start background flush thread. Do nothing if it is already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="vote-buffer-flush", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop background flush thread and flush remaining votes (graceful shutdown).
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush buffered votes on shutdown")
+
+    def _run(self) -> None:
+        """
+        Flush every "flush_interval" seconds, or earlier when woken up by "add".
+        """
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush buffered votes, retry later")
+
+
+vote_service = VoteService(model=Vote)
+vote_buffer = VoteBuffer(
+    vote_service,
+    flush_interval=settings.VOTE_FLUSH_INTERVAL_MS / 1000,
+    flush_max_events=settings.VOTE_FLUSH_MAX_EVENTS,
+    dedup=MemoryCacheBackend(
+        max_size=settings.VOTE_DEDUP_MAX_SIZE, ttl=settings.VOTE_DEDUP_TTL_SECONDS
+    ),
+)
@@ -0,0 +1,56 @@
+import json
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.tests.factories.user import user_factory_service
+from app.tests.utils.authentication import force_authentication
+
+
+class TestExport:
+    """
+    Test export/{resource} API. This API limits only superusers.
+    """
+
+    endpoint_url = "/api/v1/export"
+
+    def test_export_users_ndjson_success(
+        self, client: TestClient, superuser: models.User
+    ):
+        """
+        Test export users as NDJSON, without password hash.
+        """
+        with force_authentication(client=client, user=superuser):
+            response = client.get(f"{self.endpoint_url}/users")
+
+        assert response.status_code == status.HTTP_200_OK, response.content
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert {"id": superuser.id, "email": superuser.email}.items() <= rows[0].items()
+        assert "hashed_password" not in rows[0]
+
+    def test_export_users_csv_success(self, client: TestClient, superuser: models.User):
+        """
+        Test export users as CSV.
+        """
+        with force_authentication(client=client, user=superuser):
+            response = client.get(
+                f"{self.endpoint_url}/users", params={"format": "csv"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK, response.content
+        lines = response.text.splitlines()
+        assert lines[0] == "id,name,email,is_active,is_superuser"
+        assert len(lines) == 2
+
+    def test_export_with_normal_user_fail(self, client: TestClient, session: Session):
+        """
+        Test export API with active normal user and expect fail response.
+        """
+        user = user_factory_service.create(session=session, is_active=True)
+        with force_authentication(client=client, user=user):
+            response = client.get(f"{self.endpoint_url}/posts")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -2,7 +2,11 @@ from fastapi import status
 from fastapi.testclient import TestClient
 
 from app import models
-from app.tests.utils.authentication import force_authentication
+from app.core.token_cache import token_cache
+from app.tests.utils.authentication import (
+    force_authentication,
+    get_authentication_headers,
+)
 
 
 class TestPingPublic:
@@ -50,3 +54,48 @@ class TestPingPrivate:
             response = client.get(self.endpoint_url)
 
             assert response.status_code == status.HTTP_200_OK, response.content
+
+    def test_ping_private_with_access_token_success(
+        self,
+        client: TestClient,
+        user: models.User,
+    ):
+        """
+        Test ping_private API with valid access token. Second call hits token cache.
+        """
+        headers = get_authentication_headers(user)
+        hits = token_cache.hits
+
+        response = client.get(self.endpoint_url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK, response.content
+
+        response = client.get(self.endpoint_url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK, response.content
+        assert token_cache.hits == hits + 1
+
+    def test_ping_private_with_invalid_token_fail(self, client: TestClient):
+        """
+        Test ping_private API with invalid access token and expect fail response.
+        """
+        response = client.get(
+            self.endpoint_url, headers={"Authorization": "Bearer invalid-token"}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_ping_private_with_revoked_token_fail(
+        self,
+        client: TestClient,
+        user: models.User,
+    ):
+        """
+        Test ping_private API with revoked access token and expect fail response.
+        """
+        headers = get_authentication_headers(user)
+        response = client.get(self.endpoint_url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK, response.content
+
+        token_cache.revoke(headers["Authorization"].removeprefix("Bearer "))
+        response = client.get(self.endpoint_url, headers=headers)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
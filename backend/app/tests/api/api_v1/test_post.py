@@ -0,0 +1,276 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import services
+from app.core.cache import MemoryCacheBackend
+from app.services.vote import VoteBuffer
+from app.tests.factories.post import post_factory_service
+from app.tests.services.test_post import create_tagged_posts
+from app.tests.utils.queries import query_count
+
+
+class TestSearchPosts:
+    """
+    Test posts/search API. This API is public for all users (include anonymous..)
+    """
+
+    endpoint_url = "/api/v1/posts/search"
+
+    def test_search_posts_with_anonymous_success(
+        self, client: TestClient, session: Session
+    ):
+        """
+        Test search_posts API returns ranked results with snippet.
+        """
+        post = post_factory_service.create(
+            session=session, title="Full-text search with Postgres"
+        )
+
+        response = client.get(self.endpoint_url, params={"q": "postgres search"})
+
+        assert response.status_code == status.HTTP_200_OK, response.content
+        results = response.json()
+        assert [result["id"] for result in results] == [post.id]
+        assert {"rank", "snippet"} <= results[0].keys()
+        assert "content" not in results[0]
+
+    def test_search_posts_without_query_fail(self, client: TestClient):
+        """
+        Test search_posts API without query and expect fail response.
+        """
+        response = client.get(self.endpoint_url, params={"q": ""})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestListPosts:
+    """
+    Test list posts API. This API is public for all users (include anonymous..)
+    """
+
+    endpoint_url = "/api/v1/posts"
+
+    def test_list_posts_with_related_objects(
+        self, client: TestClient, session: Session
+    ):
+        """
+        Test list_posts API returns posts with author, category and tags, paginated.
+        """
+        posts = create_tagged_posts(session, count=3)
+
+        response = client.get(self.endpoint_url, params={"limit": 2})
+
+        assert response.status_code == status.HTTP_200_OK, response.content
+        page = response.json()
+        assert [item["id"] for item in page["items"]] == [posts[2].id, posts[1].id]
+        assert page["items"][0]["author"] == {
+            "id": posts[2].author.id,
+            "name": posts[2].author.name,
+        }
+        assert page["items"][0]["category"]["id"] == posts[2].category_id
+        assert len(page["items"][0]["tags"]) == 2
+        assert page["items"][0]["tag_count"] == 2
+        assert page["items"][0]["comment_count"] == 0
+        assert page["next_cursor"]
+
+    def test_list_posts_filter_by_tag(self, client: TestClient, session: Session):
+        """
+        Test list_posts API filters posts by tag.
+        """
+        posts = create_tagged_posts(session, count=3)
+        tag_id = posts[0].tags[0].id
+
+        response = client.get(self.endpoint_url, params={"tag_id": tag_id})
+
+        assert response.status_code == status.HTTP_200_OK, response.content
+        for item in response.json()["items"]:
+            assert tag_id in [tag["id"] for tag in item["tags"]]
+
+    def test_list_posts_conditional_get(self, client: TestClient, session: Session):
+        """
+        Test list_posts API answers 304 to a fresh ETag, 200 once a post changes.
+        """
+        posts = create_tagged_posts(session, count=2)
+        response = client.get(self.endpoint_url)
+        etag = response.headers["ETag"]
+        assert "Last-Modified" not in response.headers
+
+        not_modified = client.get(self.endpoint_url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+
+        services.post_service.update(
+            session, db_obj=posts[0], obj_in={"title": "New title"}
+        )
+        modified = client.get(self.endpoint_url, headers={"If-None-Match": etag})
+        assert modified.status_code == status.HTTP_200_OK
+        assert modified.headers["ETag"] != etag
+
+    @pytest.mark.parametrize("count", [1, 10])
+    def test_list_posts_query_budget(
+        self, client: TestClient, session: Session, count: int
+    ):
+        """
+        Test list_posts API runs a constant number of queries (validators, posts
+        with author and category, tags), whatever the number of posts.
+        """
+        create_tagged_posts(session, count=count)
+
+        response = client.get(self.endpoint_url)
+        not_modified = client.get(
+            self.endpoint_url, headers={"If-None-Match": response.headers["ETag"]}
+        )
+
+        assert len(response.json()["items"]) == count
+        assert query_count(response) == 3
+        assert query_count(not_modified) == 1
+
+    def test_list_posts_with_invalid_cursor_fail(self, client: TestClient):
+        """
+        Test list_posts API with malformed cursor and expect fail response.
+        """
+        response = client.get(self.endpoint_url, params={"cursor": "invalid"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestRetrievePost:
+    """
+    Test retrieve post API. This API is public for all users (include anonymous..)
+    """
+
+    endpoint_url = "/api/v1/posts/{post_id}"
+
+    def test_retrieve_post_with_comments(self, client: TestClient, session: Session):
+        """
+        Test retrieve_post API returns post with comments.
+        """
+        post = create_tagged_posts(session, count=1)[0]
+        comment = services.comment_service.create(
+            session, obj_in={"comment": "Nice post", "post_id": post.id}
+        )
+
+        response = client.get(self.endpoint_url.format(post_id=post.id))
+
+        assert response.status_code == status.HTTP_200_OK, response.content
+        assert [item["id"] for item in response.json()["comments"]] == [comment.id]
+
+    def test_retrieve_post_conditional_get(self, client: TestClient, session: Session):
+        """
+        Test retrieve_post API answers 304 to a fresh ETag, 200 once a comment is added.
+        """
+        post = create_tagged_posts(session, count=1)[0]
+        url = self.endpoint_url.format(post_id=post.id)
+        etag = client.get(url).headers["ETag"]
+
+        not_modified = client.get(url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+        services.comment_service.create(
+            session, obj_in={"comment": "New comment", "post_id": post.id}
+        )
+        modified = client.get(url, headers={"If-None-Match": etag})
+        assert modified.status_code == status.HTTP_200_OK
+        assert len(modified.json()["comments"]) == 1
+
+    def test_retrieve_post_comment_deleted(self, client: TestClient, session: Session):
+        """
+        Test retrieve_post API sends no Last-Modified and answers 200 once the
+        newest comment is deleted (no "updated_at" moves forward on deletes).
+        """
+        post = create_tagged_posts(session, count=1)[0]
+        comment = services.comment_service.create(
+            session, obj_in={"comment": "Deleted comment", "post_id": post.id}
+        )
+        url = self.endpoint_url.format(post_id=post.id)
+        response = client.get(url)
+        assert "Last-Modified" not in response.headers
+
+        services.comment_service.remove(session, db_obj=comment)
+        modified = client.get(
+            url, headers={"If-Modified-Since": "Fri, 31 Dec 9999 23:59:59 GMT"}
+        )
+        assert modified.status_code == status.HTTP_200_OK
+        assert modified.json()["comments"] == []
+
+    def test_retrieve_post_query_budget(self, client: TestClient, session: Session):
+        """
+        Test retrieve_post API runs a constant number of queries (validators, post
+        with author and category, tags, comments), whatever the number of comments.
+        """
+        post = create_tagged_posts(session, count=1)[0]
+        for i in range(10):
+            services.comment_service.create(
+                session, obj_in={"comment": f"Comment {i}", "post_id": post.id}
+            )
+
+        response = client.get(self.endpoint_url.format(post_id=post.id))
+
+        assert len(response.json()["comments"]) == 10
+        assert query_count(response) == 4
+
+    def test_retrieve_post_not_found(self, client: TestClient):
+        """
+        Test retrieve_post API with unknown post and expect fail response.
+        """
+        response = client.get(self.endpoint_url.format(post_id=0))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestVotePost:
+    """
+    Test post votes API. This API is public for all users (include anonymous..)
+    """
+
+    endpoint_url = "/api/v1/posts/{post_id}/votes"
+
+    @pytest.fixture(autouse=True)
+    def vote_buffer(self, monkeypatch) -> VoteBuffer:
+        """
+        Isolate buffered votes and dedup window of each test.
+        """
+        vote_buffer = VoteBuffer(
+            services.vote_service, dedup=MemoryCacheBackend(max_size=100, ttl=60)
+        )
+        monkeypatch.setattr(services, "vote_buffer", vote_buffer)
+        return vote_buffer
+
+    def test_vote_post_once_per_client(
+        self, client: TestClient, session: Session, vote_buffer: VoteBuffer
+    ):
+        """
+        Test vote_post API accepts the first vote of client only.
+        """
+        post = post_factory_service.create(session=session)
+        url = self.endpoint_url.format(post_id=post.id)
+
+        first = client.post(url)
+        second = client.post(url)
+
+        assert first.status_code == status.HTTP_202_ACCEPTED, first.content
+        assert first.json() == {"accepted": True}
+        assert second.json() == {"accepted": False}
+        assert client.get(url).json() == {"post_id": post.id, "count": 1}
+
+        vote_buffer.flush(session)
+        assert client.get(url).json() == {"post_id": post.id, "count": 1}
+
+    def test_vote_post_unknown_post(
+        self, client: TestClient, session: Session, vote_buffer: VoteBuffer
+    ):
+        """
+        Test vote_post API accepts votes of unknown posts without a query, the
+        flush drops them.
+        """
+        url = self.endpoint_url.format(post_id=0)
+
+        response = client.post(url)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED, response.content
+        assert query_count(response) == 0
+        vote_buffer.flush(session)
+        assert client.get(url).json() == {"post_id": 0, "count": 0}
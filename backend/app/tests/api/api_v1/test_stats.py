@@ -0,0 +1,71 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db.rollups import ROLLUPS, refresh_rollup
+from app.tests.db.test_rollups import create_commented_posts
+from app.tests.utils.queries import query_count
+
+
+def refresh_rollups(session: Session) -> None:
+    """
+    Refresh every rollup in the testing transaction.
+    """
+    for rollup in ROLLUPS:
+        refresh_rollup(session.connection(), rollup)
+
+
+class TestStats:
+    """
+    Test stats APIs (home page widgets). These APIs are public for all users
+    (include anonymous..)
+    """
+
+    endpoint_url = "/api/v1/stats"
+
+    def test_popular_posts_read_rollup(self, client: TestClient, session: Session):
+        """
+        Test popular_posts API returns most commented posts of the last refresh.
+        """
+        posts = create_commented_posts(session)
+        refresh_rollups(session)
+        # Comments after the refresh are not counted until the next one
+        create_commented_posts(session)
+
+        response = client.get(f"{self.endpoint_url}/popular-posts", params={"limit": 3})
+
+        assert response.status_code == status.HTTP_200_OK, response.content
+        body = response.json()
+        assert [item["post_id"] for item in body["items"]] == [
+            posts[1].id,
+            posts[3].id,
+            posts[0].id,
+        ]
+        assert body["items"][0]["comment_count"] == 3
+        assert body["refreshed_at"] is not None
+        assert query_count(response) == 2
+
+    def test_top_tags_and_categories(self, client: TestClient, session: Session):
+        """
+        Test tags and categories APIs return post counts, most posts first.
+        """
+        posts = create_commented_posts(session)
+        refresh_rollups(session)
+
+        tags = client.get(f"{self.endpoint_url}/tags").json()["items"]
+        categories = client.get(f"{self.endpoint_url}/categories").json()["items"]
+
+        assert [tag["post_count"] for tag in tags] == [3, 3, 2]
+        assert {category["category_id"] for category in categories} == {
+            post.category_id for post in posts
+        }
+        assert [category["post_count"] for category in categories] == [2, 2]
+
+    def test_stats_before_first_refresh(self, client: TestClient):
+        """
+        Test APIs return empty rollups without refresh time before any refresh.
+        """
+        response = client.get(f"{self.endpoint_url}/tags")
+
+        assert response.status_code == status.HTTP_200_OK, response.content
+        assert response.json() == {"items": [], "refreshed_at": None}
@@ -3,32 +3,63 @@ import os
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy_utils import create_database, database_exists
+from sqlalchemy.pool import NullPool
 
 from app import models
-from app.core.config import Settings
-from app.core.depends import get_session
+from app.core.config import Settings, settings
+from app.core.depends import get_read_session, get_session
+from app.core.security import get_pwd_context
 from app.db.base import Base
+from app.db.instrumentation import instrument_engine
 from app.main import app
 from app.tests.factories.user import user_factory_service
+from app.tests.utils.database import create_test_database
+
+# Override testing settings. Every pytest-xdist worker ("gw0", "gw1"...) has its
+# own database, cloned from a template holding the schema.
+TESTING_DB = os.environ.get("POSTGRES_TEST_DB", "test_blog")
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+testing_settings = Settings(
+    POSTGRES_DB=f"{TESTING_DB}_{XDIST_WORKER}" if XDIST_WORKER else TESTING_DB
+)
 
-# Override testing settings
-testing_settings = Settings(POSTGRES_DB=os.environ.get("POSTGRES_TEST_DB", "test_blog"))
-
-# Override testing database
-if not database_exists(testing_settings.SQLALCHEMY_DATABASE_URI):
-    create_database(testing_settings.SQLALCHEMY_DATABASE_URI)
+# Setup the database once
+create_test_database(
+    testing_settings.SQLALCHEMY_DATABASE_URI,
+    template_prefix=TESTING_DB,
+    metadata=Base.metadata,
+)
 testing_engine = create_engine(
     testing_settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True
 )
 TestingSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=testing_engine
 )
+# NullPool: connections must not outlive the event loop of the test using them.
+testing_async_engine = create_async_engine(
+    testing_settings.SQLALCHEMY_ASYNC_DATABASE_URI, poolclass=NullPool
+)
+instrument_engine(testing_engine)
+instrument_engine(testing_async_engine.sync_engine)
+# Query budgets of endpoints are asserted on "X-DB-Query-Count" response header
+settings.SQL_STATS_HEADERS = True
+# Fast password hashing, also read from environment by hashing worker processes
+os.environ["PASSWORD_HASH_SCHEME"] = "fast"
+settings.PASSWORD_HASH_SCHEME = "fast"
+get_pwd_context.cache_clear()
 
-# Setup the database once
-Base.metadata.drop_all(bind=testing_engine)
-Base.metadata.create_all(bind=testing_engine)
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """
+    Register "cold_start_budget_ratio" option of pytest.ini.
+    """
+    parser.addini(
+        "cold_start_budget_ratio",
+        "Cold start of the application relative to importing its frameworks.",
+        default="2.0",
+    )
 
 
 @pytest.fixture()
@@ -66,6 +97,35 @@ def session() -> Session:  # type: ignore[misc]
     connection.close()
 
 
+@pytest.fixture()
+def anyio_backend() -> str:
+    """
+    Run async tests (marked with "pytest.mark.anyio") on asyncio only.
+    """
+    return "asyncio"
+
+
+@pytest.fixture()
+async def async_session(anyio_backend) -> AsyncSession:  # type: ignore[misc]
+    """
+    Async version of "session" fixture. The outer transaction is rolled back at
+    the end, commits of application code are turned into SAVEPOINT releases.
+    """
+    async with testing_async_engine.connect() as connection:
+        transaction = await connection.begin()
+        async_session = AsyncSession(
+            bind=connection,
+            autoflush=False,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+
+        yield async_session
+
+        await async_session.close()
+        await transaction.rollback()
+
+
 @pytest.fixture()
 def client(session) -> TestClient:  # type: ignore[misc]
     """
@@ -78,8 +138,10 @@ def client(session) -> TestClient:  # type: ignore[misc]
         yield session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
     yield TestClient(app)
     del app.dependency_overrides[get_session]
+    del app.dependency_overrides[get_read_session]
 
 
 @pytest.fixture()
@@ -95,3 +157,20 @@ def user(session: Session) -> models.User:
     """
     user = user_factory_service.create(session=session)
     return user
+
+
+@pytest.fixture()
+def superuser(session: Session) -> models.User:
+    """
+    Generate an active superuser fixture.
+
+    Args:
+        session: Session. SQLAlchemy ORM session.
+
+    Returns:
+        user: User.
+    """
+    user = user_factory_service.create(
+        session=session, is_active=True, is_superuser=True
+    )
+    return user
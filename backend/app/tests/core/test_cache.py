@@ -0,0 +1,73 @@
+import time
+
+import fakeredis
+import pytest
+
+from app.core.cache import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    create_cache_backend,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request) -> CacheBackend:
+    """
+    Cache backend fixture. "redis" backend runs against fakeredis stand-in.
+    """
+    if request.param == "memory":
+        return MemoryCacheBackend(ttl=60)
+    return RedisCacheBackend(client=fakeredis.FakeRedis(), ttl=60)
+
+
+def test_cache_get_set_delete(cache: CacheBackend):
+    """
+    Test get/set/delete of cache backends.
+    """
+    assert cache.get("key") is None
+
+    cache.set("key", b"value")
+    cache.set("other", b"other")
+    assert cache.get("key") == b"value"
+
+    cache.delete("key", "missing")
+    assert cache.get("key") is None
+    assert cache.get("other") == b"other"
+
+
+def test_cache_expire(cache: CacheBackend):
+    """
+    Test keys expire after ttl.
+    """
+    cache.set("key", b"value", ttl=1)
+    time.sleep(1.1)
+
+    assert cache.get("key") is None
+
+
+def test_memory_cache_lru_eviction():
+    """
+    Test MemoryCacheBackend evicts least recently used key when full.
+    """
+    cache = MemoryCacheBackend(max_size=2)
+    cache.set("key-1", b"1")
+    cache.set("key-2", b"2")
+    cache.get("key-1")
+    cache.set("key-3", b"3")
+
+    assert len(cache) == 2
+    assert cache.get("key-1") == b"1"
+    assert cache.get("key-2") is None
+
+
+def test_create_cache_backend():
+    """
+    Test create_cache_backend by name.
+    """
+    assert create_cache_backend(None, ttl=60, max_size=10) is None
+    assert isinstance(
+        create_cache_backend("memory", ttl=60, max_size=10), MemoryCacheBackend
+    )
+    with pytest.raises(ValueError):
+        create_cache_backend("unknown", ttl=60, max_size=10)
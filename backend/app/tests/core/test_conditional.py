@@ -0,0 +1,71 @@
+from typing import Optional
+
+import pytest
+from fastapi import Request
+
+from app.core.conditional import Validators, is_not_modified
+
+VALIDATORS = Validators.build(["posts", 1])
+
+
+def build_request(if_none_match: Optional[str] = None) -> Request:
+    """
+    Build GET request with conditional headers.
+    """
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+class TestValidators:
+    """
+    Test Validators class.
+    """
+
+    def test_validators_build_stable_weak_etag(self):
+        """
+        Test Validators.build gives the same weak ETag for the same parts only.
+        """
+        assert VALIDATORS.etag.startswith('W/"')
+        assert Validators.build(["posts", 1]).etag == VALIDATORS.etag
+        assert Validators.build(["posts", 2]).etag != VALIDATORS.etag
+
+    def test_validators_headers(self):
+        """
+        Test Validators.headers sends ETag, clients must revalidate.
+        """
+        assert VALIDATORS.headers == {
+            "ETag": VALIDATORS.etag,
+            "Cache-Control": "no-cache",
+        }
+
+
+class TestIsNotModified:
+    """
+    Test is_not_modified function.
+    """
+
+    @pytest.mark.parametrize(
+        "if_none_match, expected",
+        [
+            (VALIDATORS.etag, True),
+            (VALIDATORS.etag[2:], True),
+            (f'"other", {VALIDATORS.etag}', True),
+            ("*", True),
+            ('W/"other"', False),
+        ],
+    )
+    def test_is_not_modified_if_none_match(self, if_none_match: str, expected: bool):
+        """
+        Test If-None-Match uses weak comparison and supports lists and "*".
+        """
+        request = build_request(if_none_match=if_none_match)
+
+        assert is_not_modified(request, VALIDATORS) is expected
+
+    def test_is_not_modified_without_if_none_match(self):
+        """
+        Test requests without If-None-Match are never answered 304.
+        """
+        assert not is_not_modified(build_request(), VALIDATORS)
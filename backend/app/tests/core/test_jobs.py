@@ -0,0 +1,138 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.jobs import JobQueue, JobQueueFullError
+
+pytestmark = pytest.mark.anyio
+
+
+class Recorder:
+    """
+    Job handler recording batches, failing its first "failures" calls.
+    """
+
+    def __init__(self, failures: int = 0):
+        self.batches: list[list] = []
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self, payloads: list) -> None:
+        """
+        Record batch of payloads.
+        """
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("handler failure")
+        self.batches.append(payloads)
+
+    @property
+    def payloads(self) -> list:
+        """
+        Recorded payloads of all batches.
+        """
+        return [payload for batch in self.batches for payload in batch]
+
+
+class TestJobQueue:
+    """
+    Test in-process background job queue.
+    """
+
+    async def test_jobs_are_batched_and_drained_on_stop(self):
+        """
+        Test jobs queued together are handled in batches, all before stop returns.
+        """
+        queue = JobQueue()
+        recorder = Recorder()
+        queue.register("notify", recorder, batch_size=4, batch_wait=0.05)
+        await queue.start()
+        for i in range(10):
+            await queue.enqueue("notify", i)
+        await queue.stop()
+
+        assert sorted(recorder.payloads) == list(range(10))
+        assert [len(batch) for batch in recorder.batches] == [4, 4, 2]
+        assert queue.job_types["notify"].processed == 10
+
+    async def test_failed_batches_are_retried_then_dropped(self):
+        """
+        Test a failing batch is retried with backoff, and dropped after max_attempts.
+        """
+        queue = JobQueue()
+        flaky, broken = Recorder(failures=2), Recorder(failures=10)
+        options = {"batch_wait": 0, "max_attempts": 3, "retry_backoff": 0.001}
+        queue.register("flaky", flaky, **options)
+        queue.register("broken", broken, **options)
+        await queue.start()
+        await queue.enqueue("flaky", "a")
+        await queue.enqueue("broken", "b")
+        await queue.stop()
+
+        assert (flaky.calls, flaky.payloads) == (3, ["a"])
+        assert (broken.calls, broken.payloads) == (3, [])
+        assert queue.job_types["broken"].failed == 1
+
+    async def test_backpressure_when_queue_is_full(self):
+        """
+        Test enqueue waits for free space, submit fails after put_timeout.
+        """
+        queue = JobQueue(max_pending=2, put_timeout=0.05)
+        release = asyncio.Event()
+        handled = []
+
+        async def blocked(payloads: list) -> None:
+            await release.wait()
+            handled.extend(payloads)
+
+        queue.register("blocked", blocked, batch_size=1, batch_wait=0)
+        await queue.start()
+        await queue.enqueue("blocked", 1)
+        await queue.enqueue("blocked", 2)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.enqueue("blocked", 3), 0.05)
+        with pytest.raises(JobQueueFullError):
+            queue.submit("blocked", 3)
+        with pytest.raises(JobQueueFullError):
+            await asyncio.to_thread(queue.submit, "blocked", 3)
+
+        waiting = asyncio.create_task(queue.enqueue("blocked", 4))
+        release.set()
+        await waiting
+        await queue.stop()
+        assert handled == [1, 2, 4]
+
+    async def test_submit_from_sync_code(self):
+        """
+        Test sync handlers run in a thread, jobs are submitted from any thread.
+        """
+        queue = JobQueue()
+        threads = set()
+        handled = []
+
+        def handler(payloads: list) -> None:
+            threads.add(threading.get_ident())
+            handled.extend(payloads)
+
+        queue.register("sync", handler, batch_wait=0)
+        await queue.start()
+        queue.submit("sync", "from loop")
+        await asyncio.to_thread(queue.submit, "sync", "from thread")
+        await queue.stop()
+
+        assert sorted(handled) == ["from loop", "from thread"]
+        assert threading.get_ident() not in threads
+
+    def test_jobs_are_handled_inline_when_not_started(self):
+        """
+        Test jobs are handled by the caller before start (tests, scripts).
+        """
+        queue = JobQueue()
+        recorder = Recorder()
+        queue.register("notify", recorder)
+
+        queue.submit("notify", 1)
+
+        assert recorder.batches == [[1]]
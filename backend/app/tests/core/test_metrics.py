@@ -0,0 +1,228 @@
+import os
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry, Sample, merge_snapshots
+from app.db import session as db_session
+
+
+def build_client(registry: MetricsRegistry) -> TestClient:
+    """
+    Build test client of an app recorded in registry, with "/items/{item_id}"
+    and "/fail".
+    """
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):  # noqa
+        return {"id": item_id}
+
+    @app.get("/fail")
+    def fail():  # noqa
+        raise RuntimeError("fail")
+
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestMetricsRegistry:
+    """
+    Test MetricsRegistry class.
+    """
+
+    def test_render_histogram(self):
+        """
+        Test histogram buckets are cumulative with "+Inf", sum and count.
+        """
+        registry = MetricsRegistry(latency_buckets=[0.1, 1.0], size_buckets=[10])
+        registry.observe("GET", "/items/{item_id}", "200", 0.05, 5)
+        registry.observe("GET", "/items/{item_id}", "200", 0.5, 50)
+        registry.observe("GET", "/items/{item_id}", "404", 2.0, 50)
+
+        lines = registry.render_latest().splitlines()
+
+        labels = 'method="GET",route="/items/{item_id}"'
+        assert f'http_requests_total{{{labels},status="200"}} 2' in lines
+        assert f'http_requests_total{{{labels},status="404"}} 1' in lines
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in lines
+        assert f'http_request_duration_seconds_bucket{{{labels},le="1.0"}} 2' in lines
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+        assert f"http_request_duration_seconds_sum{{{labels}}} 2.55" in lines
+        assert f"http_request_duration_seconds_count{{{labels}}} 3" in lines
+        assert f'http_response_size_bytes_bucket{{{labels},le="10"}} 1' in lines
+        assert "http_requests_in_progress 0" in lines
+
+    def test_render_collector_samples(self):
+        """
+        Test samples of registered collectors are rendered with their type.
+        """
+        registry = MetricsRegistry()
+        registry.register_collector(
+            lambda: [
+                Sample("pool_size", "gauge", "Pool size.", {"pool": "sync"}, 5),
+                Sample("checkouts_total", "counter", "Checkouts.", {}, 10),
+            ]
+        )
+
+        lines = registry.render_latest().splitlines()
+
+        assert "# TYPE pool_size gauge" in lines
+        assert 'pool_size{pool="sync"} 5' in lines
+        assert "# TYPE checkouts_total counter" in lines
+        assert "checkouts_total 10" in lines
+
+    def test_escape_label_values(self):
+        """
+        Test double quotes and backslashes of label values are escaped.
+        """
+        registry = MetricsRegistry()
+        registry.observe("GET", 'a"b\\c', "200", 0.01, 0)
+
+        assert 'route="a\\"b\\\\c"' in registry.render_latest()
+
+    def test_multiprocess_directory(self, tmp_path):
+        """
+        Test registries sharing a directory render the sum of all workers.
+        """
+        other_worker = MetricsRegistry(directory=str(tmp_path))
+        for _ in range(3):
+            other_worker.observe("GET", "/", "200", 0.01, 10)
+        other_worker.in_progress = 1
+        other_worker.write_snapshot()
+        # Workers are different processes, each writes "<pid>.json"
+        os.rename(tmp_path / f"{os.getpid()}.json", tmp_path / "other.json")
+        registry = MetricsRegistry(directory=str(tmp_path))
+        registry.observe("GET", "/", "200", 0.01, 10)
+
+        lines = registry.render_latest().splitlines()
+
+        assert 'http_requests_total{method="GET",route="/",status="200"} 4' in lines
+        assert 'http_request_duration_seconds_count{method="GET",route="/"} 4' in lines
+        assert "http_requests_in_progress 1" in lines
+
+    def test_mark_process_dead(self, tmp_path):
+        """
+        Test snapshots of exited workers are merged into one file, keeping their
+        counters but not their gauges.
+        """
+        registry = MetricsRegistry(directory=str(tmp_path))
+        registry.register_collector(
+            lambda: [
+                Sample("pool_size", "gauge", "Pool size.", {}, 5),
+                Sample("checkouts_total", "counter", "Checkouts.", {}, 10),
+            ]
+        )
+        registry.observe("GET", "/", "200", 0.01, 10)
+        registry.in_progress = 1
+        for pid in (2**30, 2**30 + 1):
+            registry.write_snapshot()
+            os.rename(tmp_path / f"{os.getpid()}.json", tmp_path / f"{pid}.json")
+            registry.mark_process_dead(pid)
+
+        assert os.listdir(tmp_path) == ["exited.json"]
+        lines = MetricsRegistry(directory=str(tmp_path)).render_latest().splitlines()
+        assert 'http_requests_total{method="GET",route="/",status="200"} 2' in lines
+        assert "http_requests_in_progress 0" in lines
+        assert "checkouts_total 20" in lines
+        assert not any(line.startswith("pool_size") for line in lines)
+
+
+def test_merge_snapshots_ignore_in_progress_of_exited_workers():
+    """
+    Test counters of exited workers are kept, their in-progress gauge is not.
+    """
+    running: dict[str, Any] = {
+        "pid": os.getpid(),
+        "in_progress": 2,
+        "requests": [["GET", "/", "200", 1]],
+        "latency": [["GET", "/", 1, 0, 0.01]],
+        "size": [],
+        "samples": [
+            ["pool_size", "gauge", "Pool size.", {"pool": "sync"}, 5],
+            ["checkouts_total", "counter", "Checkouts.", {}, 10],
+        ],
+    }
+    # Pid numbers are bounded by pid_max (at most 2 ** 22)
+    exited = {**running, "pid": 2**30, "in_progress": 5}
+
+    merged = merge_snapshots([running, exited])
+
+    assert merged["in_progress"] == 2
+    assert merged["requests"] == [["GET", "/", "200", 2]]
+    assert merged["latency"] == [["GET", "/", 2, 0, 0.02]]
+    assert merged["samples"] == [
+        ["pool_size", "gauge", "Pool size.", {"pool": "sync"}, 5],
+        ["checkouts_total", "counter", "Checkouts.", {}, 20],
+    ]
+
+
+class TestMetricsMiddleware:
+    """
+    Test MetricsMiddleware class.
+    """
+
+    @pytest.mark.parametrize(
+        "path, route, status_code",
+        [
+            ("/items/1", "/items/{item_id}", 200),
+            ("/items/x", "/items/{item_id}", 422),
+            ("/missing/1", "<unmatched>", 404),
+            ("/fail", "/fail", 500),
+        ],
+    )
+    def test_record_route_template(self, path: str, route: str, status_code: int):
+        """
+        Test requests are labeled by route template and response status.
+        """
+        registry = MetricsRegistry()
+        client = build_client(registry)
+
+        response = client.get(path)
+
+        assert response.status_code == status_code
+        assert registry.snapshot()["requests"] == [["GET", route, str(status_code), 1]]
+
+    def test_record_response_size(self):
+        """
+        Test response body size is recorded.
+        """
+        registry = MetricsRegistry(size_buckets=[1, 100])
+        client = build_client(registry)
+
+        response = client.get("/items/1")
+
+        [[method, route, *size_series]] = registry.snapshot()["size"]
+        assert size_series == [0, 1, 0, len(response.content)]
+
+    def test_unknown_method(self):
+        """
+        Test unknown methods are labeled "OTHER".
+        """
+        registry = MetricsRegistry()
+        client = build_client(registry)
+
+        client.request("PURGE", "/items/1")
+
+        assert registry.snapshot()["requests"][0][0] == "OTHER"
+
+
+def test_metrics_endpoint(client: TestClient):
+    """
+    Test /metrics renders recorded requests and pools of created engines in
+    Prometheus text format.
+    """
+    db_session.engine  # created on first access
+    client.get("/api/v1/ping/public")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_requests_total{method="GET",route="/api/v1/ping/public",status="200"}'
+        in response.text
+    )
+    assert 'db_pool_checkouts_total{pool="sync"}' in response.text
@@ -0,0 +1,123 @@
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from app import models
+from app.core.config import RateLimitRule
+from app.core.rate_limit import RateLimitMiddleware, TokenBucketStore, compile_path
+from app.tests.utils.authentication import get_authentication_headers
+
+
+def build_client(*rules: RateLimitRule) -> TestClient:
+    """
+    Build test client of an app limited by rules, with "/limited/{id}" and "/free".
+    """
+    app = FastAPI()
+
+    @app.api_route("/limited/{item_id}", methods=["GET", "POST"])
+    def limited(item_id: int):  # noqa
+        return {"id": item_id}
+
+    @app.get("/free")
+    def free():  # noqa
+        return {}
+
+    app.add_middleware(RateLimitMiddleware, rules=rules, store=TokenBucketStore())
+    return TestClient(app)
+
+
+class TestTokenBucketStore:
+    """
+    Test TokenBucketStore class.
+    """
+
+    def test_consume_burst_then_refill(self):
+        """
+        Test bucket allows "burst" requests, then refills at "rate" per second.
+        """
+        store = TokenBucketStore(shards=4)
+
+        results = [store.consume("key", rate=2, burst=3, now=100.0) for _ in range(4)]
+        assert results[:3] == [0.0, 0.0, 0.0]
+        assert results[3] == pytest.approx(0.5)
+
+        assert store.consume("key", rate=2, burst=3, now=100.5) == 0.0
+        assert store.consume("other", rate=2, burst=3, now=100.5) == 0.0
+
+    def test_sweep_evict_full_buckets_only(self):
+        """
+        Test sweep evicts idle buckets once they are full again.
+        """
+        store = TokenBucketStore(shards=1)
+        store.consume("idle", rate=1, burst=2, now=100.0)
+        store.consume("busy", rate=1, burst=2, now=100.0)
+        store.consume("busy", rate=1, burst=2, now=100.0)
+
+        assert store.sweep(now=101.0) == 1
+        assert len(store) == 1
+        assert store.sweep(now=102.0) == 1
+        assert len(store) == 0
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/api/v1/posts/1/votes", True),
+        ("/api/v1/posts/1/votes/", True),
+        ("/api/v1/posts/1/2/votes", False),
+        ("/api/v1/posts/votes", False),
+    ],
+)
+def test_compile_path(path: str, expected: bool):
+    """
+    Test path template parameters match exactly one segment.
+    """
+    pattern = compile_path("/api/v1/posts/{post_id}/votes")
+
+    assert bool(pattern.fullmatch(path)) is expected
+
+
+class TestRateLimitMiddleware:
+    """
+    Test RateLimitMiddleware class.
+    """
+
+    def test_reject_over_limit_with_retry_after(self):
+        """
+        Test requests over the limit get 429 with Retry-After, other routes are free.
+        """
+        client = build_client(RateLimitRule(path="/limited/{item_id}", rate=1, burst=2))
+
+        statuses = [client.get("/limited/1").status_code for _ in range(3)]
+        rejected = client.get("/limited/2")
+
+        assert statuses == [200, 200, 429]
+        assert rejected.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert rejected.headers["Retry-After"] == "1"
+        assert client.get("/free").status_code == status.HTTP_200_OK
+
+    def test_rule_method(self):
+        """
+        Test rule applies to its method only.
+        """
+        client = build_client(
+            RateLimitRule(method="POST", path="/limited/{item_id}", rate=1, burst=1)
+        )
+
+        assert client.post("/limited/1").status_code == status.HTTP_200_OK
+        assert client.post("/limited/1").status_code == 429
+        assert client.get("/limited/1").status_code == status.HTTP_200_OK
+
+    def test_user_key(self, user: models.User):
+        """
+        Test "user" key gives a bucket per authenticated user, IP for anonymous.
+        """
+        client = build_client(
+            RateLimitRule(path="/limited/{item_id}", rate=1, burst=1, key="user")
+        )
+        headers = get_authentication_headers(user)
+
+        assert client.get("/limited/1", headers=headers).status_code == 200
+        assert client.get("/limited/1", headers=headers).status_code == 429
+        assert client.get("/limited/1").status_code == status.HTTP_200_OK
+        assert client.get("/limited/1").status_code == 429
@@ -1,7 +1,26 @@
-from app.core.security import generate_hashed_password, verify_password
+import time
+
+import pytest
+
+from app.core.security import (
+    PasswordHashExecutor,
+    PasswordHashQueueFullError,
+    generate_hashed_password,
+    verify_password,
+)
 from app.tests.factories.utils import faker
 
 
+@pytest.fixture()
+def executor() -> PasswordHashExecutor:  # type: ignore[misc]
+    """
+    Password hash executor with one worker process.
+    """
+    executor = PasswordHashExecutor(max_workers=1, max_pending=1)
+    yield executor
+    executor.shutdown()
+
+
 def test_generate_hashed_password_success():
     """
     Test generate_hashed_password successfully.
@@ -37,3 +56,70 @@ def test_verify_password_with_invalid_password():
         password=invalid_password, hashed_password=hashed_password
     )
     assert not is_valid
+
+
+def test_executor_hash_and_verify_password_success(executor: PasswordHashExecutor):
+    """
+    Test PasswordHashExecutor hash/verify password in worker process.
+    """
+    password = faker.password()
+    hashed_password = executor.hash_password(password)
+
+    assert verify_password(password=password, hashed_password=hashed_password)
+    assert executor.verify_password(password, hashed_password)
+    assert not executor.verify_password(faker.password(), hashed_password)
+
+
+@pytest.mark.anyio
+async def test_executor_async_hash_and_verify_password_success(
+    executor: PasswordHashExecutor,
+):
+    """
+    Test PasswordHashExecutor async wrappers.
+    """
+    password = faker.password()
+    hashed_password = await executor.async_hash_password(password)
+
+    assert await executor.async_verify_password(password, hashed_password)
+
+
+def test_executor_hash_passwords_keep_order():
+    """
+    Test batch hash API returns hashed passwords in input order.
+    """
+    executor = PasswordHashExecutor(max_workers=2, max_pending=1)
+    passwords = [faker.password() for _ in range(5)]
+    try:
+        hashed_passwords = executor.hash_passwords(passwords, chunk_size=2)
+    finally:
+        executor.shutdown()
+
+    assert len(hashed_passwords) == len(passwords)
+    for password, hashed_password in zip(passwords, hashed_passwords):
+        assert verify_password(password=password, hashed_password=hashed_password)
+
+
+def test_executor_reject_when_queue_full(executor: PasswordHashExecutor):
+    """
+    Test PasswordHashExecutor reject new job immediately when queue is full.
+    """
+    future = executor.submit(time.sleep, 0.5)
+
+    with pytest.raises(PasswordHashQueueFullError):
+        executor.hash_password(faker.password())
+
+    future.result()
+    # slot is released by a done callback, right after the result is set
+    time.sleep(0.1)
+    assert executor.hash_password(faker.password())
+
+
+def test_executor_inline_mode():
+    """
+    Test PasswordHashExecutor with max_workers=0 hashes in calling thread.
+    """
+    executor = PasswordHashExecutor(max_workers=0)
+    password = faker.password()
+
+    assert executor.verify_password(password, executor.hash_password(password))
+    assert executor._executor is None
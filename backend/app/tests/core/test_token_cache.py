@@ -0,0 +1,149 @@
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import services
+from app.core.cache import MemoryCacheBackend
+from app.core.token_cache import TokenCache, token_cache
+from app.schemas.user import InDBUserSchema
+from app.tests.factories.user import user_factory_service
+
+
+def make_user_snapshot(user_id: int = 1) -> InDBUserSchema:
+    """
+    Generate user snapshot subject.
+    """
+    return InDBUserSchema(id=user_id, name="name", email="name@example.com")
+
+
+class TestTokenCache:
+    """
+    Test TokenCache functions.
+    """
+
+    def test_get_set_with_hit_miss_counters(self):
+        """
+        Test cached entry is returned and counters are updated.
+        """
+        cache = TokenCache()
+        claims = {"sub": "1", "exp": time.time() + 60}
+
+        assert cache.get("token") is None
+        cache.set("token", claims=claims, user=make_user_snapshot())
+        entry = cache.get("token")
+
+        assert entry.claims == claims
+        assert entry.user.id == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_entry_expire_at_token_exp(self):
+        """
+        Test entry expires at "exp" claim of token even if ttl is longer.
+        """
+        cache = TokenCache(ttl=3600)
+        cache.set("token", claims={"exp": time.time() - 1}, user=make_user_snapshot())
+
+        assert cache.get("token") is None
+        assert cache.stats()["size"] == 0
+
+    def test_lru_eviction(self):
+        """
+        Test least recently used entry is evicted when cache is full.
+        """
+        cache = TokenCache(max_size=2)
+        claims = {"exp": time.time() + 60}
+        cache.set("token-1", claims=claims, user=make_user_snapshot(1))
+        cache.set("token-2", claims=claims, user=make_user_snapshot(2))
+        cache.get("token-1")
+        cache.set("token-3", claims=claims, user=make_user_snapshot(3))
+
+        assert cache.get("token-1")
+        assert cache.get("token-2") is None
+        assert cache.get("token-3")
+
+    def test_peek_without_side_effect(self):
+        """
+        Test peek returns live entries without changing counters or LRU order.
+        """
+        cache = TokenCache(max_size=2)
+        claims = {"exp": time.time() + 60}
+        cache.set("token-1", claims=claims, user=make_user_snapshot(1))
+        cache.set("token-2", claims=claims, user=make_user_snapshot(2))
+        cache.set("expired", claims={"exp": time.time() - 1}, user=make_user_snapshot())
+
+        assert cache.peek("token-2").user.id == 2
+        assert cache.peek("expired") is None
+        assert cache.peek("missing") is None
+        assert cache.stats() == {"hits": 0, "misses": 0, "size": 2}
+        # "token-2" is still the least recently used entry
+        cache.set("token-3", claims=claims, user=make_user_snapshot(3))
+        assert cache.peek("token-2") is None
+        assert cache.peek("expired") is None
+
+    def test_revoke_and_evict_user(self):
+        """
+        Test revoke token and evict all entries of user.
+        """
+        cache = TokenCache()
+        claims = {"exp": time.time() + 60}
+        cache.set("token-1", claims=claims, user=make_user_snapshot(1))
+        cache.set("token-2", claims=claims, user=make_user_snapshot(1))
+
+        cache.revoke("token-1", exp=claims["exp"])
+        assert cache.is_revoked("token-1")
+        assert cache.get("token-1") is None
+        assert cache.get("token-2")
+
+        cache.evict_user(1)
+        assert cache.get("token-2") is None
+        assert not cache.is_revoked("token-2")
+
+    def test_revocations_shared_by_workers(self):
+        """
+        Test tokens revoked and users evicted by a worker are dropped by the
+        others sharing the revocation store.
+        """
+        revocations = MemoryCacheBackend()
+        worker, other_worker = TokenCache(revocations=revocations), TokenCache(
+            revocations=revocations
+        )
+        claims = {"exp": time.time() + 60}
+        other_worker.set("token-1", claims=claims, user=make_user_snapshot(1))
+        other_worker.set("token-2", claims=claims, user=make_user_snapshot(2))
+
+        worker.revoke("token-1", exp=claims["exp"])
+        worker.evict_user(2)
+
+        assert other_worker.is_revoked("token-1")
+        assert other_worker.get("token-2") is None
+        # Snapshots read after the eviction are cached again
+        other_worker.set("token-2", claims=claims, user=make_user_snapshot(2))
+        assert other_worker.get("token-2")
+
+    def test_disabled_cache(self):
+        """
+        Test disabled cache does not store entries.
+        """
+        cache = TokenCache(enabled=False)
+        cache.set("token", claims={"exp": time.time() + 60}, user=make_user_snapshot())
+
+        assert cache.get("token") is None
+
+
+@pytest.mark.parametrize("field", ["is_active", "is_superuser"])
+def test_user_service_update_permission_evict_user(session: Session, field: str):
+    """
+    Test UserService.update evicts cached tokens when permission fields change.
+    """
+    user = user_factory_service.create(session=session)
+    snapshot = InDBUserSchema.from_orm(user)
+    token_cache.set("token", claims={"exp": time.time() + 60}, user=snapshot)
+
+    services.user_service.update(session, db_obj=user, obj_in={"name": "new name"})
+    assert token_cache.get("token")
+
+    services.user_service.update(
+        session, db_obj=user, obj_in={field: not getattr(user, field)}
+    )
+    assert token_cache.get("token") is None
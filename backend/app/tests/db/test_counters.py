@@ -0,0 +1,99 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import services
+from app.db.base_class import Base
+from app.db.counters import reconcile_counters
+from app.tests.factories.post import post_factory_service
+from app.tests.factories.taxonomy import tag_factory_service
+
+
+def refresh(session: Session, *objs: Base) -> None:
+    """
+    Reload counters written by triggers.
+    """
+    for obj in objs:
+        session.refresh(obj)
+
+
+class TestCounterTriggers:
+    """
+    Test denormalized counters maintained by database triggers.
+    """
+
+    def test_comment_count_follow_comments(self, session: Session):
+        """
+        Test post.comment_count on insert (ORM and COPY), move and delete of comments.
+        """
+        post, other = (post_factory_service.create(session=session) for _ in "ab")
+        comment = services.comment_service.create(
+            session, obj_in={"comment": "first", "post_id": post.id}
+        )
+        services.comment_service.bulk_copy(
+            session,
+            objs_in=[{"comment": f"bulk {i}", "post_id": post.id} for i in range(5)],
+        )
+        session.commit()
+        refresh(session, post)
+        assert post.comment_count == 6
+
+        services.comment_service.update(
+            session, db_obj=comment, obj_in={"post_id": other.id}
+        )
+        refresh(session, post, other)
+        assert (post.comment_count, other.comment_count) == (5, 1)
+
+        services.comment_service.remove(session, db_obj=comment)
+        refresh(session, other)
+        assert other.comment_count == 0
+
+    def test_tag_counts_follow_posttag(self, session: Session):
+        """
+        Test post.tag_count and tag.post_count when tags are linked/unlinked.
+        """
+        post, other = (post_factory_service.create(session=session) for _ in "ab")
+        python, fastapi = (tag_factory_service.create(session=session) for _ in "ab")
+
+        post.tags = [python, fastapi]
+        other.tags = [python]
+        session.commit()
+        refresh(session, post, other, python, fastapi)
+        assert (post.tag_count, other.tag_count) == (2, 1)
+        assert (python.post_count, fastapi.post_count) == (2, 1)
+
+        post.tags.remove(python)
+        session.commit()
+        refresh(session, post, python)
+        assert (post.tag_count, python.post_count) == (1, 1)
+
+
+class TestReconcileCounters:
+    """
+    Test reconcile_counters function.
+    """
+
+    def test_reconcile_counters_repair_drift(self, session: Session):
+        """
+        Test reconcile_counters rewrites wrong counters only.
+        """
+        post = post_factory_service.create(session=session)
+        tag = tag_factory_service.create(session=session)
+        post.tags = [tag]
+        services.comment_service.create(
+            session, obj_in={"comment": "comment", "post_id": post.id}
+        )
+        session.execute(
+            text("UPDATE post SET comment_count = 42, tag_count = 0 WHERE id = :id"),
+            {"id": post.id},
+        )
+
+        repaired = reconcile_counters(session.connection())
+
+        assert repaired == {
+            "post.comment_count": 1,
+            "post.tag_count": 1,
+            "tag.post_count": 0,
+        }
+        refresh(session, post)
+        assert (post.comment_count, post.tag_count) == (1, 1)
+        assert set(reconcile_counters(session.connection()).values()) == {0}
@@ -0,0 +1,135 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import exc, select, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db import instrumentation
+from app.db.instrumentation import QueryStatsMiddleware, track_queries
+from app.tests.factories.post import post_factory_service
+from app.tests.utils.queries import query_count
+
+
+class TestTrackQueries:
+    """
+    Test track_queries and engine instrumentation.
+    """
+
+    def test_count_statements(self, session: Session):
+        """
+        Test statements are counted and timed, repeated statements reported.
+        """
+        post_ids = [post_factory_service.create(session=session).id for _ in range(3)]
+
+        with track_queries("test") as stats:
+            for post_id in post_ids:
+                session.execute(select(models.Post).where(models.Post.id == post_id))
+            session.execute(text("SELECT 1"))
+
+        assert stats.count == 4
+        assert stats.duration > 0
+        assert list(stats.repeated.values()) == [3]
+
+    def test_failed_statement_leaves_nothing(self, session: Session):
+        """
+        Test failed statements are not recorded and leave nothing on their
+        (pooled) connection.
+        """
+        connection = session.connection()
+        info = dict(connection.info)
+
+        with track_queries() as stats:
+            with pytest.raises(exc.ProgrammingError):
+                with session.begin_nested():
+                    session.execute(text("SELECT * FROM no_such_table"))
+            session.execute(text("SELECT 1"))
+
+        assert stats.count == 1
+        assert connection.info == info
+
+    def test_outside_tracking(self, session: Session):
+        """
+        Test statements executed out of track_queries are not recorded.
+        """
+        with track_queries() as stats:
+            pass
+        session.execute(text("SELECT 1"))
+
+        assert stats.count == 0
+
+    def test_warn_n_plus_one(
+        self, session: Session, monkeypatch, caplog: pytest.LogCaptureFixture
+    ):
+        """
+        Test a warning is logged once a statement is repeated up to the threshold.
+        """
+        monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+
+        with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+            with track_queries("GET /posts"):
+                for i in range(5):
+                    session.execute(text("SELECT :i"), {"i": i})
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "Possible N+1 queries in GET /posts, statement executed 3 times: SELECT %(i)s"
+        ]
+
+    def test_log_slow_query_with_plan(
+        self, session: Session, monkeypatch, caplog: pytest.LogCaptureFixture
+    ):
+        """
+        Test slow statements are logged with parameters and EXPLAIN plan.
+        """
+        # Plan of a tiny table depends on its statistics (autovacuum), pin it
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0)
+
+        with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+            session.execute(
+                select(models.Post.id).where(models.Post.title == "slow")
+            ).all()
+
+        [message] = [record.getMessage() for record in caplog.records]
+        assert message.startswith("Slow query")
+        assert "Parameters: {'title_1': 'slow'}" in message
+        assert "Plan:\nIndex Scan using post_title_key on post" in message
+
+    def test_failing_explain_keeps_transaction(
+        self, session: Session, monkeypatch, caplog: pytest.LogCaptureFixture
+    ):
+        """
+        Test a failing EXPLAIN is logged and leaves the transaction usable.
+        """
+        monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0)
+        monkeypatch.setattr(instrumentation, "EXPLAIN", "EXPLAIN (NO_SUCH_OPTION)")
+
+        with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+            session.execute(text("SELECT 1"))
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages[0] == "Failed to explain slow query"
+        assert messages[1].endswith("Plan:\nNone")
+        assert session.execute(text("SELECT 2")).scalar() == 2
+
+
+def test_query_stats_middleware_headers(session: Session):
+    """
+    Test middleware sends query count and DB time of request in headers.
+    """
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():  # noqa
+        session.execute(text("SELECT 1"))
+        session.execute(text("SELECT 2"))
+        return {}
+
+    app.add_middleware(QueryStatsMiddleware)
+    response = TestClient(app).get("/items")
+
+    assert query_count(response) == 2
+    assert response.headers["Server-Timing"].startswith("db;dur=")
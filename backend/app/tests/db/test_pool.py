@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from app.db.pool import InstrumentedQueuePool, install_idle_ping, pool_samples
+from app.tests.conftest import testing_engine, testing_settings
+
+
+@pytest.fixture()
+def engine() -> Engine:  # type: ignore[misc]
+    """
+    Engine with an instrumented pool of a single connection.
+    """
+    engine = create_engine(
+        testing_settings.SQLALCHEMY_DATABASE_URI,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestInstrumentedQueuePool:
+    """
+    Test InstrumentedQueuePool class and pool_samples.
+    """
+
+    def test_count_checkouts_and_timeouts(self, engine: Engine):
+        """
+        Test checkouts and timeouts of a full pool are counted.
+        """
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+            samples = {
+                sample.name: sample.value for sample in pool_samples(engine, "test")
+            }
+        with engine.connect():
+            pass
+
+        assert samples["db_pool_size"] == 1
+        assert samples["db_pool_checked_out"] == 1
+        assert samples["db_pool_checkout_timeouts_total"] == 1
+        assert samples["db_pool_checkout_wait_seconds_total"] >= 0.1
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        assert engine.pool.stats.checkouts == 2
+
+    def test_dispose_keep_stats(self, engine: Engine):
+        """
+        Test statistics survive engine.dispose (pool recreated).
+        """
+        with engine.connect():
+            pass
+
+        engine.dispose()
+
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        assert engine.pool.stats.checkouts == 1
+
+    def test_null_pool_without_samples(self):
+        """
+        Test pools without statistics (NullPool) publish no samples.
+        """
+        null_engine = create_engine(
+            testing_settings.SQLALCHEMY_DATABASE_URI, poolclass=NullPool
+        )
+
+        assert pool_samples(null_engine, "test") == []
+
+
+def test_idle_ping_replace_dropped_connection(engine: Engine):
+    """
+    Test idle connections are pinged on checkout and replaced when dropped.
+    """
+    install_idle_ping(engine, interval=0)
+    with engine.connect() as connection:
+        pid = connection.execute(text("SELECT pg_backend_pid()")).scalar()
+    with testing_engine.connect() as connection:
+        connection.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+
+    with engine.connect() as connection:
+        new_pid = connection.execute(text("SELECT pg_backend_pid()")).scalar()
+
+    assert new_pid != pid
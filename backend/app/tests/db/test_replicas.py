@@ -0,0 +1,190 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from sqlalchemy_utils import create_database, database_exists
+
+from app.core import depends
+from app.core.cache import MemoryCacheBackend
+from app.core.config import Settings
+from app.db import session as db_session
+from app.db.replicas import (
+    ReadYourWritesMiddleware,
+    RecentWriters,
+    ReplicaSet,
+    client_key,
+)
+from app.tests.conftest import TestingSessionLocal, testing_engine, testing_settings
+
+# Second database standing for a replica: routing tests only need to tell
+# which database served a session, not replication.
+replica_settings = Settings(POSTGRES_DB=f"{testing_settings.POSTGRES_DB}_replica")
+
+
+def current_database(session: Session) -> str:
+    """
+    Name of database of session.
+    """
+    return session.execute(text("SELECT current_database()")).scalar()
+
+
+@pytest.fixture(scope="module")
+def replica_engine() -> Engine:  # type: ignore[misc]
+    """
+    Engine of the replica database.
+    """
+    if not database_exists(replica_settings.SQLALCHEMY_DATABASE_URI):
+        create_database(replica_settings.SQLALCHEMY_DATABASE_URI)
+    engine = create_engine(replica_settings.SQLALCHEMY_DATABASE_URI)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def down_engine() -> Engine:
+    """
+    Engine of a replica refusing connections.
+    """
+    url = make_url(replica_settings.SQLALCHEMY_DATABASE_URI).set(port=1)
+    return create_engine(url)
+
+
+class TestReplicaSet:
+    """
+    Test ReplicaSet class.
+    """
+
+    def test_round_robin(self, replica_engine: Engine):
+        """
+        Test sessions are spread over replicas in turn.
+        """
+        other_engine = create_engine(replica_settings.SQLALCHEMY_DATABASE_URI)
+        replica_set = ReplicaSet(
+            [replica_engine, other_engine], primary=TestingSessionLocal
+        )
+
+        binds = []
+        for _ in range(4):
+            with replica_set.session() as session:
+                binds.append(session.get_bind())
+
+        assert binds == [replica_engine, other_engine, replica_engine, other_engine]
+        other_engine.dispose()
+
+    def test_eject_replica_failing_to_connect(
+        self, replica_engine: Engine, down_engine: Engine
+    ):
+        """
+        Test a replica refusing connections is ejected, the next one serves the session.
+        """
+        replica_set = ReplicaSet(
+            [down_engine, replica_engine], primary=TestingSessionLocal
+        )
+
+        sessions = [replica_set.session() for _ in range(2)]
+
+        assert [current_database(session) for session in sessions] == [
+            replica_settings.POSTGRES_DB
+        ] * 2
+        assert replica_set.candidates() == [replica_engine]
+        for session in sessions:
+            session.close()
+
+    def test_retry_ejected_replica(self, down_engine: Engine):
+        """
+        Test an ejected replica is tried again after "eject_seconds".
+        """
+        replica_set = ReplicaSet([down_engine], primary=TestingSessionLocal)
+        replica_set.eject(down_engine)
+
+        assert replica_set.candidates() == []
+        assert replica_set.candidates(now=10**9) == [down_engine]
+
+    def test_fallback_to_primary(self, down_engine: Engine):
+        """
+        Test the primary serves sessions when no replica is healthy.
+        """
+        replica_set = ReplicaSet([down_engine], primary=TestingSessionLocal)
+
+        with replica_set.session() as session:
+            assert current_database(session) == testing_settings.POSTGRES_DB
+
+    def test_eject_on_disconnect(self):
+        """
+        Test a replica whose connection drops during a statement is ejected.
+        """
+        engine = create_engine(replica_settings.SQLALCHEMY_DATABASE_URI)
+        replica_set = ReplicaSet([engine], primary=TestingSessionLocal)
+        session = replica_set.session()
+        pid = session.execute(text("SELECT pg_backend_pid()")).scalar()
+        with testing_engine.connect() as connection:
+            connection.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+
+        with pytest.raises(exc.OperationalError):
+            session.execute(text("SELECT 1"))
+
+        assert replica_set.candidates() == []
+        session.close()
+        engine.dispose()
+
+
+def test_read_your_writes(replica_engine: Engine, monkeypatch):
+    """
+    Test reads go to a replica, except for clients which wrote recently.
+    """
+    writers = RecentWriters(MemoryCacheBackend(), window=60)
+    monkeypatch.setattr(depends, "recent_writers", writers)
+    monkeypatch.setattr(db_session, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(
+        db_session,
+        "replica_set",
+        ReplicaSet([replica_engine], primary=TestingSessionLocal),
+    )
+    app = FastAPI()
+
+    @app.get("/database")
+    def read(session: Session = Depends(depends.get_read_session)):  # noqa
+        return current_database(session)
+
+    @app.post("/write")
+    def write():  # noqa
+        return {}
+
+    app.add_middleware(ReadYourWritesMiddleware, writers=writers)
+    client = TestClient(app)
+    writer = {"Authorization": "Bearer writer"}
+    reader = {"Authorization": "Bearer reader"}
+
+    assert (
+        client.get("/database", headers=writer).json() == replica_settings.POSTGRES_DB
+    )
+    client.post("/write", headers=writer)
+
+    assert (
+        client.get("/database", headers=writer).json() == testing_settings.POSTGRES_DB
+    )
+    assert (
+        client.get("/database", headers=reader).json() == replica_settings.POSTGRES_DB
+    )
+
+
+def test_writer_marked_when_response_starts():
+    """
+    Test client is a recent writer as soon as the response starts, before the
+    body is sent.
+    """
+    writers = RecentWriters(MemoryCacheBackend(), window=60)
+    key = client_key({"headers": [(b"authorization", b"Bearer writer")]})
+    seen = []
+
+    async def write(scope, receive, send):  # noqa
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        seen.append(key in writers)
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    client = TestClient(ReadYourWritesMiddleware(write, writers=writers))
+    client.post("/write", headers={"Authorization": "Bearer writer"})
+
+    assert seen == [True]
@@ -0,0 +1,112 @@
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.db.rollups import (
+    POPULAR_POSTS,
+    REFRESH_LOCK_KEY,
+    ROLLUPS,
+    TAG_ROLLUP,
+    refresh_rollup,
+)
+from app.services import rollup_service
+from app.services.rollup import RollupRefresher
+from app.tests.conftest import testing_engine
+from app.tests.factories.comment import comment_factory_service
+from app.tests.services.test_post import create_tagged_posts
+
+
+def create_commented_posts(session: Session) -> list:
+    """
+    Create 4 tagged posts, commented 1, 3, 0 and 2 times.
+    """
+    posts = create_tagged_posts(session, 4)
+    for post, comments in zip(posts, (1, 3, 0, 2)):
+        for _ in range(comments):
+            comment_factory_service.create(session=session, post_id=post.id)
+    return posts
+
+
+class TestRefreshRollup:
+    """
+    Test refreshes of rollups (materialized views).
+    """
+
+    def test_refreshed_rollups_match_live_aggregates(self, session: Session):
+        """
+        Test rows of refreshed rollups are the rows of their live query.
+        """
+        posts = create_commented_posts(session)
+        connection = session.connection()
+        for rollup in ROLLUPS:
+            assert refresh_rollup(connection, rollup)
+            live = connection.execute(
+                text(
+                    f"SELECT * FROM ({rollup.query}) AS live ORDER BY {rollup.order_by}"
+                )
+            )
+            stored = connection.execute(
+                select(rollup.table).order_by(text(rollup.order_by))
+            )
+            assert live.mappings().all() == stored.mappings().all()
+
+        popular = rollup_service.popular_posts(session, limit=2)
+        assert [item["post_id"] for item in popular["items"]] == [
+            posts[1].id,
+            posts[3].id,
+        ]
+        assert popular["refreshed_at"] is not None
+
+    def test_popular_posts_ranked_by_comment_count(self, session: Session):
+        """
+        Test popular posts are commented posts, most commented first.
+        """
+        posts = create_commented_posts(session)
+
+        assert refresh_rollup(session.connection(), POPULAR_POSTS)
+
+        popular = rollup_service.popular_posts(session, limit=10)
+        assert [
+            (item["post_id"], item["comment_count"]) for item in popular["items"]
+        ] == [(posts[1].id, 3), (posts[3].id, 2), (posts[0].id, 1)]
+
+    def test_refresh_skip_fresh_rollup(self, session: Session):
+        """
+        Test a rollup refreshed less than "max_age_seconds" ago is not refreshed.
+        """
+        connection = session.connection()
+        assert refresh_rollup(connection, TAG_ROLLUP, max_age_seconds=60)
+        assert not refresh_rollup(connection, TAG_ROLLUP, max_age_seconds=60)
+        assert refresh_rollup(connection, TAG_ROLLUP, max_age_seconds=0)
+
+    def test_refresh_skip_rollup_refreshed_by_other_process(self, session: Session):
+        """
+        Test a rollup is not refreshed while another connection holds its lock.
+        """
+        with testing_engine.connect() as other:
+            other.execute(
+                text("SELECT pg_advisory_xact_lock(:key, :index)"),
+                {"key": REFRESH_LOCK_KEY, "index": ROLLUPS.index(POPULAR_POSTS)},
+            )
+            assert not refresh_rollup(session.connection(), POPULAR_POSTS)
+            other.rollback()
+        assert refresh_rollup(session.connection(), POPULAR_POSTS)
+
+
+class TestRollupRefresher:
+    """
+    Test background refresher of rollups.
+    """
+
+    def test_refresh_stale_rollups_once_per_interval(self, session: Session):
+        """
+        Test refresher refreshes every rollup, then none within its interval.
+        """
+        connection = session.connection()
+        refresher = RollupRefresher(
+            interval=60,
+            session_factory=lambda: Session(
+                bind=connection, join_transaction_mode="create_savepoint"
+            ),
+        )
+        assert refresher.refresh() == [rollup.name for rollup in ROLLUPS]
+        assert refresher.refresh() == []
@@ -0,0 +1,127 @@
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import generate_hashed_password
+from app.db.counters import reconcile_counters
+from app.db.seed import (
+    SeedConfig,
+    SeedPlan,
+    finalize,
+    parse_args,
+    post_rows,
+    reserve_ids,
+    taxonomy_rows,
+    user_rows,
+    write_rows,
+)
+from app.services import post_service, user_service
+
+CONFIG = SeedConfig(
+    users=50, categories=3, tags=20, posts=300, comments_per_post=1.5, chunk_size=100
+)
+
+
+def make_plan(session: Session, passwords: tuple[str, ...] = ("x",)) -> SeedPlan:
+    """
+    Seed plan of CONFIG after the rows of the testing database.
+    """
+    return SeedPlan(
+        config=CONFIG,
+        first_ids=reserve_ids(session.connection()),
+        hashed_passwords=passwords,
+        end_time=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+class TestSeed:
+    """
+    Test generation and bulk writing of seeded datasets.
+    """
+
+    def test_chunks_are_deterministic(self, session: Session):
+        """
+        Test a chunk is generated the same from the same seed, chunks differ.
+        """
+        plan = make_plan(session)
+        assert post_rows(plan, 1) == post_rows(plan, 1)
+        assert user_rows(plan, 0) == user_rows(plan, 0)
+        first, second = post_rows(plan, 0)["post"], post_rows(plan, 1)["post"]
+        assert [post["id"] for post in second] == [
+            plan.first_ids["post"] + i for i in range(100, 200)
+        ]
+        assert {post["title"] for post in first}.isdisjoint(
+            post["title"] for post in second
+        )
+
+    def test_distributions(self, session: Session):
+        """
+        Test tags per post are bounded and most popular tags follow Zipf ranks.
+        """
+        plan = make_plan(session)
+        rows = [post_rows(plan, chunk) for chunk in range(plan.chunks(CONFIG.posts))]
+        post_tags = [link for chunk in rows for link in chunk["posttag"]]
+        tag_counts = Counter(link["tag_id"] for link in post_tags)
+
+        assert tag_counts.most_common(1)[0][0] == plan.first_ids["tag"]
+        assert tag_counts[plan.first_ids["tag"]] > 3 * tag_counts.get(
+            plan.first_ids["tag"] + CONFIG.tags - 1, 0
+        )
+        for chunk in rows:
+            for post in chunk["post"]:
+                assert 0 <= post["tag_count"] <= CONFIG.max_tags_per_post
+
+    def test_write_seeded_dataset(self, session: Session):
+        """
+        Test seeded rows are consistent: counters, sequences and passwords.
+        """
+        plan = make_plan(session, passwords=(generate_hashed_password("secret"),))
+        connection = session.connection()
+        write_rows(connection, taxonomy_rows(plan))
+        for chunk in range(plan.chunks(CONFIG.users)):
+            write_rows(connection, user_rows(plan, chunk))
+        for chunk in range(plan.chunks(CONFIG.posts)):
+            write_rows(connection, post_rows(plan, chunk))
+
+        repaired = finalize(connection, plan)
+        assert repaired["post.comment_count"] == repaired["post.tag_count"] == 0
+        assert repaired["tag.post_count"] > 0
+        assert set(reconcile_counters(connection).values()) == {0}
+
+        assert session.scalar(select(func.count(models.Post.id))) >= CONFIG.posts
+        user = user_service.get(session, _id=plan.first_ids["user"])
+        assert user_service.verify_user_password(user, "secret")
+        # Sequences moved past seeded ids
+        post = post_service.create(session, obj_in={"title": "after seeding"})
+        assert post.id >= plan.first_ids["post"] + CONFIG.posts
+
+    def test_write_without_replica_role(self, session: Session):
+        """
+        Test rows written with triggers on get consistent counters once finalized.
+        """
+        plan = make_plan(session)
+        connection = session.connection()
+        write_rows(connection, taxonomy_rows(plan), replica_role=False)
+        write_rows(connection, user_rows(plan, 0), replica_role=False)
+        write_rows(connection, post_rows(plan, 0), replica_role=False)
+
+        finalize(connection, plan)
+        assert set(reconcile_counters(connection).values()) == {0}
+
+        post = post_service.get(session, _id=plan.first_ids["post"])
+        assert post.comment_count == session.scalar(
+            select(func.count(models.Comment.id)).where(
+                models.Comment.post_id == post.id
+            )
+        )
+
+
+def test_parse_no_replica_role():
+    """
+    Test "--no-replica-role" turns the replica role off, it is on by default.
+    """
+    assert parse_args([]).replica_role is True
+    assert parse_args(["--no-replica-role"]).replica_role is False
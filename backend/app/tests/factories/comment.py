@@ -0,0 +1,37 @@
+import factory
+from sqlalchemy.orm import Session
+
+from app.models.comment import Comment, CommentModelConfig
+from app.schemas.comment import CreateCommentSchema
+from app.services import comment_service
+from app.tests.factories.base import BaseModelFactoryService
+from app.tests.factories.utils import faker
+
+
+class CommentFactory(factory.DictFactory):
+    """
+    Base Factory for "Comment" model.
+    """
+
+    comment = factory.LazyAttribute(
+        lambda _: faker.sentence()[: CommentModelConfig.COMMENT_MAX_LENGTH]
+    )
+
+
+class CommentFactoryService(BaseModelFactoryService[CommentFactory]):
+    """
+    Service class provide methods (CRUD..) related to "Comment" in testing.
+    """
+
+    def create(self, session: Session, **kwargs) -> Comment:
+        """
+        Generate subject from CommentFactory and create comment by comment_service.create method.
+        "post_id" is required.
+        """
+        comment_data = self.factory_model.build(**kwargs)
+        return comment_service.create(
+            session=session, obj_in=CreateCommentSchema(**comment_data)
+        )
+
+
+comment_factory_service = CommentFactoryService(factory_model=CommentFactory)
@@ -0,0 +1,41 @@
+import factory
+from sqlalchemy.orm import Session
+
+from app.models.post import Post, PostModelConfig
+from app.schemas.post import CreatePostSchema
+from app.services import post_service
+from app.tests.factories.base import BaseModelFactoryService
+from app.tests.factories.utils import faker
+
+
+class PostFactory(factory.DictFactory):
+    """
+    Base Factory for "Post" model.
+    """
+
+    title = factory.LazyAttribute(
+        lambda _: faker.unique.sentence()[: PostModelConfig.TITLE_MAX_LENGTH]
+    )
+    short_description = factory.LazyAttribute(
+        lambda _: faker.sentence()[: PostModelConfig.SHORT_DES_MAX_LENGTH]
+    )
+    content = factory.Faker(provider="paragraph", nb_sentences=5)
+
+
+class PostFactoryService(BaseModelFactoryService[PostFactory]):
+    """
+    Service class provide methods (CRUD..) related to "Post" in testing.
+    """
+
+    def create(self, session: Session, **kwargs) -> Post:
+        """
+        Generate subject from PostFactory and create post by post_service.create method.
+        """
+        post_data = self.factory_model.build(**kwargs)
+        create_post_schema = CreatePostSchema(**post_data)
+
+        post = post_service.create(session=session, obj_in=create_post_schema)
+        return post
+
+
+post_factory_service = PostFactoryService(factory_model=PostFactory)
@@ -0,0 +1,62 @@
+import factory
+from sqlalchemy.orm import Session
+
+from app.models.category import Category, CategoryModelConfig
+from app.models.tag import Tag, TagModelConfig
+from app.schemas.category import CreateCategorySchema
+from app.schemas.tag import CreateTagSchema
+from app.services import category_service, tag_service
+from app.tests.factories.base import BaseModelFactoryService
+from app.tests.factories.utils import faker
+
+
+class CategoryFactory(factory.DictFactory):
+    """
+    Base Factory for "Category" model.
+    """
+
+    name = factory.LazyAttribute(
+        lambda _: faker.unique.word()[: CategoryModelConfig.NAME_MAX_LENGTH]
+    )
+
+
+class TagFactory(factory.DictFactory):
+    """
+    Base Factory for "Tag" model.
+    """
+
+    name = factory.LazyAttribute(
+        lambda _: faker.unique.word()[: TagModelConfig.NAME_MAX_LENGTH]
+    )
+
+
+class CategoryFactoryService(BaseModelFactoryService[CategoryFactory]):
+    """
+    Service class provide methods (CRUD..) related to "Category" in testing.
+    """
+
+    def create(self, session: Session, **kwargs) -> Category:
+        """
+        Generate subject from CategoryFactory and create category by category_service.create method.
+        """
+        category_data = self.factory_model.build(**kwargs)
+        return category_service.create(
+            session=session, obj_in=CreateCategorySchema(**category_data)
+        )
+
+
+class TagFactoryService(BaseModelFactoryService[TagFactory]):
+    """
+    Service class provide methods (CRUD..) related to "Tag" in testing.
+    """
+
+    def create(self, session: Session, **kwargs) -> Tag:
+        """
+        Generate subject from TagFactory and create tag by tag_service.create method.
+        """
+        tag_data = self.factory_model.build(**kwargs)
+        return tag_service.create(session=session, obj_in=CreateTagSchema(**tag_data))
+
+
+category_factory_service = CategoryFactoryService(factory_model=CategoryFactory)
+tag_factory_service = TagFactoryService(factory_model=TagFactory)
@@ -1,9 +1,10 @@
 import factory
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.user import User, UserModelConfig
 from app.schemas.user import CreateUserSchema
-from app.services import user_service
+from app.services import async_user_service, user_service
 from app.tests.factories.base import BaseModelFactoryService
 from app.tests.factories.utils import faker, faker_email
 
@@ -44,5 +45,17 @@ class UserFactoryService(BaseModelFactoryService[UserFactory]):
         user = user_service.create(session=session, obj_in=create_user_schema)
         return user
 
+    async def async_create(self, session: AsyncSession, **kwargs) -> User:
+        """
+        Generate subject from UserFactory and create user by async_user_service.create method.
+        """
+        user_data = self.factory_model.build(**kwargs)
+        create_user_schema = CreateUserSchema(**user_data)
+
+        user = await async_user_service.create(
+            session=session, obj_in=create_user_schema
+        )
+        return user
+
 
 user_factory_service = UserFactoryService(factory_model=UserFactory)
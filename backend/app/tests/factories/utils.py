@@ -1,3 +1,5 @@
+import re
+
 from faker import Faker
 
 faker = Faker()
@@ -16,7 +18,8 @@ def faker_email(name: str, length: int = None, domain: str = "example.com"):
         email: str
     """
     email_domain = f"@{domain}"
-    clean_name = name.lower().replace(" ", "_")
+    # Keep letters/digits only: "Mr. John Smith Jr." -> "mr_john_smith_jr"
+    clean_name = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
     if length:
         assert length > len(email_domain), (
             f"'length' parameter has to be greater than length of 'domain': "
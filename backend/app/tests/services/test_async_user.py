@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import services
+from app.core.security import verify_password
+from app.schemas.user import CreateUserSchema, UpdateUserSchema
+from app.tests.factories.user import UserFactory, user_factory_service
+
+pytestmark = pytest.mark.anyio
+
+
+class TestAsyncUserService:
+    """
+    Test AsyncUserService functions.
+
+    Short Terms:
+        AUS: AsyncUserService.
+    """
+
+    async def test_aus_create_with_create_schema_success(
+        self, async_session: AsyncSession
+    ):
+        """
+        Test AUS.create with create schema successfully.
+        """
+        user_data = UserFactory.build()
+        user_in = CreateUserSchema(**user_data)
+        user = await services.async_user_service.create(async_session, obj_in=user_in)
+
+        assert user.id
+        assert user.name == user_in.name
+        assert user.email == user_in.email
+        assert verify_password(
+            password=user_in.password, hashed_password=user.hashed_password
+        )
+
+    async def test_aus_get_success(self, async_session: AsyncSession):
+        """
+        Test AUS.get with existed and not existed id.
+        """
+        user = await user_factory_service.async_create(session=async_session)
+
+        db_user = await services.async_user_service.get(async_session, _id=user.id)
+        assert db_user
+        assert db_user.email == user.email
+
+        assert await services.async_user_service.get(async_session, _id=999) is None
+
+    async def test_aus_get_multi_success(self, async_session: AsyncSession):
+        """
+        Test AUS.get_multi with limit/offset.
+        """
+        for _ in range(3):
+            await user_factory_service.async_create(session=async_session)
+
+        users = await services.async_user_service.get_multi(async_session, limit=2)
+        assert len(users) == 2
+
+        users = await services.async_user_service.get_multi(
+            async_session, limit=2, offset=2
+        )
+        assert len(users) == 1
+
+    async def test_aus_bulk_create_success(self, async_session: AsyncSession):
+        """
+        Test AUS.bulk_create successfully.
+        """
+        lst_user_data = []
+        for _ in range(3):
+            user_data = UserFactory.build()
+            user_data["hashed_password"] = user_data.pop("password")
+            lst_user_data.append(user_data)
+
+        await services.async_user_service.bulk_create(
+            async_session, lst_objs_in=lst_user_data
+        )
+
+        users = await services.async_user_service.get_multi(async_session)
+        assert {user.email for user in users} == {
+            user_data["email"] for user_data in lst_user_data
+        }
+
+    async def test_aus_update_with_update_schema_success(
+        self, async_session: AsyncSession
+    ):
+        """
+        Test AUS.update with update schema successfully.
+        """
+        user = await user_factory_service.async_create(session=async_session)
+
+        user_update_schema = UpdateUserSchema(**UserFactory.build())
+        update_user = await services.async_user_service.update(
+            async_session, db_obj=user, obj_in=user_update_schema
+        )
+
+        assert update_user.id == user.id
+        db_user = await services.async_user_service.get(async_session, _id=user.id)
+        assert db_user.name == user_update_schema.name
+        assert db_user.email == user_update_schema.email
+        assert await services.async_user_service.verify_user_password(
+            user=db_user, password=user_update_schema.password
+        )
+
+    async def test_aus_remove_with_valid_id_success(self, async_session: AsyncSession):
+        """
+        Test AUS.remove with valid id success.
+        """
+        user = await user_factory_service.async_create(session=async_session)
+
+        await services.async_user_service.remove(async_session, _id=user.id)
+
+        assert await services.async_user_service.get(async_session, _id=user.id) is None
+
+    async def test_aus_remove_with_invalid_id(self, async_session: AsyncSession):
+        """
+        Test AUS.remove with invalid id.
+        """
+        with pytest.raises(NoResultFound):
+            await services.async_user_service.remove(async_session, _id=999)
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app import services
+from app.services.base import to_column_dict
+from app.tests.factories.post import post_factory_service
+
+
+class EventSchema(BaseModel):
+    """
+    Schema with a non JSON native field.
+    """
+
+    name: str
+    starts_at: Optional[datetime] = None
+
+
+class TestToColumnDict:
+    """
+    Test to_column_dict function.
+    """
+
+    def test_to_column_dict_keep_python_types(self):
+        """
+        Test to_column_dict keeps datetime (no JSON conversion).
+        """
+        starts_at = datetime(2023, 3, 10, 9, 30)
+
+        obj_data = to_column_dict(EventSchema(name="launch", starts_at=starts_at))
+
+        assert obj_data == {"name": "launch", "starts_at": starts_at}
+
+    def test_to_column_dict_exclude_unset(self):
+        """
+        Test to_column_dict skips unset fields of schema, copies dict subjects.
+        """
+        subject = {"name": "launch"}
+
+        assert to_column_dict(EventSchema(name="launch"), exclude_unset=True) == subject
+        assert to_column_dict(subject) is not subject
+
+
+class TestTimestamps:
+    """
+    Test created_at / updated_at maintained by BaseService.
+    """
+
+    def test_update_refresh_updated_at_on_change_only(self, session: Session):
+        """
+        Test BaseService.update refreshes updated_at only when a value changes.
+        """
+        post = post_factory_service.create(session=session)
+        created_at, updated_at = post.created_at, post.updated_at
+
+        services.post_service.update(session, db_obj=post, obj_in={"title": post.title})
+        assert post.updated_at == updated_at
+
+        services.post_service.update(session, db_obj=post, obj_in={"title": "Changed"})
+        assert post.updated_at > updated_at
+        assert post.created_at == created_at
+
+    def test_bulk_insert_upsert_refresh_updated_at(self, session: Session):
+        """
+        Test upsert of BaseService.bulk_insert refreshes updated_at.
+        """
+        post = post_factory_service.create(session=session)
+        updated_at = post.updated_at
+
+        services.post_service.bulk_insert(
+            session,
+            objs_in=[{"title": post.title, "content": "new"}],
+            conflict_columns=["title"],
+            update_fields=["content"],
+        )
+        session.refresh(post)
+
+        assert post.updated_at > updated_at
@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.post import Post
+from app.models.tag import Tag
+from app.schemas.post import CreatePostSchema, UpdatePostSchema
+from app.schemas.tag import CreateTagSchema, UpdateTagSchema
+from app.services.base import BaseService
+
+tag_service: BaseService[Tag, CreateTagSchema, UpdateTagSchema] = BaseService(model=Tag)
+post_service: BaseService[Post, CreatePostSchema, UpdatePostSchema] = BaseService(
+    model=Post
+)
+
+
+def generate_tags(names: list[str]):
+    """
+    Generate tag subjects lazily.
+    """
+    for name in names:
+        yield {"name": name}
+
+
+class TestBulkInsert:
+    """
+    Test BaseService.bulk_insert function.
+    """
+
+    def test_bulk_insert_return_ids(self, session: Session):
+        """
+        Test bulk_insert consumes generator in chunks and returns ids.
+        """
+        names = [f"tag-{i}" for i in range(25)]
+
+        ids = tag_service.bulk_insert(
+            session, objs_in=generate_tags(names), chunk_size=10
+        )
+
+        assert len(ids) == len(names)
+        tags = session.query(Tag).filter(Tag.id.in_(ids)).all()
+        assert sorted(tag.name for tag in tags) == sorted(names)
+
+    def test_bulk_insert_on_conflict_do_nothing(self, session: Session):
+        """
+        Test bulk_insert skips conflicting rows.
+        """
+        tag_service.bulk_insert(session, objs_in=generate_tags(["python"]))
+
+        ids = tag_service.bulk_insert(
+            session,
+            objs_in=generate_tags(["python", "fastapi"]),
+            conflict_columns=["name"],
+        )
+
+        assert len(ids) == 1
+        assert (
+            session.query(Tag).filter(Tag.name.in_(["python", "fastapi"])).count() == 2
+        )
+
+    def test_bulk_insert_on_conflict_do_update(self, session: Session):
+        """
+        Test bulk_insert updates conflicting rows (upsert).
+        """
+        post_service.bulk_insert(
+            session, objs_in=[{"title": "title", "content": "old"}]
+        )
+
+        ids = post_service.bulk_insert(
+            session,
+            objs_in=[{"title": "title", "content": "new"}],
+            conflict_columns=["title"],
+            update_fields=["content"],
+        )
+
+        post = session.query(Post).filter(Post.id == ids[0]).one()
+        assert post.content == "new"
+
+
+class TestBulkCopy:
+    """
+    Test BaseService.bulk_copy function.
+    """
+
+    @pytest.mark.parametrize(
+        "content", ["plain", "tab\tnew line\nbackslash\\N", "", None]
+    )
+    def test_bulk_copy_escape_values(self, session: Session, content):
+        """
+        Test bulk_copy keeps special characters, empty string and NULL.
+        """
+        count = post_service.bulk_copy(
+            session,
+            objs_in=[{"title": f"title-{i}", "content": content} for i in range(3)],
+            chunk_size=2,
+        )
+
+        assert count == 3
+        posts = session.query(Post).filter(Post.title.like("title-%")).all()
+        assert [post.content for post in posts] == [content] * 3
+
+    def test_bulk_copy_upsert(self, session: Session):
+        """
+        Test bulk_copy with conflict columns goes through staging table.
+        """
+        post_service.bulk_copy(session, objs_in=[{"title": "title", "content": "old"}])
+
+        count = post_service.bulk_copy(
+            session,
+            objs_in=[
+                {"title": "title", "content": "new"},
+                {"title": "other", "content": "other"},
+            ],
+            conflict_columns=["title"],
+            update_fields=["content"],
+        )
+
+        assert count == 2
+        contents = {
+            post.title: post.content
+            for post in session.query(Post).filter(Post.title.in_(["title", "other"]))
+        }
+        assert contents == {"title": "new", "other": "other"}
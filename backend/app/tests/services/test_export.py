@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app import services
+from app.services.export import iter_csv, iter_ndjson
+from app.tests.factories.user import user_factory_service
+
+
+def test_iter_all_stream_all_rows(session: Session):
+    """
+    Test BaseService.iter_all yields every row in primary key order.
+    """
+    users = [user_factory_service.create(session=session) for _ in range(5)]
+
+    rows = list(
+        services.user_service.iter_all(session, columns=["id", "email"], batch_size=2)
+    )
+
+    assert [dict(row) for row in rows] == [
+        {"id": user.id, "email": user.email} for user in users
+    ]
+
+
+def test_iter_ndjson_batches():
+    """
+    Test iter_ndjson yields one chunk per batch, one JSON object per line.
+    """
+    rows = [{"id": i, "name": f"name-{i}"} for i in range(5)]
+
+    chunks = list(iter_ndjson(rows, batch_size=2))
+
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line) for line in lines] == rows
+
+
+def test_iter_csv_header_first():
+    """
+    Test iter_csv yields header before rows and escapes values.
+    """
+    rows: list[dict[str, Any]] = [
+        {"id": 1, "name": 'comma, "quote"'},
+        {"id": 2, "name": None},
+    ]
+
+    chunks = list(iter_csv(rows, ["id", "name"], batch_size=1))
+
+    assert chunks[0] == b"id,name\r\n"
+    reader = csv.reader(io.StringIO(b"".join(chunks).decode()))
+    assert list(reader) == [["id", "name"], ["1", 'comma, "quote"'], ["2", ""]]
@@ -0,0 +1,158 @@
+import datetime
+import pickle
+import uuid
+from decimal import Decimal
+
+import fakeredis
+import orjson
+import pytest
+from sqlalchemy import Date, DateTime, Numeric, String, Uuid, event
+from sqlalchemy.orm import Session
+from sqlalchemy.types import TypeEngine
+
+from app.core.cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from app.models import User
+from app.services.base import from_json_value, to_json_value
+from app.services.user import UserService
+from app.tests.factories.user import UserFactory, user_factory_service
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cached_user_service(request) -> UserService:
+    """
+    UserService with read-through cache. "redis" backend runs against fakeredis.
+    """
+    cache: CacheBackend
+    if request.param == "memory":
+        cache = MemoryCacheBackend()
+    else:
+        cache = RedisCacheBackend(client=fakeredis.FakeRedis())
+    return UserService(model=User, cache=cache)
+
+
+def count_queries(session: Session) -> list[str]:
+    """
+    Record statements executed by session connection.
+    """
+    statements: list[str] = []
+    event.listen(
+        session.connection(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestObjectCache:
+    """
+    Test read-through cache of BaseService.get (via UserService).
+    """
+
+    def test_get_hit_without_query(
+        self, session: Session, cached_user_service: UserService
+    ):
+        """
+        Test second "get" is served from cache as a persistent object.
+        """
+        user = user_factory_service.create(session=session)
+        assert cached_user_service.get(session, _id=user.id)
+        session.expunge_all()
+
+        statements = count_queries(session)
+        db_user = cached_user_service.get(session, _id=user.id)
+
+        assert statements == []
+        assert db_user.id == user.id
+        assert db_user.email == user.email
+        assert db_user in session
+
+    def test_get_missing_object_is_not_cached(
+        self, session: Session, cached_user_service: UserService
+    ):
+        """
+        Test missing object returns None and nothing is cached.
+        """
+        assert cached_user_service.get(session, _id=999) is None
+        assert cached_user_service.cache.get(cached_user_service.cache_key(999)) is None
+
+    def test_snapshot_is_json(self, session: Session, cached_user_service: UserService):
+        """
+        Test snapshots are cached as JSON, other entries (e.g. pickles) are never
+        loaded: the object is read from database and cached again.
+        """
+        user = user_factory_service.create(session=session)
+        cached_user_service.get(session, _id=user.id)
+        key = cached_user_service.cache_key(user.id)
+        assert orjson.loads(cached_user_service.cache.get(key))["email"] == user.email
+
+        cached_user_service.cache.set(key, pickle.dumps({"email": "other"}))
+        session.expunge_all()
+
+        assert cached_user_service.get(session, _id=user.id).email == user.email
+        assert orjson.loads(cached_user_service.cache.get(key))["email"] == user.email
+
+    def test_update_invalidate_cache(
+        self, session: Session, cached_user_service: UserService
+    ):
+        """
+        Test "update" drops cached snapshot, next "get" returns fresh data.
+        """
+        user = user_factory_service.create(session=session)
+        db_user = cached_user_service.get(session, _id=user.id)
+
+        cached_user_service.update(session, db_obj=db_user, obj_in={"name": "new"})
+        session.expunge_all()
+
+        assert cached_user_service.get(session, _id=user.id).name == "new"
+
+    def test_remove_invalidate_cache(
+        self, session: Session, cached_user_service: UserService
+    ):
+        """
+        Test "remove" drops cached snapshot.
+        """
+        user = user_factory_service.create(session=session)
+        cached_user_service.get(session, _id=user.id)
+
+        cached_user_service.remove(session, _id=user.id)
+
+        assert cached_user_service.get(session, _id=user.id) is None
+
+    def test_bulk_create_invalidate_cache(
+        self, session: Session, cached_user_service: UserService
+    ):
+        """
+        Test "bulk_create" with explicit primary keys drops cached snapshots.
+        """
+        user = user_factory_service.create(session=session)
+        cached_user_service.get(session, _id=user.id)
+        cached_user_service.remove(session, _id=user.id)
+        cached_user_service.cache.set(cached_user_service.cache_key(user.id), b"stale")
+
+        user_data = UserFactory.build()
+        cached_user_service.bulk_create(
+            session, lst_objs_in=[{"id": user.id, **user_data}]
+        )
+        session.expunge_all()
+
+        assert cached_user_service.get(session, _id=user.id).email == user_data["email"]
+
+
+@pytest.mark.parametrize(
+    "column_type, value",
+    [
+        (DateTime(timezone=True), datetime.datetime.now(datetime.timezone.utc)),
+        (Date(), datetime.date(2023, 3, 13)),
+        (Numeric(), Decimal("12.50")),
+        (Uuid(), uuid.uuid4()),
+        (String(), "2023-03-13"),
+        (DateTime(), None),
+    ],
+)
+def test_json_value_round_trip(column_type: TypeEngine, value):
+    """
+    Test column values survive a JSON round trip of their snapshot.
+    """
+    encoded = orjson.loads(orjson.dumps(to_json_value(value)))
+
+    assert from_json_value(column_type, encoded) == value
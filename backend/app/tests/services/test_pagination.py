@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, DateTime
+from sqlalchemy.orm import Session
+
+from app import services
+from app.models import User
+from app.services.pagination import decode_cursor, encode_cursor
+from app.tests.factories.user import user_factory_service
+
+
+class TestCursor:
+    """
+    Test encode_cursor/decode_cursor functions.
+    """
+
+    def test_encode_decode_cursor_success(self):
+        """
+        Test cursor round trip keeps values and their types.
+        """
+        created_at = datetime(2023, 2, 22, 15, 0, 53)
+        columns = [User.id, User.name]
+        cursor = encode_cursor([10, "name"])
+
+        assert decode_cursor(cursor, columns) == [10, "name"]
+
+        created_at_column = Column("created_at", DateTime)
+        assert decode_cursor(encode_cursor([created_at]), [created_at_column]) == [
+            created_at
+        ]
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor([1, 2]), ""])
+    def test_decode_cursor_with_invalid_cursor(self, cursor: str):
+        """
+        Test decode_cursor raise ValueError with malformed cursor.
+        """
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, [User.id])
+
+
+class TestGetMultiByCursor:
+    """
+    Test BaseService.get_multi_by_cursor function (via user_service).
+    """
+
+    def test_get_multi_by_cursor_walk_all_pages(self, session: Session):
+        """
+        Test walking all pages returns every object once, in order.
+        """
+        users = [user_factory_service.create(session=session) for _ in range(5)]
+
+        seen_ids: list[int] = []
+        cursor = None
+        while True:
+            page = services.user_service.get_multi_by_cursor(
+                session, limit=2, cursor=cursor
+            )
+            seen_ids.extend(user.id for user in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen_ids == sorted(user.id for user in users)
+
+    def test_get_multi_by_cursor_descending(
+        self, session: Session, monkeypatch: pytest.MonkeyPatch
+    ):
+        """
+        Test descending order with multiple ordering columns.
+        """
+        users = [user_factory_service.create(session=session) for _ in range(3)]
+        monkeypatch.setattr(services.user_service, "cursor_fields", ("is_active", "id"))
+        monkeypatch.setattr(services.user_service, "cursor_descending", True)
+
+        page = services.user_service.get_multi_by_cursor(session, limit=2)
+        assert [user.id for user in page.items] == [users[2].id, users[1].id]
+        assert page.next_cursor
+
+        page = services.user_service.get_multi_by_cursor(
+            session, limit=2, cursor=page.next_cursor
+        )
+        assert [user.id for user in page.items] == [users[0].id]
+        assert page.next_cursor is None
@@ -0,0 +1,152 @@
+from sqlalchemy.orm import Session
+
+from app import models, services
+from app.tests.factories.post import post_factory_service
+from app.tests.factories.taxonomy import category_factory_service, tag_factory_service
+from app.tests.factories.user import user_factory_service
+from app.tests.utils.queries import capture_queries
+
+
+def create_tagged_posts(session: Session, count: int) -> list[models.Post]:
+    """
+    Create posts with author, category and 2 tags each (tags shared between posts).
+    """
+    categories = [category_factory_service.create(session=session) for _ in range(2)]
+    tags = [tag_factory_service.create(session=session) for _ in range(3)]
+    posts = []
+    for i in range(count):
+        author = user_factory_service.create(session=session)
+        post = post_factory_service.create(
+            session=session, author_id=author.id, category_id=categories[i % 2].id
+        )
+        post.tags = [tags[i % 3], tags[(i + 1) % 3]]
+        posts.append(post)
+    session.commit()
+    return posts
+
+
+class TestPostService:
+    """
+    Test PostService functions.
+
+    Short Terms:
+        PS: PostService.
+    """
+
+    def test_ps_search_rank_title_first(self, session: Session):
+        """
+        Test PS.search ranks title matches above content matches.
+        """
+        content_match = post_factory_service.create(
+            session=session,
+            title="Cooking at home",
+            content="A short note about the fastapi framework and cooking.",
+        )
+        title_match = post_factory_service.create(
+            session=session, title="Fastapi in production", content="Deployment."
+        )
+        post_factory_service.create(
+            session=session, title="Gardening", content="Tomatoes and roses."
+        )
+
+        results = services.post_service.search(session, query="fastapi")
+
+        assert [result["id"] for result in results] == [
+            title_match.id,
+            content_match.id,
+        ]
+        assert results[0]["rank"] > results[1]["rank"]
+        assert "<mark>fastapi</mark>" in results[1]["snippet"]
+
+    def test_ps_search_web_syntax(self, session: Session):
+        """
+        Test PS.search supports web search syntax (stemming, excluded words).
+        """
+        post = post_factory_service.create(
+            session=session, title="Indexes", content="Postgres indexing strategies."
+        )
+        post_factory_service.create(
+            session=session, title="Index tuning", content="Mysql indexes."
+        )
+
+        results = services.post_service.search(session, query="indexing -mysql")
+
+        assert [result["id"] for result in results] == [post.id]
+
+    def test_ps_list_posts_bounded_queries(self, session: Session):
+        """
+        Test PS.list_posts loads author, category and tags of posts in 2 queries.
+        """
+        create_tagged_posts(session, count=10)
+        session.expunge_all()
+
+        with capture_queries(session) as statements:
+            page = services.post_service.list_posts(session, limit=10)
+            for post in page.items:
+                assert post.author.name and post.category.name
+                assert len(post.tags) == post.tag_count == 2
+
+        assert len(page.items) == 10
+        assert len(statements) == 2
+
+    def test_ps_list_posts_newest_first_by_cursor(self, session: Session):
+        """
+        Test PS.list_posts returns newest posts first and follows next_cursor.
+        """
+        posts = create_tagged_posts(session, count=5)
+        post_ids = sorted((post.id for post in posts), reverse=True)
+
+        first_page = services.post_service.list_posts(session, limit=3)
+        second_page = services.post_service.list_posts(
+            session, limit=3, cursor=first_page.next_cursor
+        )
+
+        assert [post.id for post in first_page.items] == post_ids[:3]
+        assert [post.id for post in second_page.items] == post_ids[3:]
+        assert second_page.next_cursor is None
+
+    def test_ps_list_posts_filter_by_category_and_tag(self, session: Session):
+        """
+        Test PS.list_posts filters by category and by tag without duplicates.
+        """
+        posts = create_tagged_posts(session, count=6)
+        category_id, tag_id = posts[0].category_id, posts[0].tags[0].id
+        category_post_ids = {
+            post.id for post in posts if post.category_id == category_id
+        }
+        tag_post_ids = {
+            post.id for post in posts if tag_id in {t.id for t in post.tags}
+        }
+        session.expunge_all()
+
+        with capture_queries(session) as statements:
+            by_category = services.post_service.list_posts(
+                session, category_id=category_id
+            )
+            by_tag = services.post_service.list_posts(session, tag_id=tag_id)
+
+        assert [post.id for post in by_category.items] == sorted(
+            category_post_ids, reverse=True
+        )
+        assert [post.id for post in by_tag.items] == sorted(tag_post_ids, reverse=True)
+        assert len(statements) == 4
+
+    def test_ps_get_with_profile_detail(self, session: Session):
+        """
+        Test PS.get_with_profile "detail" loads comments too, in 3 queries.
+        """
+        post_id = create_tagged_posts(session, count=1)[0].id
+        for i in range(3):
+            services.comment_service.create(
+                session, obj_in={"comment": f"comment {i}", "post_id": post_id}
+            )
+        session.expunge_all()
+
+        with capture_queries(session) as statements:
+            detail = services.post_service.get_with_profile(session, post_id)
+            assert len(detail.comments) == 3
+            assert len(detail.tags) == 2
+            assert detail.author and detail.category
+
+        assert len(statements) == 3
+        assert services.post_service.get_with_profile(session, -1) is None
@@ -0,0 +1,197 @@
+import contextlib
+import threading
+import time
+from typing import Optional, cast
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import services
+from app.core.cache import MemoryCacheBackend
+from app.services.vote import VoteBuffer, VoteService
+from app.tests.factories.post import post_factory_service
+from app.tests.utils.queries import capture_queries
+
+
+class RecordingVoteService(VoteService):
+    """
+    VoteService writing deltas to a list instead of database.
+    """
+
+    def __init__(self, fail: bool = False):
+        super().__init__(model=services.vote_service.model)
+        self.fail = fail
+        self.flushed: list[dict[int, int]] = []
+
+    def increment_many(self, session, deltas, commit=True):  # noqa
+        if self.fail:
+            raise RuntimeError("database is down")
+        self.flushed.append(dict(deltas))
+        return len(deltas)
+
+
+class RecordingSession:
+    """
+    Session stand-in of flushes, recording commits. Commits last "commit_seconds".
+    """
+
+    def __init__(self, commit_seconds: float = 0):
+        self.commit_seconds = commit_seconds
+        self.committing = threading.Event()
+        self.commits = 0
+
+    def commit(self) -> None:
+        """
+        Record a commit.
+        """
+        self.committing.set()
+        time.sleep(self.commit_seconds)
+        self.commits += 1
+
+
+def build_buffer(
+    service: VoteService, session: Optional[RecordingSession] = None, **kwargs
+) -> VoteBuffer:
+    """
+    Build VoteBuffer with dedup, flushing without database session.
+    """
+    # Flushes only commit sessions
+    flush_session = cast(Session, session or RecordingSession())
+    return VoteBuffer(
+        service,
+        dedup=MemoryCacheBackend(max_size=100, ttl=60),
+        session_factory=lambda: contextlib.nullcontext(flush_session),
+        **kwargs,
+    )
+
+
+class TestVoteService:
+    """
+    Test VoteService functions.
+
+    Short Terms:
+        VS: VoteService.
+    """
+
+    def test_vs_increment_many_upsert_counters(self, session: Session):
+        """
+        Test VS.increment_many creates then increments counters, skip deleted posts.
+        """
+        first, second = (post_factory_service.create(session=session) for _ in "ab")
+
+        services.vote_service.increment_many(session, {first.id: 3})
+        updated = services.vote_service.increment_many(
+            session, {first.id: 2, second.id: 1, -1: 5}
+        )
+
+        assert updated == 2
+        assert services.vote_service.get_count(session, first.id) == 5
+        assert services.vote_service.get_count(session, second.id) == 1
+        assert services.vote_service.get_count(session, -1) == 0
+
+
+class TestVoteBuffer:
+    """
+    Test VoteBuffer functions.
+
+    Short Terms:
+        VB: VoteBuffer.
+    """
+
+    def test_vb_flush_merge_votes_in_one_statement(self, session: Session):
+        """
+        Test VB.flush writes merged votes of many posts with a single statement.
+        """
+        posts = [post_factory_service.create(session=session) for _ in range(3)]
+        vote_buffer = build_buffer(services.vote_service)
+        for post in posts:
+            for client in range(10):
+                vote_buffer.add(post.id, client_id=f"10.0.0.{client}")
+
+        with capture_queries(session) as statements:
+            flushed = vote_buffer.flush(session)
+
+        assert flushed == 30
+        assert len(statements) == 1
+        assert vote_buffer.pending(posts[0].id) == 0
+        assert services.vote_service.get_count(session, posts[0].id) == 10
+
+    def test_vb_add_dedup_client(self):
+        """
+        Test VB.add rejects a second vote of the same client for the same post.
+        """
+        vote_buffer = build_buffer(RecordingVoteService())
+
+        assert vote_buffer.add(1, client_id="10.0.0.1")
+        assert not vote_buffer.add(1, client_id="10.0.0.1")
+        assert vote_buffer.add(2, client_id="10.0.0.1")
+        assert vote_buffer.add(1, client_id="10.0.0.2")
+        assert vote_buffer.pending(1) == 2
+
+    def test_vb_flush_failure_keep_votes(self):
+        """
+        Test VB.flush puts votes back in buffer when writing fails.
+        """
+        service = RecordingVoteService(fail=True)
+        vote_buffer = build_buffer(service)
+        vote_buffer.add(1)
+        vote_buffer.add(1)
+
+        with pytest.raises(RuntimeError):
+            vote_buffer.flush()
+        assert vote_buffer.pending(1) == 2
+
+        service.fail = False
+        assert vote_buffer.flush() == 2
+        assert service.flushed == [{1: 2}]
+
+    def test_vb_pending_until_commit(self):
+        """
+        Test flushed votes leave VB.pending when committed: never pending and
+        committed at the same time.
+        """
+        session = RecordingSession(commit_seconds=0.1)
+        vote_buffer = build_buffer(RecordingVoteService(), session=session)
+        vote_buffer.add(1)
+        flush = threading.Thread(target=vote_buffer.flush)
+        flush.start()
+
+        session.committing.wait(5)
+        pending = vote_buffer.pending(1)
+        commits = session.commits
+        flush.join()
+
+        assert (pending, commits) == (0, 1)
+
+    def test_vb_background_flush_on_max_events(self):
+        """
+        Test background thread flushes as soon as "flush_max_events" votes are buffered.
+        """
+        service = RecordingVoteService()
+        vote_buffer = build_buffer(service, flush_interval=60, flush_max_events=5)
+        vote_buffer.start()
+        try:
+            for _ in range(5):
+                vote_buffer.add(1)
+            deadline = time.monotonic() + 5
+            while not service.flushed and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            vote_buffer.stop()
+
+        assert service.flushed == [{1: 5}]
+
+    def test_vb_stop_flush_remaining_votes(self):
+        """
+        Test VB.stop flushes buffered votes (graceful shutdown).
+        """
+        service = RecordingVoteService()
+        vote_buffer = build_buffer(service, flush_interval=60)
+        vote_buffer.start()
+        vote_buffer.add(1)
+        vote_buffer.add(2)
+
+        vote_buffer.stop()
+
+        assert service.flushed == [{1: 1, 2: 1}]
+        assert vote_buffer.pending(1) == 0
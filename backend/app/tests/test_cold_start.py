@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Run in a fresh interpreter: prints seconds spent importing and building the app
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from app.main import create_app
+create_app()
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": list(sys.modules)}))
+"""
+# Reference of the same interpreter and machine: frameworks the app cannot start
+# without, imported alone
+FRAMEWORKS = """
+import json, sys, time
+start = time.perf_counter()
+import fastapi, fastapi.security, pydantic, sqlalchemy.ext.asyncio, sqlalchemy.orm
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": list(sys.modules)}))
+"""
+
+
+def cold_start(code: str = COLD_START) -> dict:
+    """
+    Cold start of a fresh interpreter: "seconds" and loaded "modules".
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.cold_start
+@pytest.mark.skipif(
+    "PYTEST_XDIST_WORKER" in os.environ,
+    reason="Wall-clock measurement, skewed by concurrent workers.",
+)
+def test_cold_start_budget(pytestconfig: pytest.Config):
+    """
+    Test importing and building the application takes at most
+    "cold_start_budget_ratio" (pytest.ini) times importing its frameworks alone,
+    best of 3 interleaved runs: a ratio does not depend on machine speed or load.
+    Profile with benchmarks/bench_cold_start.py.
+    """
+    budget = float(pytestconfig.getini("cold_start_budget_ratio"))
+    app_runs, framework_runs = [], []
+
+    for _ in range(3):
+        app_runs.append(cold_start()["seconds"])
+        framework_runs.append(cold_start(FRAMEWORKS)["seconds"])
+
+    assert min(app_runs) <= budget * min(framework_runs)
+
+
+def test_heavy_modules_imported_lazily():
+    """
+    Test JWT, password hashing and database drivers are not imported by create_app.
+    """
+    modules = set(cold_start()["modules"])
+
+    assert modules.isdisjoint(
+        {"jose", "cryptography", "passlib", "asyncpg", "psycopg2"}
+    )
@@ -0,0 +1,101 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.server import default_workers
+
+
+def free_port() -> int:
+    """
+    Port available on localhost.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    """
+    Wait until url answers.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(url)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@pytest.fixture()
+def server(tmp_path: Path) -> tuple[subprocess.Popen, str, Path]:  # type: ignore[misc]
+    """
+    Master with one worker recycled every 3 requests, URL of a public endpoint
+    and log file of the master. Metrics snapshots are written to "metrics" next
+    to the log file.
+    """
+    log_path = tmp_path / "server.log"
+    port = free_port()
+    env = dict(
+        os.environ,
+        SERVER_MAX_REQUESTS="3",
+        SERVER_MAX_REQUESTS_JITTER="0",
+        METRICS_MULTIPROCESS_DIR=str(tmp_path / "metrics"),
+    )
+    with log_path.open("w") as log_file:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--host", "127.0.0.1"]
+            + ["--port", str(port), "--workers", "1"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=log_file,
+        )
+    url = f"http://127.0.0.1:{port}/api/v1/ping/public"
+    wait_ready(url)
+    yield process, url, log_path
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def test_default_workers():
+    """
+    Test default number of workers is the number of usable cores.
+    """
+    assert default_workers() == len(os.sched_getaffinity(0))
+
+
+def test_recycle_restart_and_stop(server: tuple[subprocess.Popen, str, Path]):
+    """
+    Test workers are replaced after max requests and on SIGHUP without failed
+    requests, and SIGTERM stops the master. Metrics snapshots of reaped workers
+    are merged into one file.
+    """
+    process, url, log_path = server
+
+    statuses = []
+    for _ in range(8):
+        statuses.append(httpx.get(url).status_code)
+    process.send_signal(signal.SIGHUP)
+    for _ in range(20):
+        statuses.append(httpx.get(url).status_code)
+        time.sleep(0.05)
+    process.send_signal(signal.SIGTERM)
+    process.wait(timeout=30)
+    log = log_path.read_text()
+
+    assert statuses == [200] * len(statuses)
+    assert process.returncode == 0
+    assert "exited (0), replacing it" in log
+    assert "restarting 1 workers" in log
+    assert "stopped" in log
+    assert os.listdir(log_path.parent / "metrics") == ["exited.json"]
@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 
 from app import models
 from app.core.depends import get_current_user
+from app.core.security import create_access_token
 
 
 @contextlib.contextmanager
@@ -21,3 +22,11 @@ def force_authentication(
     client.app.dependency_overrides[get_current_user] = override_get_current_user  # type: ignore
     yield client
     del client.app.dependency_overrides[get_current_user]  # type: ignore
+
+
+def get_authentication_headers(user: models.User) -> dict[str, str]:
+    """
+    Generate "Authorization" header with a valid access token of user.
+    """
+    access_token = create_access_token(subject=str(user.id))
+    return {"Authorization": f"Bearer {access_token}"}
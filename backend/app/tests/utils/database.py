@@ -0,0 +1,88 @@
+"""
+Testing databases. The schema is created once in a template database, named
+after a fingerprint of the schema (rebuilt when models change), then cloned into
+the database of each pytest-xdist worker with "CREATE DATABASE ... TEMPLATE": a
+file copy, much faster than DDL, and workers do not share a database.
+"""
+import hashlib
+
+from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy.engine import Dialect, make_url
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+# Advisory lock key serializing template creation and clones of workers
+LOCK_KEY = 8_424_317
+
+
+def schema_fingerprint(metadata: MetaData, dialect: Dialect) -> str:
+    """
+    Digest of DDL of tables, indexes and "after_create" statements of tables
+    (triggers) and of metadata (materialized views).
+    """
+    statements = [
+        str(getattr(listener, "statement", ""))
+        for listener in metadata.dispatch.after_create
+    ]
+    for table in metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda index: index.name or "")
+        )
+        statements.extend(
+            str(getattr(listener, "statement", ""))
+            for listener in table.dispatch.after_create
+        )
+    return hashlib.sha1("\n".join(statements).encode()).hexdigest()[:12]
+
+
+def create_test_database(url: str, template_prefix: str, metadata: MetaData) -> None:
+    """
+    (Re)create database of "url" as a clone of the template database of
+    metadata, created first if missing. Templates of previous schemas are dropped.
+
+    Args:
+        url: str. URL of testing database.
+        template_prefix: str. Name prefix of template databases, shared by workers.
+        metadata: MetaData. Schema of testing database.
+    """
+    url_obj = make_url(url)
+    database = url_obj.database
+    admin_engine = create_engine(
+        url_obj.set(database="postgres"),
+        poolclass=NullPool,
+        isolation_level="AUTOCOMMIT",
+    )
+    fingerprint = schema_fingerprint(metadata, admin_engine.dialect)
+    template = f"{template_prefix}_template_{fingerprint}"
+    with admin_engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": LOCK_KEY})
+        try:
+            databases = set(
+                connection.execute(text("SELECT datname FROM pg_database")).scalars()
+            )
+            if template not in databases:
+                for stale in databases:
+                    if stale.startswith(f"{template_prefix}_template_"):
+                        connection.execute(text(f'DROP DATABASE "{stale}"'))
+                connection.execute(text(f'CREATE DATABASE "{template}"'))
+                template_engine = create_engine(
+                    url_obj.set(database=template), poolclass=NullPool
+                )
+                try:
+                    metadata.create_all(bind=template_engine)
+                except Exception:
+                    template_engine.dispose()
+                    connection.execute(text(f'DROP DATABASE "{template}"'))
+                    raise
+                template_engine.dispose()
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{database}"'))
+            connection.execute(
+                text(f'CREATE DATABASE "{database}" TEMPLATE "{template}"')
+            )
+        finally:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": LOCK_KEY}
+            )
+    admin_engine.dispose()
@@ -0,0 +1,34 @@
+import contextlib
+from collections.abc import Generator
+
+from httpx import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+@contextlib.contextmanager
+def capture_queries(session: Session) -> Generator[list[str], None, None]:
+    """
+    Collect SQL statements executed on the connection of session.
+    SAVEPOINT statements of the "session" fixture (commit of application code) are skipped.
+    """
+    statements: list[str] = []
+    connection = session.connection()
+
+    def before_cursor_execute(conn, cursor, statement, *args):  # noqa
+        if "SAVEPOINT" not in statement.split(" ", 3)[:3]:
+            statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def query_count(response: Response) -> int:
+    """
+    Number of SQL statements executed by the request of response (until the
+    response started), see app.db.instrumentation.
+    """
+    return int(response.headers["X-DB-Query-Count"])
@@ -0,0 +1,120 @@
+"""
+Compare sync (threadpool) and async DB access paths under concurrency.
+
+Sync path mirrors what FastAPI does for a "def" endpoint: the call to
+"user_service.get" runs in the Starlette threadpool (40 threads by default).
+Async path awaits "async_user_service.get" on the event loop.
+
+Usage:
+    python -m benchmarks.bench_async_session --concurrency 1 10 50 200 --requests 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from anyio import to_thread
+
+from app.core.security import generate_hashed_password
+from app.db import base  # noqa
+from app.db.session import AsyncSessionLocal, SessionLocal, async_engine
+from app.models import User
+from app.services import async_user_service, user_service
+from benchmarks.utils import BenchmarkResult, print_table, timer
+
+
+def seed_users(total: int) -> list[int]:
+    """
+    Make sure at least "total" users exist. Return their ids.
+    """
+    with SessionLocal() as session:
+        ids = [row[0] for row in session.query(User.id).limit(total).all()]
+        missing = total - len(ids)
+        if missing > 0:
+            hashed_password = generate_hashed_password("benchmark")
+            user_service.bulk_create(
+                session,
+                lst_objs_in=[
+                    {
+                        "name": f"bench-{time.time_ns()}-{i}",
+                        "email": f"bench-{time.time_ns()}-{i}@example.com",
+                        "hashed_password": hashed_password,
+                    }
+                    for i in range(missing)
+                ],
+            )
+            ids = [row[0] for row in session.query(User.id).limit(total).all()]
+    return ids
+
+
+def sync_get(_id: int) -> None:
+    """
+    One sync request: open session, load user, close session.
+    """
+    with SessionLocal() as session:
+        user_service.get(session, _id=_id)
+
+
+async def async_get(_id: int) -> None:
+    """
+    One async request: open session, load user, close session.
+    """
+    async with AsyncSessionLocal() as session:
+        await async_user_service.get(session, _id=_id)
+
+
+async def run_scenario(
+    name: str, call, ids: list[int], concurrency: int, requests: int
+) -> BenchmarkResult:
+    """
+    Run "requests" calls spread over "concurrency" concurrent clients.
+    """
+    result = BenchmarkResult(name=name)
+    per_client = requests // concurrency
+
+    async def client():
+        for _ in range(per_client):
+            start = time.perf_counter()
+            try:
+                await call(random.choice(ids))
+            except Exception:  # noqa
+                result.errors += 1
+                continue
+            result.latencies.append(time.perf_counter() - start)
+
+    with timer(result):
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    return result
+
+
+async def main(concurrency_levels: list[int], requests: int) -> None:
+    """
+    Run sync and async scenarios for each concurrency level.
+    """
+    ids = seed_users(1000)
+
+    async def threadpool_get(_id: int) -> None:
+        await to_thread.run_sync(sync_get, _id)
+
+    results = []
+    for concurrency in concurrency_levels:
+        results.append(
+            await run_scenario(
+                f"sync  get c={concurrency}", threadpool_get, ids, concurrency, requests
+            )
+        )
+        results.append(
+            await run_scenario(
+                f"async get c={concurrency}", async_get, ids, concurrency, requests
+            )
+        )
+    await async_engine.dispose()
+    print_table(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.requests))
@@ -0,0 +1,100 @@
+"""
+Import posts with BaseService.bulk_create (ORM, current method), bulk_insert
+(multi-row INSERT ... RETURNING) and bulk_copy (COPY FROM STDIN).
+Each method runs in a fresh process to measure its peak RSS.
+
+Usage:
+    python -m benchmarks.bench_bulk_import --rows 1000000
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+import uuid
+
+from sqlalchemy import text
+
+CONTENT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4
+
+
+def generate_posts(prefix: str, rows: int):
+    """
+    Generate post subjects lazily.
+    """
+    for i in range(rows):
+        yield {
+            "title": f"{prefix}-{i}",
+            "short_description": f"short description {i}",
+            "content": CONTENT,
+        }
+
+
+def run_method(method: str, rows: int, chunk_size: int, queue) -> None:
+    """
+    Import rows with method, put (elapsed seconds, peak RSS MB) in queue.
+    """
+    from app.db import base  # noqa
+    from app.db.session import SessionLocal
+    from app.models.post import Post
+    from app.schemas.post import CreatePostSchema, UpdatePostSchema
+    from app.services.base import BaseService
+
+    post_service: BaseService[Post, CreatePostSchema, UpdatePostSchema]
+    post_service = BaseService(model=Post)
+    prefix = f"bench-{method}-{uuid.uuid4().hex[:8]}"
+    with SessionLocal() as session:
+        start = time.perf_counter()
+        if method == "bulk_create":
+            post_service.bulk_create(
+                session, lst_objs_in=list(generate_posts(prefix, rows))
+            )
+        elif method == "bulk_insert":
+            post_service.bulk_insert(
+                session, objs_in=generate_posts(prefix, rows), chunk_size=chunk_size
+            )
+        else:
+            post_service.bulk_copy(
+                session,
+                objs_in=generate_posts(prefix, rows),
+                chunk_size=chunk_size * 10,
+            )
+        elapsed = time.perf_counter() - start
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+        session.execute(
+            text("DELETE FROM post WHERE title LIKE :prefix"), {"prefix": f"{prefix}-%"}
+        )
+        session.commit()
+    queue.put((elapsed, peak_rss))
+
+
+def main(rows: int, chunk_size: int, methods: list[str]) -> None:
+    """
+    Print rows/sec and peak RSS of each method.
+    """
+    context = multiprocessing.get_context("spawn")
+    print(f"rows={rows}")
+    print(f"{'method':<14}{'seconds':>10}{'rows/s':>12}{'peak RSS MB':>14}")
+    for method in methods:
+        queue = context.Queue()
+        process = context.Process(
+            target=run_method, args=(method, rows, chunk_size, queue)
+        )
+        process.start()
+        elapsed, peak_rss = queue.get()
+        process.join()
+        print(f"{method:<14}{elapsed:>10.2f}{rows / elapsed:>12.0f}{peak_rss:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        default=["bulk_create", "bulk_insert", "bulk_copy"],
+        choices=["bulk_create", "bulk_insert", "bulk_copy"],
+    )
+    args = parser.parse_args()
+    main(args.rows, args.chunk_size, args.methods)
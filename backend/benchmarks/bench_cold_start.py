@@ -0,0 +1,91 @@
+"""
+Cold start of the application: time to import and build it ("create_app") in a
+fresh interpreter, and import time profile ("python -X importtime") grouped by
+top-level package and by module.
+
+Usage:
+    python -m benchmarks.bench_cold_start --repeat 5 --top 25
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import Counter
+
+# Run in a fresh interpreter: prints seconds spent importing and building the app
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from app.main import create_app
+create_app()
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": list(sys.modules)}))
+"""
+
+# Heavy modules only needed by some requests, expected to be imported lazily
+DEFERRED_MODULES = ("jose", "cryptography", "passlib", "asyncpg", "psycopg2")
+
+
+def cold_start() -> dict:
+    """
+    Cold start of one fresh interpreter: "seconds" and loaded "modules".
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_START], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def import_profile() -> list[tuple[str, int, int]]:
+    """
+    Modules imported by a cold start with self and cumulative microseconds,
+    parsed from "-X importtime" output.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", COLD_START],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    profile = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.split(":", 1)[1].split("|")
+        profile.append((module.strip(), int(self_us), int(cumulative_us)))
+    return profile
+
+
+def main(repeat: int, top: int) -> None:
+    """
+    Print best cold start, deferred modules, and slowest packages and modules.
+    """
+    runs = [cold_start() for _ in range(repeat)]
+    best = min(run["seconds"] for run in runs)
+    loaded = set(runs[0]["modules"])
+    print(f"cold start (import + create_app), best of {repeat}: {best * 1000:.1f} ms")
+    for name in DEFERRED_MODULES:
+        print(f"  {name:<14} {'imported' if name in loaded else 'deferred'}")
+
+    profile = import_profile()
+    packages: Counter = Counter()
+    for module, self_us, _ in profile:
+        packages[module.split(".")[0]] += self_us
+    print(
+        f"\nimport time by package (self, total {sum(packages.values()) / 1000:.1f} ms)"
+    )
+    for package, self_us in packages.most_common(top):
+        print(f"  {package:<40}{self_us / 1000:>10.1f} ms")
+    print("\nslowest modules (self)")
+    slowest = sorted(profile, key=lambda row: row[1], reverse=True)[:top]
+    for module, self_us, cumulative_us in slowest:
+        print(
+            f"  {module:<40}{self_us / 1000:>10.1f} ms{cumulative_us / 1000:>10.1f} ms cumulative"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+    main(args.repeat, args.top)
@@ -0,0 +1,243 @@
+"""
+Load generator: drives the application over real HTTP with concurrent async
+clients (closed loop) and reports throughput, p50/p95/p99 latency and error rate
+per scenario, as a table and a JSON report comparable between runs.
+
+Scenarios:
+    ping_public   GET /ping/public
+    ping_private  GET /ping/private, authenticated
+    posts_list    GET /posts (first page)
+    posts_detail  GET /posts/{post_id}, cycling over the seeded posts
+
+The server (app.server, "--workers" workers) is started in a subprocess, unless
+"--url" points to a running one using the same database. A user and "--posts"
+posts are created in the database of settings, and removed at the end.
+
+Usage:
+    python -m benchmarks.bench_load --duration 10 --concurrency 32 --output load.json
+    python -m benchmarks.bench_load --scenarios ping_public posts_list --compare load.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db import base  # noqa
+from app.db.session import SessionLocal
+from app.schemas import CreatePostSchema
+from app.services import post_service, user_service
+from benchmarks.utils import (
+    BenchmarkResult,
+    print_comparison,
+    print_table,
+    write_report,
+)
+
+SCENARIOS = ("ping_public", "ping_private", "posts_list", "posts_detail")
+
+
+def request_builder(
+    scenario: str, post_ids: list[int], token: str
+) -> Callable[[], tuple[str, dict]]:
+    """
+    Function returning path and headers of the next request of scenario.
+    """
+    authorization = {"Authorization": f"Bearer {token}"}
+    ids = itertools.cycle(post_ids)
+    builders: dict[str, Callable[[], tuple[str, dict]]] = {
+        "ping_public": lambda: ("/ping/public", {}),
+        "ping_private": lambda: ("/ping/private", authorization),
+        "posts_list": lambda: ("/posts", {}),
+        "posts_detail": lambda: (f"/posts/{next(ids)}", {}),
+    }
+    return builders[scenario]
+
+
+@contextmanager
+def seeded_data(posts: int):
+    """
+    Create a user (yield its access token) and posts (yield their ids), removed
+    on exit.
+    """
+    with SessionLocal() as session:
+        run = time.time_ns()
+        user = user_service.create(
+            session,
+            obj_in={
+                "name": "load",
+                "email": f"load-{run}@example.com",
+                "password": "benchmark",
+            },
+        )
+        created = [
+            post_service.create(
+                session,
+                obj_in=CreatePostSchema(
+                    title=f"load {run} {i}",
+                    short_description="Load test post",
+                    content="Load test content. " * 20,
+                    author_id=user.id,
+                ),
+            )
+            for i in range(posts)
+        ]
+        try:
+            yield create_access_token(subject=str(user.id)), [
+                post.id for post in created
+            ]
+        finally:
+            for post in created:
+                post_service.remove(session, db_obj=post)
+            user_service.remove(session, db_obj=user)
+
+
+@contextmanager
+def server(url: Optional[str], workers: int):
+    """
+    Yield base URL of the API: "url", or a server started for the run.
+    """
+    if url:
+        yield url
+        return
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--host", "127.0.0.1"]
+        + ["--port", str(port), "--workers", str(workers)],
+        # Tokens of seeded user must verify in the server
+        env=dict(os.environ, SECRET_KEY=settings.SECRET_KEY),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}{settings.API_V1_STR}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/ping/public")
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+
+async def run_scenario(
+    name: str,
+    next_request: Callable[[], tuple[str, dict]],
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> BenchmarkResult:
+    """
+    Send requests of scenario from "concurrency" clients for "warmup" seconds
+    (not recorded), then "duration" seconds. Responses with status >= 400 and
+    transport errors count as errors.
+    """
+    result = BenchmarkResult(name)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30
+    ) as client:
+
+        async def user(until: float, record: bool) -> None:
+            while time.perf_counter() < until:
+                path, headers = next_request()
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path, headers=headers)
+                    failed = response.status_code >= 400
+                except httpx.TransportError:
+                    failed = True
+                if not record:
+                    continue
+                if failed:
+                    result.errors += 1
+                else:
+                    result.latencies.append(time.perf_counter() - start)
+
+        if warmup:
+            until = time.perf_counter() + warmup
+            await asyncio.gather(*(user(until, False) for _ in range(concurrency)))
+        start = time.perf_counter()
+        until = start + duration
+        await asyncio.gather(*(user(until, True) for _ in range(concurrency)))
+        result.wall_time = time.perf_counter() - start
+    return result
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    Run scenarios, print table, write and compare JSON reports.
+    """
+    results = []
+    with seeded_data(args.posts) as (token, post_ids):
+        with server(args.url, args.workers) as base_url:
+            for name in args.scenarios:
+                results.append(
+                    asyncio.run(
+                        run_scenario(
+                            name,
+                            request_builder(name, post_ids, token),
+                            base_url,
+                            args.concurrency,
+                            args.duration,
+                            args.warmup,
+                        )
+                    )
+                )
+    print_table(results)
+
+    report = write_report(
+        args.output,
+        "load",
+        [result.as_dict() for result in results],
+        url=args.url,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        posts=args.posts,
+    )
+    if args.compare:
+        with open(args.compare) as file:
+            print_comparison(
+                json.load(file),
+                report,
+                ["throughput", "p50_ms", "p99_ms", "error_rate"],
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--url", help="Base URL of a running API, e.g. .../api/v1")
+    parser.add_argument("--output", default="bench_load.json")
+    parser.add_argument("--compare", help="Previous JSON report")
+    main(parser.parse_args())
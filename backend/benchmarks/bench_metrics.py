@@ -0,0 +1,82 @@
+"""
+Overhead of MetricsMiddleware per request, measured by calling the ASGI stack
+directly around a minimal application sending a response, and time to render
+/metrics.
+
+Usage:
+    python -m benchmarks.bench_metrics --requests 200000 --routes 50
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry
+from benchmarks.utils import best_of
+
+
+async def app(scope, receive, send) -> None:
+    """
+    ASGI application answering an empty 200, route set like the router does.
+    """
+    scope["route"] = scope["bench_route"]
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive() -> dict:
+    """
+    Empty request body.
+    """
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message) -> None:
+    """
+    Drop response messages.
+    """
+
+
+async def run(asgi_app, scopes: list[dict], requests: int) -> float:
+    """
+    Call app "requests" times, cycling over scopes. Return microseconds per call.
+    """
+    count = len(scopes)
+    start = time.perf_counter()
+    for i in range(requests):
+        await asgi_app(dict(scopes[i % count]), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main(requests: int, routes: int) -> None:
+    """
+    Print microseconds per request with and without middleware, and render time.
+    """
+    scopes = [
+        {
+            "type": "http",
+            "method": "GET",
+            "path": f"/api/v1/items{i}/1",
+            "bench_route": SimpleNamespace(path=f"/api/v1/items{i}/{{item_id}}"),
+        }
+        for i in range(routes)
+    ]
+    registry = MetricsRegistry()
+
+    baseline = asyncio.run(run(app, scopes, requests))
+    instrumented = asyncio.run(run(MetricsMiddleware(app, registry), scopes, requests))
+    render = best_of(registry.render_latest, number=20) * 1e3
+
+    print(f"requests={requests} routes={routes}")
+    print(f"baseline        {baseline:8.2f} us/request")
+    print(f"with metrics    {instrumented:8.2f} us/request")
+    print(f"overhead        {instrumented - baseline:8.2f} us/request")
+    print(f"render /metrics {render:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--routes", type=int, default=50)
+    args = parser.parse_args()
+    main(args.requests, args.routes)
@@ -0,0 +1,78 @@
+"""
+Compare offset and keyset (cursor) pagination latency at increasing page depth.
+
+Usage:
+    python -m benchmarks.bench_pagination --rows 250000 --page-size 20 --pages 1 100 1000 10000
+"""
+import argparse
+import time
+
+from sqlalchemy import func, text
+
+from app.db import base  # noqa
+from app.db.session import SessionLocal
+from app.models import User
+from app.services import user_service
+from app.services.pagination import encode_cursor
+from benchmarks.utils import best_of
+
+
+def seed_users(session, rows: int) -> None:
+    """
+    Make sure "user" table has at least "rows" rows (plain SQL, no password hashing).
+    """
+    missing = rows - session.query(func.count(User.id)).scalar()
+    if missing <= 0:
+        return
+    session.execute(
+        text(
+            'INSERT INTO "user" (name, email, hashed_password, is_active, is_superuser) '
+            "SELECT 'bench-' || g, 'bench-' || g || '-' || :run || '@example.com', "
+            "'x', true, false FROM generate_series(1, :missing) AS g"
+        ),
+        {"missing": missing, "run": time.time_ns()},
+    )
+    session.commit()
+    session.execute(text('ANALYZE "user"'))
+
+
+def main(rows: int, page_size: int, pages: list[int]) -> None:
+    """
+    Print offset/cursor latency for each page depth.
+    """
+    with SessionLocal() as session:
+        seed_users(session, rows)
+        print(f"{'page':>8}{'offset ms':>14}{'cursor ms':>14}")
+        for page in pages:
+            offset = (page - 1) * page_size
+            # cursor of the requested page is the id of the last row of previous page
+            last_id = (
+                session.query(User.id)
+                .order_by(User.id)
+                .offset(offset - 1)
+                .limit(1)
+                .scalar()
+                if offset
+                else None
+            )
+            cursor = encode_cursor([last_id]) if last_id is not None else None
+
+            offset_time = best_of(
+                lambda: user_service.get_multi(session, limit=page_size, offset=offset)
+            )
+            cursor_time = best_of(
+                lambda: user_service.get_multi_by_cursor(
+                    session, limit=page_size, cursor=cursor
+                )
+            )
+            session.expunge_all()
+            print(f"{page:>8}{offset_time * 1000:>14.3f}{cursor_time * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=250_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    args = parser.parse_args()
+    main(args.rows, args.page_size, args.pages)
@@ -0,0 +1,118 @@
+"""
+Login (password verify) throughput: inline bcrypt in the threadpool vs
+password_hash_executor process pool, at several concurrency levels.
+
+While logins run, a "ping" client keeps calling a trivial sync handler through
+the threadpool: its latency shows how much logins starve other requests.
+Rejected logins (queue full, HTTP 503) are reported as errors.
+
+Usage:
+    python -m benchmarks.bench_password_hashing --concurrency 1 4 16 64 --requests 256
+"""
+import argparse
+import asyncio
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.security import (
+    PasswordHashExecutor,
+    PasswordHashQueueFullError,
+    generate_hashed_password,
+    verify_password,
+)
+from benchmarks.utils import BenchmarkResult, print_table, timer
+
+PASSWORD = "benchmark-password"
+
+
+def noop() -> None:
+    """
+    Trivial sync handler of the ping client.
+    """
+
+
+async def run_scenario(
+    name: str, login, concurrency: int, requests: int
+) -> tuple[BenchmarkResult, BenchmarkResult]:
+    """
+    Run "requests" logins over "concurrency" clients, plus one ping client.
+    """
+    result = BenchmarkResult(name=name)
+    ping_result = BenchmarkResult(name=f"  ping during {name}")
+    per_client = max(1, requests // concurrency)
+    done = asyncio.Event()
+
+    async def client():
+        for _ in range(per_client):
+            start = time.perf_counter()
+            try:
+                await login()
+            except PasswordHashQueueFullError:
+                result.errors += 1
+                continue
+            result.latencies.append(time.perf_counter() - start)
+
+    async def ping():
+        while not done.is_set():
+            start = time.perf_counter()
+            await run_in_threadpool(noop)
+            ping_result.latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    ping_task = asyncio.create_task(ping())
+    with timer(result):
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    done.set()
+    await ping_task
+    ping_result.wall_time = result.wall_time
+    return result, ping_result
+
+
+async def main(concurrency_levels: list[int], requests: int) -> None:
+    """
+    Run inline and pool scenarios for each concurrency level.
+    """
+    hashed_password = generate_hashed_password(PASSWORD)
+    executor = PasswordHashExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    )
+    # warm up worker processes
+    await asyncio.gather(
+        *(
+            executor.async_verify_password(PASSWORD, hashed_password)
+            for _ in range(executor.max_workers)
+        )
+    )
+
+    async def inline_login():
+        await run_in_threadpool(verify_password, PASSWORD, hashed_password)
+
+    async def pool_login():
+        await executor.async_verify_password(PASSWORD, hashed_password)
+
+    results: list[BenchmarkResult] = []
+    for concurrency in concurrency_levels:
+        results.extend(
+            await run_scenario(
+                f"inline c={concurrency}", inline_login, concurrency, requests
+            )
+        )
+        results.extend(
+            await run_scenario(
+                f"pool   c={concurrency}", pool_login, concurrency, requests
+            )
+        )
+    executor.shutdown()
+    print(f"workers={executor.max_workers} max_pending={executor.max_pending}")
+    print_table(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=256)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.requests))
@@ -0,0 +1,82 @@
+"""
+Latency of a short request (checkout + "SELECT 1" + checkin) with each pre-ping
+mode of DB_POOL_PRE_PING, and checkout waits of an undersized pool.
+
+Usage:
+    python -m benchmarks.bench_pool --number 2000 --threads 32
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, install_idle_ping, pool_samples
+
+
+def build_engine(pre_ping: str, pool_size: int = 5) -> Engine:
+    """
+    Engine with an instrumented pool and pre-ping mode.
+    """
+    engine = create_engine(
+        settings.SQLALCHEMY_DATABASE_URI,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_pre_ping=pre_ping == "always",
+    )
+    if pre_ping == "idle":
+        install_idle_ping(engine, settings.DB_POOL_PING_INTERVAL_SECONDS)
+    return engine
+
+
+def query(engine: Engine) -> None:
+    """
+    One short unit of work.
+    """
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def main(number: int, threads: int) -> None:
+    """
+    Print microseconds per unit of work of each pre-ping mode, then checkout
+    statistics of pools smaller than the number of threads.
+    """
+    print(f"{'pre-ping':<10}{'us/request':>12}")
+    for pre_ping in ("always", "idle", "never"):
+        engine = build_engine(pre_ping)
+        query(engine)
+        start = time.perf_counter()
+        for _ in range(number):
+            query(engine)
+        elapsed = (time.perf_counter() - start) / number * 1e6
+        print(f"{pre_ping:<10}{elapsed:>12.1f}")
+        engine.dispose()
+
+    print(f"\n{threads} threads, {number} requests")
+    print(f"{'pool size':<10}{'wall s':>8}{'avg wait ms':>13}")
+    for pool_size in (threads // 8, threads // 2, threads):
+        engine = build_engine("idle", pool_size=pool_size)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: query(engine), range(number)))
+        wall = time.perf_counter() - start
+        samples = {sample.name: sample.value for sample in pool_samples(engine, "")}
+        avg_wait = (
+            samples["db_pool_checkout_wait_seconds_total"]
+            / samples["db_pool_checkouts_total"]
+            * 1e3
+        )
+        print(f"{pool_size:<10}{wall:>8.2f}{avg_wait:>13.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+    main(args.number, args.threads)
@@ -0,0 +1,117 @@
+"""
+Overhead of RateLimitMiddleware per request, measured by calling the ASGI stack
+directly around a no-op application (no HTTP server, no routing).
+
+Usage:
+    python -m benchmarks.bench_rate_limit --requests 200000 --clients 50000
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import RateLimitRule
+from app.core.rate_limit import RateLimitMiddleware, TokenBucketStore
+from app.core.security import create_access_token
+
+
+async def noop_app(scope, receive, send) -> None:
+    """
+    ASGI application doing nothing.
+    """
+
+
+async def receive() -> dict:
+    """
+    Empty request body.
+    """
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message) -> None:
+    """
+    Drop response messages.
+    """
+
+
+def build_scopes(path: str, clients: int, headers=None) -> list[dict]:
+    """
+    HTTP scopes of "clients" distinct IP addresses.
+    """
+    return [
+        {
+            "type": "http",
+            "method": "POST",
+            "path": path,
+            "headers": headers or [],
+            "client": (f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", 50000),
+        }
+        for i in range(clients)
+    ]
+
+
+async def run(app, scopes: list[dict], requests: int) -> float:
+    """
+    Call app "requests" times, cycling over scopes. Return microseconds per call.
+    """
+    count = len(scopes)
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(scopes[i % count], receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main(requests: int, clients: int) -> None:
+    """
+    Print microseconds per request of each scenario and its overhead over baseline.
+    """
+    rules = [
+        RateLimitRule(method="POST", path="/api/v1/posts/{post_id}/votes", rate=1e6, burst=10**9),
+        RateLimitRule(method="GET", path="/api/v1/posts/search", rate=1e6, burst=10**9),
+        RateLimitRule(path="/api/v1/users/me", rate=1e6, burst=10**9, key="user"),
+    ]  # fmt: skip
+    token = create_access_token(subject="1")
+    scenarios = {
+        "baseline (no middleware)": (
+            noop_app,
+            build_scopes("/api/v1/posts/1/votes", clients),
+        ),
+        "no matching rule": (None, build_scopes("/api/v1/posts", 1)),
+        "ip key, 1 client": (None, build_scopes("/api/v1/posts/1/votes", 1)),
+        f"ip key, {clients} clients": (
+            None,
+            build_scopes("/api/v1/posts/1/votes", clients),
+        ),
+        f"ip key, {clients} paths": (
+            None,
+            [
+                {**scope, "path": f"/api/v1/posts/{i}/votes"}
+                for i, scope in enumerate(build_scopes("", clients))
+            ],
+        ),
+        "user key (JWT decode)": (
+            None,
+            build_scopes(
+                "/api/v1/users/me",
+                1,
+                headers=[(b"authorization", f"Bearer {token}".encode())],
+            ),
+        ),
+    }
+
+    print(f"requests={requests}")
+    print(f"{'scenario':<28}{'us/request':>12}{'overhead us':>13}")
+    baseline = None
+    for name, (app, scopes) in scenarios.items():
+        if app is None:
+            app = RateLimitMiddleware(noop_app, rules=rules, store=TokenBucketStore())
+        elapsed = asyncio.run(run(app, scopes, requests))
+        baseline = elapsed if baseline is None else baseline
+        print(f"{name:<28}{elapsed:>12.2f}{elapsed - baseline:>13.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--clients", type=int, default=50_000)
+    args = parser.parse_args()
+    main(args.requests, args.clients)
@@ -0,0 +1,100 @@
+"""
+Home page widgets: live aggregate (query of the rollup, what every page view
+would run) against the read of the materialized rollup (app.db.rollups), per
+rollup, plus the time of one concurrent refresh.
+
+Aggregates only get expensive with data: run it on a seeded database, e.g.
+    python -m app.db.seed --posts 1000000
+
+Usage:
+    python -m benchmarks.bench_rollups --limit 10 --rounds 10 --output rollups.json
+    python -m benchmarks.bench_rollups --compare rollups.json
+"""
+import argparse
+import json
+import time
+from typing import Any
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db import base  # noqa
+from app.db import session as db_session
+from app.db.rollups import ROLLUPS, refresh_rollup
+from app.services import rollup_service
+from benchmarks.utils import microbenchmark, print_comparison, write_report
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    Refresh and time every rollup, print table, write and compare JSON reports.
+    """
+    # Slow query logs (with EXPLAIN) of live aggregates would be timed too
+    settings.SQL_INSTRUMENTATION_ENABLED = False
+    results: list[dict[str, Any]] = []
+    refresh_seconds = {}
+    with db_session.SessionLocal() as session:
+        for rollup in ROLLUPS:
+            start = time.perf_counter()
+            refresh_rollup(session.connection(), rollup)
+            session.commit()
+            refresh_seconds[rollup.name] = time.perf_counter() - start
+
+            live_query = text(
+                f"SELECT * FROM ({rollup.query}) AS live "
+                f"ORDER BY {rollup.order_by} LIMIT :limit"
+            )
+            scenarios = {
+                "live": lambda: session.execute(
+                    live_query, {"limit": args.limit}
+                ).all(),
+                "materialized": lambda: rollup_service.read(
+                    session, rollup, args.limit
+                ),
+            }
+            for kind, func in scenarios.items():
+                stats = microbenchmark(
+                    func, rounds=args.rounds, min_round_time=args.min_round_time
+                )
+                results.append({"name": f"{rollup.name}.{kind}", **stats})
+            session.rollback()
+
+    header = f"{'scenario':<36}{'calls':>8}{'min ms':>12}{'mean ms':>12}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for live, materialized in zip(results[::2], results[1::2]):
+        for result in (live, materialized):
+            speedup = live["mean_us"] / result["mean_us"]
+            print(
+                f"{result['name']:<36}{result['rounds'] * result['iterations']:>8}"
+                f"{result['min_us'] / 1000:>12.3f}{result['mean_us'] / 1000:>12.3f}"
+                f"{speedup:>9.0f}x"
+            )
+    print("\nconcurrent refresh")
+    for name, seconds in refresh_seconds.items():
+        print(f"  {name:<34}{seconds * 1000:>12.1f} ms")
+
+    report = write_report(
+        args.output,
+        "rollups",
+        results,
+        limit=args.limit,
+        rounds=args.rounds,
+        min_round_time=args.min_round_time,
+        refresh_ms={name: round(s * 1000, 1) for name, s in refresh_seconds.items()},
+    )
+    if args.compare:
+        with open(args.compare) as file:
+            print_comparison(json.load(file), report, ["mean_us", "min_us"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--min-round-time", type=float, default=0.05)
+    parser.add_argument("--output", default="bench_rollups.json")
+    parser.add_argument("--compare", help="Previous JSON report")
+    main(parser.parse_args())
@@ -0,0 +1,103 @@
+"""
+Full-text search (GIN indexed tsvector) vs ILIKE scan on a seeded corpus of posts.
+
+Usage:
+    python -m benchmarks.bench_search --posts 100000
+"""
+import argparse
+import random
+
+from sqlalchemy import func, or_, select, text
+
+from app.db.session import SessionLocal
+from app.models import Post
+from app.services import post_service
+from benchmarks.utils import best_of
+
+VOCABULARY = [
+    "python", "postgres", "fastapi", "index", "query", "cache", "async", "vector",
+    "search", "deploy", "docker", "worker", "latency", "throughput", "memory",
+    "schema", "migration", "cursor", "replica", "pool", "token", "vote", "comment",
+    "category", "tag", "garden", "recipe", "travel", "music", "football", "camera",
+]  # fmt: skip
+FILLER = [f"word{i}" for i in range(5000)]
+# Frequent terms match most of the corpus (ranking cost dominates),
+# rare terms show the index lookup vs sequential scan difference.
+QUERIES = [
+    "postgres",
+    "fastapi latency",
+    "garden -recipe",
+    "word4321",
+    '"word3001 word3002"',
+    "missingterm",
+]
+
+
+def generate_posts(rows: int, seed: int = 42):
+    """
+    Generate posts with Zipf-like word frequencies, deterministically.
+    """
+    rng = random.Random(seed)
+    words = VOCABULARY + FILLER
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    for i in range(rows):
+        body = rng.choices(words, weights=weights, k=120)
+        yield {
+            "title": f"bench-search-{i} " + " ".join(rng.choices(VOCABULARY, k=4)),
+            "short_description": " ".join(body[:15]),
+            "content": " ".join(body),
+        }
+
+
+def main(posts: int) -> None:
+    """
+    Seed corpus if needed, then print latency of both strategies per query.
+    """
+    with SessionLocal() as session:
+        existing = session.scalar(
+            select(func.count(Post.id)).where(Post.title.like("bench-search-%"))
+        )
+        if existing < posts:
+            session.execute(text("DELETE FROM post WHERE title LIKE 'bench-search-%'"))
+            post_service.bulk_copy(session, objs_in=generate_posts(posts))
+            session.execute(text("ANALYZE post"))
+            session.commit()
+
+        print(f"posts={posts}")
+        print(f"{'query':<24}{'results':>9}{'fts ms':>10}{'ilike ms':>11}")
+        for query in QUERIES:
+            results = post_service.search(session, query=query)
+            terms = [
+                term.strip('"') for term in query.split() if not term.startswith("-")
+            ]
+            ilike = (
+                select(Post.id)
+                .where(
+                    or_(
+                        *(
+                            column.ilike(f"%{term}%")
+                            for term in terms
+                            for column in (
+                                Post.title,
+                                Post.short_description,
+                                Post.content,
+                            )
+                        )
+                    )
+                )
+                .limit(20)
+            )
+
+            fts_time = best_of(lambda: post_service.search(session, query=query))
+            ilike_time = best_of(lambda: session.execute(ilike).all())
+            print(
+                f"{query:<24}{len(results):>9}"
+                f"{fts_time * 1000:>10.2f}{ilike_time * 1000:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.posts)
@@ -0,0 +1,84 @@
+"""
+Serialization microbenchmark, single object and 1000 items lists:
+    - input: jsonable_encoder(schema) (previous path of services) vs schema.dict()
+    - output: JSONResponse (stdlib json) vs ORJSONResponse (default response class)
+
+Usage:
+    python -m benchmarks.bench_serialization --number 200
+"""
+import argparse
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.schemas import CreatePostSchema, ListPostSchema
+from app.services.base import to_column_dict
+from benchmarks.utils import best_of
+
+
+def build_post(i: int) -> ListPostSchema:
+    """
+    Build a post with nested author, category and tags, like list API items.
+    """
+    return ListPostSchema(
+        id=i,
+        title=f"Post {i}",
+        short_description="Short description " * 3,
+        content="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+        category_id=1,
+        author_id=1,
+        comment_count=12,
+        tag_count=3,
+        author={"id": 1, "name": "Author"},
+        category={"id": 1, "name": "python", "post_count": 10},
+        tags=[{"id": t, "name": f"tag-{t}", "post_count": 5} for t in range(3)],
+    )
+
+
+def main(number: int) -> None:
+    """
+    Print microseconds per operation of each serialization path.
+    """
+    create_schema = CreatePostSchema(
+        title="Post", short_description="Short", content="Content " * 50
+    )
+    cases = {
+        "single": (create_schema, build_post(1)),
+        "list-1000": (
+            [create_schema] * 1000,
+            [build_post(i) for i in range(1000)],
+        ),
+    }
+
+    print(f"{'case':<11}{'operation':<34}{'us/op':>12}{'speedup':>9}")
+    for case, (create_input, response_items) in cases.items():
+        inputs = create_input if isinstance(create_input, list) else [create_input]
+        payload = jsonable_encoder(response_items)
+        comparisons = [
+            (
+                (
+                    "input jsonable_encoder",
+                    lambda: [jsonable_encoder(o) for o in inputs],
+                ),
+                ("input to_column_dict", lambda: [to_column_dict(o) for o in inputs]),
+            ),
+            (
+                ("render JSONResponse", lambda: JSONResponse(payload).body),
+                ("render ORJSONResponse", lambda: ORJSONResponse(payload).body),
+            ),
+        ]
+        for (before_name, before), (after_name, after) in comparisons:
+            before_time = best_of(before, number=number) * 1e6
+            after_time = best_of(after, number=number) * 1e6
+            print(f"{case:<11}{before_name:<34}{before_time:>12.1f}")
+            print(
+                f"{case:<11}{after_name:<34}{after_time:>12.1f}"
+                f"{before_time / after_time:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+    main(args.number)
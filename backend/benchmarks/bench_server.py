@@ -0,0 +1,162 @@
+"""
+Throughput of the previous start command (uvicorn --reload, single worker)
+against the production launcher (app.server), under a closed-loop load of
+"--concurrency" clients on a public endpoint. Client processes share the CPUs
+with the server: run on a host with spare cores for absolute numbers.
+
+Usage:
+    python -m benchmarks.bench_server --duration 10 --concurrency 64 --clients 2
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.utils import BenchmarkResult, print_table
+
+PATH = "/api/v1/ping/public"
+
+
+def free_port() -> int:
+    """
+    Port available on localhost.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def commands(port: int, workers: int) -> dict[str, list[str]]:
+    """
+    Server command lines by scenario name.
+    """
+    address = ["--host", "127.0.0.1", "--port", str(port)]
+    return {
+        "uvicorn --reload --workers 1": [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--reload",
+            "--workers",
+            "1",
+            *address,
+        ],
+        f"app.server --workers {workers}": [
+            sys.executable,
+            "-m",
+            "app.server",
+            "--workers",
+            str(workers),
+            *address,
+        ],
+    }
+
+
+async def load(url: str, concurrency: int, duration: float) -> tuple[list, int]:
+    """
+    Send requests from "concurrency" clients for "duration" seconds.
+    Return latencies and number of errors.
+    """
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+
+        async def user() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def client_process(args: tuple[str, int, float]) -> tuple[list, int]:
+    """
+    Load generator of one client process.
+    """
+    return asyncio.run(load(*args))
+
+
+def run(
+    name: str, command: list[str], url: str, args: argparse.Namespace
+) -> BenchmarkResult:
+    """
+    Start server, warm it up, measure throughput and stop it.
+    """
+    env = dict(os.environ, SERVER_MAX_REQUESTS="0")
+    server = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(url)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.2)
+        client_process((url, args.concurrency, 1.0))
+
+        result = BenchmarkResult(name)
+        per_client = max(1, args.concurrency // args.clients)
+        with multiprocessing.Pool(args.clients) as pool:
+            start = time.perf_counter()
+            outcomes = pool.map(
+                client_process, [(url, per_client, args.duration)] * args.clients
+            )
+            result.wall_time = time.perf_counter() - start
+        for latencies, errors in outcomes:
+            result.latencies.extend(latencies)
+            result.errors += errors
+        return result
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main() -> None:
+    """
+    Run scenarios and print table.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Default: usable CPU cores"
+    )
+    args = parser.parse_args()
+
+    workers = args.workers or len(os.sched_getaffinity(0))
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{PATH}"
+    results = [
+        run(name, command, url, args)
+        for name, command in commands(port, workers).items()
+    ]
+    print(f"CPU cores: {len(os.sched_getaffinity(0))}")
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Microbenchmarks of service methods (BaseService and UserService) against the
+database of settings, in a transaction rolled back at the end: the database is
+left unchanged. Statistics per call in pytest-benchmark style, see
+"microbenchmark".
+
+Usage:
+    python -m benchmarks.bench_services --rounds 20 --output services.json
+    python -m benchmarks.bench_services --compare services.json
+"""
+import argparse
+import itertools
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db import base  # noqa
+from app.db.session import engine
+from app.services import category_service, user_service
+from benchmarks.utils import microbenchmark, print_comparison, write_report
+
+# Users inserted (without password hashing) for read benchmarks
+SEED_USERS = 200
+
+
+def seed(session: Session) -> None:
+    """
+    Insert users for read benchmarks, in the current transaction.
+    """
+    session.execute(
+        text(
+            'INSERT INTO "user" (name, email, hashed_password, is_active, is_superuser) '
+            "SELECT 'bench-' || g, 'bench-' || g || '-' || :run || '@example.com', "
+            "'x', true, false FROM generate_series(1, :count) AS g"
+        ),
+        {"count": SEED_USERS, "run": time.time_ns()},
+    )
+    session.flush()
+
+
+def scenarios(session: Session, slow_rounds: int) -> list[tuple[str, Callable, int]]:
+    """
+    Benchmarked calls: name, function and number of rounds. Password hashing
+    scenarios (bcrypt, a fraction of a second per call) run "slow_rounds" rounds.
+    """
+    counter = itertools.count()
+    user = user_service.create(
+        session,
+        obj_in={
+            "name": "bench",
+            "email": f"bench-{time.time_ns()}@example.com",
+            "password": "benchmark",
+        },
+    )
+    category = category_service.create(session, obj_in={"name": "bench"})
+    users_page = user_service.get_multi_by_cursor(session, limit=20)
+
+    def create_remove_category() -> None:
+        created = category_service.create(
+            session, obj_in={"name": f"bench-{next(counter)}"}
+        )
+        category_service.remove(session, db_obj=created)
+
+    def create_remove_user() -> None:
+        created = user_service.create(
+            session,
+            obj_in={
+                "name": "bench",
+                "email": f"bench-{next(counter)}-{time.time_ns()}@example.com",
+                "password": "benchmark",
+            },
+        )
+        user_service.remove(session, db_obj=created)
+
+    return [
+        ("base.get", lambda: user_service.get(session, _id=user.id), 0),
+        ("base.get_multi", lambda: user_service.get_multi(session, limit=20), 0),
+        (
+            "base.get_multi_by_cursor",
+            lambda: user_service.get_multi_by_cursor(
+                session, limit=20, cursor=users_page.next_cursor
+            ),
+            0,
+        ),
+        ("base.create_remove", create_remove_category, 0),
+        (
+            "base.update",
+            lambda: category_service.update(
+                session, db_obj=category, obj_in={"name": f"bench-{next(counter)}"}
+            ),
+            0,
+        ),
+        (
+            "user.update",
+            lambda: user_service.update(
+                session, db_obj=user, obj_in={"name": f"bench-{next(counter)}"}
+            ),
+            0,
+        ),
+        ("user.create_remove", create_remove_user, slow_rounds),
+        (
+            "user.verify_user_password",
+            lambda: user_service.verify_user_password(user, "benchmark"),
+            slow_rounds,
+        ),
+    ]
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    Run scenarios, print table, write and compare JSON reports.
+    """
+    results: list[dict[str, Any]] = []
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(
+            bind=connection, join_transaction_mode="create_savepoint", autoflush=False
+        )
+        seed(session)
+        for name, func, rounds in scenarios(session, args.slow_rounds):
+            stats = microbenchmark(
+                func, rounds=rounds or args.rounds, min_round_time=args.min_round_time
+            )
+            results.append({"name": name, **stats})
+        session.close()
+        transaction.rollback()
+
+    header = f"{'scenario':<28}{'calls':>8}{'min us':>12}{'mean us':>12}{'stddev us':>12}{'ops/s':>12}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['name']:<28}{result['rounds'] * result['iterations']:>8}"
+            f"{result['min_us']:>12.1f}{result['mean_us']:>12.1f}"
+            f"{result['stddev_us']:>12.1f}{result['ops']:>12.1f}"
+        )
+
+    report = write_report(
+        args.output,
+        "services",
+        results,
+        rounds=args.rounds,
+        slow_rounds=args.slow_rounds,
+        min_round_time=args.min_round_time,
+    )
+    if args.compare:
+        with open(args.compare) as file:
+            print_comparison(json.load(file), report, ["mean_us", "min_us"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--slow-rounds", type=int, default=5)
+    parser.add_argument("--min-round-time", type=float, default=0.02)
+    parser.add_argument("--output", default="bench_services.json")
+    parser.add_argument("--compare", help="Previous JSON report")
+    main(parser.parse_args())
@@ -0,0 +1,66 @@
+"""
+Authenticated request path with token cache on and off.
+
+"dependency": call "get_current_user" directly (decode JWT + user query vs cache hit).
+"http": GET /ping/private through the ASGI app with TestClient.
+
+Usage:
+    python -m benchmarks.bench_token_cache --number 2000
+"""
+import argparse
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.depends import get_current_user
+from app.core.security import create_access_token
+from app.core.token_cache import token_cache
+from app.db import base  # noqa
+from app.db.session import SessionLocal
+from app.main import app
+from app.services import user_service
+from benchmarks.utils import best_of
+
+
+def main(number: int) -> None:
+    """
+    Print per call latency with cache on and off.
+    """
+    with SessionLocal() as session:
+        user = user_service.create(
+            session,
+            obj_in={
+                "name": "bench",
+                "email": f"bench-{time.time_ns()}@example.com",
+                "password": "benchmark",
+            },
+        )
+        token = create_access_token(subject=str(user.id))
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        client = TestClient(app)
+        url = f"{settings.API_V1_STR}/ping/private"
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"{'scenario':<24}{'cache off us':>14}{'cache on us':>14}")
+        for name, call in (
+            ("dependency", lambda: get_current_user(session, credentials)),
+            ("http", lambda: client.get(url, headers=headers)),
+        ):
+            timings = []
+            for enabled in (False, True):
+                token_cache.clear()
+                token_cache.enabled = enabled
+                timings.append(best_of(call, repeat=3, number=number))
+            print(f"{name:<24}{timings[0] * 1e6:>14.1f}{timings[1] * 1e6:>14.1f}")
+        print(f"cache stats: {token_cache.stats()}")
+
+        user_service.remove(session, db_obj=user)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.number)
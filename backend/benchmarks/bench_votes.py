@@ -0,0 +1,116 @@
+"""
+Votes/sec on a single hot post: one upsert + commit per vote ("direct", row lock
+hotspot) vs VoteBuffer (merged in memory, batched flushes).
+
+Usage:
+    python -m benchmarks.bench_votes --votes 20000 --threads 16
+"""
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+
+from app.core.cache import MemoryCacheBackend
+from app.db.session import SessionLocal
+from app.models import Post
+from app.services import vote_service
+from app.services.vote import VoteBuffer, VoteService
+
+
+def vote_direct(post_id: int, votes: int, threads: int) -> float:
+    """
+    Write every vote with its own statement and transaction. Return elapsed seconds.
+    """
+
+    def worker(count: int) -> None:
+        with SessionLocal() as session:
+            for _ in range(count):
+                vote_service.increment_many(session, {post_id: 1})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, [votes // threads] * threads))
+    return time.perf_counter() - start
+
+
+def vote_buffered(
+    post_id: int, votes: int, threads: int, flush_interval: float, max_events: int
+) -> tuple[float, int]:
+    """
+    Buffer votes of distinct clients, flushed by background thread. Return elapsed
+    seconds (including the final flush) and the number of flush statements.
+    """
+    flushes = 0
+
+    class CountingVoteService(VoteService):
+        def increment_many(self, session, deltas, commit=True):  # noqa
+            nonlocal flushes
+            flushes += 1
+            return super().increment_many(session, deltas, commit)
+
+    vote_buffer = VoteBuffer(
+        CountingVoteService(model=vote_service.model),
+        flush_interval=flush_interval,
+        flush_max_events=max_events,
+        dedup=MemoryCacheBackend(max_size=votes * 2, ttl=3600),
+    )
+
+    def worker(offset: int) -> None:
+        for i in range(votes // threads):
+            vote_buffer.add(post_id, client_id=f"client-{offset}-{i}")
+
+    vote_buffer.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+    vote_buffer.stop()
+    return time.perf_counter() - start, flushes
+
+
+def main(
+    votes: int, threads: int, flush_interval: float, max_events: int, direct: bool
+) -> None:
+    """
+    Print votes/sec of both strategies and check no vote is lost.
+    """
+    votes = votes // threads * threads
+    with SessionLocal() as session:
+        post = Post(title=f"bench-votes-{uuid.uuid4().hex[:8]}")
+        session.add(post)
+        session.commit()
+        post_id = post.id
+
+    print(f"votes={votes} threads={threads}")
+    print(f"{'method':<10}{'seconds':>10}{'votes/s':>12}{'statements':>12}")
+    expected = 0
+    if direct:
+        elapsed = vote_direct(post_id, votes, threads)
+        expected += votes
+        print(f"{'direct':<10}{elapsed:>10.2f}{votes / elapsed:>12.0f}{votes:>12}")
+
+    elapsed, flushes = vote_buffered(
+        post_id, votes, threads, flush_interval, max_events
+    )
+    expected += votes
+    print(f"{'buffered':<10}{elapsed:>10.2f}{votes / elapsed:>12.0f}{flushes:>12}")
+
+    with SessionLocal() as session:
+        count = vote_service.get_count(session, post_id)
+        print(f"stored count={count} expected={expected}")
+        session.execute(text("DELETE FROM post WHERE id = :id"), {"id": post_id})
+        session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--votes", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    parser.add_argument("--max-events", type=int, default=1000)
+    parser.add_argument(
+        "--no-direct", dest="direct", action="store_false", help="Skip direct method."
+    )
+    args = parser.parse_args()
+    main(args.votes, args.threads, args.flush_interval, args.max_events, args.direct)
@@ -0,0 +1,248 @@
+"""
+Shared helpers for benchmark scripts.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Latencies (seconds) and wall time of one benchmark scenario.
+    """
+
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    wall_time: float = 0.0
+    errors: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Operations per second.
+        """
+        return len(self.latencies) / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """
+        Failed operations over all operations.
+        """
+        total = len(self.latencies) + self.errors
+        return self.errors / total if total else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Latency percentile in milliseconds.
+
+        Args:
+            pct: float. Percentile in range [0, 100].
+
+        Returns:
+            latency: float
+        """
+        return percentile(self.latencies, pct) * 1000
+
+    def as_dict(self) -> dict:
+        """
+        Summary of result, ready to be dumped as JSON.
+        """
+        return {
+            "name": self.name,
+            "count": len(self.latencies),
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "wall_time": round(self.wall_time, 4),
+            "throughput": round(self.throughput, 2),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+        }
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile. Return 0 for empty values.
+
+    Args:
+        values: list[float]
+        pct: float. Percentile in range [0, 100].
+
+    Returns:
+        value: float
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@contextmanager
+def timer(result: BenchmarkResult):
+    """
+    Measure wall time of the block into "result.wall_time".
+    """
+    start = time.perf_counter()
+    yield result
+    result.wall_time = time.perf_counter() - start
+
+
+def best_of(func, repeat: int = 5, number: int = 1) -> float:
+    """
+    Best (minimum) time in seconds of "number" calls of "func", over "repeat" runs.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def print_table(results: Iterable[BenchmarkResult]) -> None:
+    """
+    Print results as a plain text table.
+    """
+    header = f"{'scenario':<40}{'ops':>8}{'err':>6}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        data = result.as_dict()
+        print(
+            f"{data['name']:<40}{data['count']:>8}{data['errors']:>6}"
+            f"{data['throughput']:>12.1f}{data['p50_ms']:>10.2f}"
+            f"{data['p95_ms']:>10.2f}{data['p99_ms']:>10.2f}"
+        )
+
+
+def microbenchmark(
+    func: Callable[[], Any],
+    rounds: int = 20,
+    min_round_time: float = 0.01,
+    warmup: int = 1,
+) -> dict[str, float]:
+    """
+    Time "func" like pytest-benchmark: the number of calls per round is
+    calibrated so a round lasts at least "min_round_time", statistics are
+    computed over per call times of rounds.
+
+    Args:
+        func: Callable[[], Any]
+        rounds: int. Number of measured rounds.
+        min_round_time: float. Minimum seconds of a round.
+        warmup: int. Calls before calibration (caches, connections).
+
+    Returns:
+        stats: dict[str, float]. Rounds, calls per round, per call min, max,
+            mean, median and stddev in microseconds, and operations per second.
+    """
+    for _ in range(warmup):
+        func()
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_round_time:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, int(min_round_time / elapsed) + 1)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - start) / iterations * 1e6)
+    mean = statistics.fmean(timings)
+    return {
+        "rounds": rounds,
+        "iterations": iterations,
+        "min_us": round(min(timings), 3),
+        "max_us": round(max(timings), 3),
+        "mean_us": round(mean, 3),
+        "median_us": round(statistics.median(timings), 3),
+        "stddev_us": round(statistics.stdev(timings) if rounds > 1 else 0.0, 3),
+        "ops": round(1e6 / mean, 2),
+    }
+
+
+def write_report(
+    path: str, suite: str, results: list[dict], **parameters: Any
+) -> dict[str, Any]:
+    """
+    Write results of a suite as JSON, with the context needed to compare runs
+    (commit, machine, parameters).
+
+    Args:
+        path: str. Output file.
+        suite: str. Name of benchmark suite.
+        results: list[dict]. One dict per scenario, with a "name" key.
+        parameters: Any. Arguments of the run.
+
+    Returns:
+        report: dict[str, Any]
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    report = {
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "cpu_count": len(os.sched_getaffinity(0)),
+        "parameters": parameters,
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+    return report
+
+
+def print_comparison(
+    previous: dict[str, Any], current: dict[str, Any], metrics: list[str]
+) -> None:
+    """
+    Print metrics of scenarios of two reports (see "write_report") side by side,
+    with the relative change.
+    """
+    baseline = {result["name"]: result for result in previous["results"]}
+    print(f"compared with {previous.get('commit')} ({previous.get('created_at')})")
+    header = (
+        f"{'scenario':<32}{'metric':<12}{'previous':>12}{'current':>12}{'change':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in current["results"]:
+        old: Optional[dict] = baseline.get(result["name"])
+        if old is None:
+            continue
+        for metric in metrics:
+            if metric not in result or metric not in old:
+                continue
+            change = (
+                f"{(result[metric] - old[metric]) / old[metric] * 100:+.1f}%"
+                if old[metric]
+                else "-"
+            )
+            print(
+                f"{result['name']:<32}{metric:<12}{old[metric]:>12.2f}"
+                f"{result[metric]:>12.2f}{change:>10}"
+            )